@@ -0,0 +1,575 @@
+"""
+This file benchmarks the max-flow engines behind maxThroughput on reproducible synthetic topologies.
+
+Run it with:
+    python benchmark.py [suite] [options]   time every engine on every generator of topology_generators, check that
+                                            they agree and save the results as JSON (see --help)
+    python benchmark.py bfs                 time the breadth first search of each backend, needs NumPy
+    python benchmark.py batch               time many (origin, targets) queries with BatchMaxThroughput against
+                                            maxThroughput
+    python benchmark.py parallel            time parallel_push_relabel with 1 to 16 workers against push_relabel
+    python benchmark.py service             compare the latency of bursts of queries through ThroughputService with
+                                            one maxThroughput per query in an executor
+    python benchmark.py warm                time a solve of a topology with 1% of its links changed, from zero flow and
+                                            warm started from the flow before the change
+    python benchmark.py reduce              time the reduction of ReducedTopology and the solve on the reduced network
+                                            against maxThroughput, on every generator
+    python benchmark.py parametric          time the whole throughput curve of ThroughputCurve against one
+                                            maxThroughput per sample of the scaling factor
+    python benchmark.py startup             time a fresh throughput_cli.py job from starting the interpreter to its
+                                            first result, for each format of topology
+    python benchmark.py estimate            time maxThroughputEstimate stopping at a demand or at a gap epsilon
+                                            against the exact solve of maxThroughput
+
+Every topology is generated from a seed, so two runs (and two versions of the code) time exactly the same graphs.
+Saving the results of a version with --output and passing the file to --compare on the next version reports the
+runs which got slower or whose throughput changed.
+
+"""
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+
+from maximum_throughput import (ALGORITHMS, BACKENDS, BatchMaxThroughput, CompactResidualNetwork, SolverStats,
+                                maxThroughput, maxThroughputEstimate, maxThroughputRouting, parallel_push_relabel,
+                                push_relabel)
+from topology_generators import GENERATORS, layered_fabric
+
+# the engines running one breadth first search per augmenting path, too slow for the largest sizes
+AUGMENTING_PATH_ENGINES = ("ford_fulkerson", "capacity_scaling")
+
+def time_stages(topology, algorithm, backend="python"):
+    """
+    Function description:
+        This function solves a topology with one engine and times each stage of the solve with a SolverStats.
+
+        The construction of the residual network is always timed on its own, then each engine reports its own stages:
+        bfs, path_extraction and augmentation for ford_fulkerson, level_graph and blocking_flow for dinic,
+        global_relabel and discharge for push_relabel (see SolverStats for the others).
+
+    :Input:
+        topology: a tuple (connections, maxIn, maxOut, origin, targets)
+        algorithm: the name of the engine, one of the keys of ALGORITHMS
+        backend: the name of the residual network class, one of the keys of BACKENDS
+
+    :Return:
+        A tuple (throughput, stages, counters) where stages maps the name of each stage to its time in seconds and
+        counters holds the other fields of SolverStats.as_dict
+
+    :Time complexity:
+        The time complexity of the engine
+    """
+    stats = SolverStats()
+    throughput = maxThroughput(*topology, algorithm=algorithm, backend=backend, stats=stats)
+    counters = stats.as_dict()
+    stages = counters.pop("timers")
+    return throughput, stages, counters
+
+def run_suite(generators, sizes, seeds, algorithms, backends, ford_fulkerson_limit):
+    """
+    Function description:
+        This function times every engine and backend on every generator, size and seed, checks that every engine
+        returns the same throughput, and prints one line per topology.
+
+    :Input:
+        generators: the names of the generators, keys of GENERATORS
+        sizes: the approximate numbers of connections
+        seeds: the seeds of each topology
+        algorithms: the names of the engines, keys of ALGORITHMS
+        backends: the names of the backends, keys of BACKENDS
+        ford_fulkerson_limit: the engines of AUGMENTING_PATH_ENGINES are skipped on the sizes above this
+
+    :Return:
+        A list with one dictionary per run: generator, edges, data_centres, seed, algorithm, backend, throughput,
+        seconds, stages and counters.
+
+    :Raise:
+        AssertionError, if two engines disagree on a topology
+
+    :Time complexity:
+        The time complexity of the engines on every topology
+    """
+    runs = [(algorithm, backend) for algorithm in algorithms for backend in backends]
+    print("%-26s %9s %5s " % ("generator", "links", "seed")
+          + " ".join("%22s" % (algorithm + "/" + backend) for algorithm, backend in runs))
+
+    results = []
+    for name in generators:
+        for size in sizes:
+            for seed in seeds:
+                topology = GENERATORS[name](size, seed)
+                edges = len(topology[0])
+                line = "%-26s %9d %5d " % (name, edges, seed)
+                throughputs = {}
+                for algorithm, backend in runs:
+                    if algorithm in AUGMENTING_PATH_ENGINES and size > ford_fulkerson_limit:
+                        line += " %22s" % "skipped"
+                        continue
+                    throughput, stages, counters = time_stages(topology, algorithm, backend)
+                    seconds = sum(stages.values())
+                    throughputs[algorithm + "/" + backend] = throughput
+                    results.append({
+                        "generator": name,
+                        "edges": edges,
+                        "data_centres": len(topology[1]),
+                        "seed": seed,
+                        "algorithm": algorithm,
+                        "backend": backend,
+                        "throughput": throughput,
+                        "seconds": seconds,
+                        "stages": stages,
+                        "counters": counters,
+                    })
+                    line += " %21.4fs" % seconds
+                print(line)
+
+                if len(set(throughputs.values())) > 1:
+                    raise AssertionError("engines disagree on " + name + " with " + str(edges) + " links and seed "
+                                         + str(seed) + ": " + str(throughputs))
+    return results
+
+def compare(previous, results, threshold, min_seconds):
+    """
+    Function description:
+        This function prints the runs which are slower than in a previous result file by more than threshold (a
+        fraction, 0.2 is 20%), and the runs whose throughput changed. Runs which took less than min_seconds before
+        are too short to be timed reliably, only their throughput is compared.
+
+    :Return:
+        The number of regressions found.
+
+    :Time complexity:
+        O(R), where R is the number of runs
+    """
+    before = {}
+    for run in previous["results"]:
+        before[(run["generator"], run["edges"], run["seed"], run["algorithm"], run["backend"])] = run
+
+    regressions = 0
+    for run in results:
+        key = (run["generator"], run["edges"], run["seed"], run["algorithm"], run["backend"])
+        if key not in before:
+            continue
+        old = before[key]
+        if old["throughput"] != run["throughput"]:
+            regressions += 1
+            print("throughput changed: %s %d links seed %d %s/%s: %d -> %d" % (key + (old["throughput"], run["throughput"])))
+        elif old["seconds"] >= min_seconds and run["seconds"] > old["seconds"] * (1 + threshold):
+            regressions += 1
+            print("slower: %s %d links seed %d %s/%s: %.4fs -> %.4fs" % (key + (old["seconds"], run["seconds"])))
+    print("%d regression(s) against the previous results" % regressions)
+    return regressions
+
+def run_bfs(edge_counts, seed=0, repeats=3):
+    """
+    Function description:
+        This function prints, for every size, the time taken by one breadth first search from the origin
+        (has_AugmentingPath on a network without flow) with each backend, and the speed-up of NumPy over Python.
+
+    :Time complexity:
+        O(repeats * (V + E)) per size and backend
+    """
+    backends = sorted(BACKENDS)
+    print("%8s %8s " % ("centres", "links") + " ".join("%16s" % name for name in backends) + " %10s" % "speed-up")
+    for edge_count in edge_counts:
+        topology = layered_fabric(edge_count, seed)
+        origin = topology[3]
+        seconds = {}
+        for name in backends:
+            residual_network = BACKENDS[name](*topology)
+            start = time.perf_counter()
+            for _ in range(repeats):
+                residual_network.has_AugmentingPath(origin)
+            seconds[name] = (time.perf_counter() - start) / repeats
+
+        print("%8d %8d " % (len(topology[1]), len(topology[0]))
+              + " ".join("%15.4fs" % seconds[name] for name in backends)
+              + " %9.1fx" % (seconds["python"] / seconds["numpy"]))
+
+def run_batch(edges, query_count, seed=0, algorithm="dinic"):
+    """
+    Function description:
+        This function prints the time taken by query_count random (origin, targets) queries over one topology,
+        with one maxThroughput call per query and with one BatchMaxThroughput.
+
+    :Time complexity:
+        query_count solves with each of the two approaches
+    """
+    connections, maxIn, maxOut, _, targets = layered_fabric(edges, seed)
+    rng = random.Random(seed)
+    queries = [(rng.randrange(targets[0]), targets) for _ in range(query_count)]
+
+    start = time.perf_counter()
+    expected = [maxThroughput(connections, maxIn, maxOut, origin, targets, algorithm) for origin, targets in queries]
+    separate = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = BatchMaxThroughput(connections, maxIn, maxOut, algorithm)
+    built = time.perf_counter() - start
+    throughputs = batch.solve_all(queries)
+    batched = time.perf_counter() - start
+    if throughputs != expected:
+        raise AssertionError("BatchMaxThroughput disagrees with maxThroughput")
+
+    print("%d queries on %d centres, %d links" % (query_count, len(maxIn), len(connections)))
+    print("  maxThroughput per query: %8.3fs" % separate)
+    print("  BatchMaxThroughput:      %8.3fs (%.3fs to build)" % (batched, built))
+
+def run_parallel(edges, worker_counts, seed=0):
+    """
+    Function description:
+        This function prints the time taken by parallel_push_relabel on one layered fabric with each number of workers,
+        and its speed-up over push_relabel. The speed-up is bounded by the number of CPUs of the machine, printed first.
+
+    :Time complexity:
+        One solve of push_relabel, and one of parallel_push_relabel per number of workers
+    """
+    import os
+
+    topology = layered_fabric(edges, seed)
+    origin = topology[3]
+    print("%d centres, %d links, %d CPUs" % (len(topology[1]), len(topology[0]), os.cpu_count() or 1))
+
+    residual_network = CompactResidualNetwork(*topology)
+    start = time.perf_counter()
+    expected = push_relabel(residual_network, origin)
+    sequential = time.perf_counter() - start
+    print("  push_relabel:                      %8.3fs" % sequential)
+
+    for workers in worker_counts:
+        residual_network = CompactResidualNetwork(*topology)
+        start = time.perf_counter()
+        throughput = parallel_push_relabel(residual_network, origin, workers=workers)
+        seconds = time.perf_counter() - start
+        if throughput != expected:
+            raise AssertionError("parallel_push_relabel with " + str(workers) + " workers disagrees with push_relabel")
+        print("  parallel_push_relabel, %2d workers: %8.3fs %6.2fx" % (workers, seconds, sequential / seconds))
+
+def run_service(edges, bursts, burst_size, distinct, seed=0, algorithm="dinic"):
+    """
+    Function description:
+        This function sends bursts of burst_size concurrent queries, drawn from distinct (origin, targets) queries on
+        one topology, and prints the median, 99th percentile and largest latency of the queries with one
+        maxThroughput per query in the default executor, and with a ThroughputService.
+
+    :Time complexity:
+        bursts * burst_size queries with each of the two approaches
+    """
+    import asyncio
+
+    from throughput_service import ThroughputService
+
+    connections, maxIn, maxOut, _, targets = layered_fabric(edges, seed)
+    rng = random.Random(seed)
+    origins = [rng.randrange(targets[0]) for _ in range(distinct)]
+    plan = [[rng.choice(origins) for _ in range(burst_size)] for _ in range(bursts)]
+
+    async def timed(solve, origin):
+        start = time.perf_counter()
+        throughput = await solve(connections, maxIn, maxOut, origin, targets)
+        return throughput, time.perf_counter() - start
+
+    async def send(solve):
+        throughputs = []
+        latencies = []
+        for burst in plan:
+            for throughput, seconds in await asyncio.gather(*[timed(solve, origin) for origin in burst]):
+                throughputs.append(throughput)
+                latencies.append(seconds)
+        latencies.sort()
+        return throughputs, latencies
+
+    async def separate(connections, maxIn, maxOut, origin, targets):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, maxThroughput, connections, maxIn, maxOut, origin, targets, algorithm)
+
+    service = ThroughputService(algorithm)
+    expected, before = asyncio.run(send(separate))
+    throughputs, after = asyncio.run(send(service.max_throughput))
+    if throughputs != expected:
+        raise AssertionError("ThroughputService disagrees with maxThroughput")
+
+    print("%d bursts of %d queries (%d distinct) on %d centres, %d links"
+          % (bursts, burst_size, distinct, len(maxIn), len(connections)))
+    print("%26s %10s %10s %10s" % ("", "median", "p99", "max"))
+    for name, latencies in (("maxThroughput per query", before), ("ThroughputService", after)):
+        print("%26s %9.3fs %9.3fs %9.3fs" % (name, latencies[len(latencies) // 2],
+                                             latencies[int(len(latencies) * 0.99)], latencies[-1]))
+    print("  %d solves, %d coalesced, %d answered from the cache"
+          % (service.solves, service.coalesced, service.cache_hits))
+
+def run_warm(edges, algorithms, changed=0.01, seed=0):
+    """
+    Function description:
+        This function solves a layered fabric, changes the capacity of a fraction of its links by up to 50% either way,
+        and prints the time of each engine on the new topology from zero flow and warm started from the previous flow.
+
+    :Time complexity:
+        Two solves per engine
+    """
+    connections, maxIn, maxOut, origin, targets = layered_fabric(edges, seed)
+    previous = maxThroughputRouting(connections, maxIn, maxOut, origin, targets, algorithm="dinic").connection_flows
+    rng = random.Random(seed)
+    changed_connections = []
+    for u, v, capacity in connections:
+        if rng.random() < changed:
+            capacity = max(1, int(capacity * rng.uniform(0.5, 1.5)))
+        changed_connections.append((u, v, capacity))
+    topology = (changed_connections, maxIn, maxOut, origin, targets)
+
+    print("%d centres, %d links, %.0f%% of the links changed" % (len(maxIn), len(connections), 100 * changed))
+    print("%16s %10s %10s" % ("", "cold", "warm"))
+    for algorithm in algorithms:
+        start = time.perf_counter()
+        expected = maxThroughput(*topology, algorithm=algorithm)
+        cold = time.perf_counter() - start
+        start = time.perf_counter()
+        throughput = maxThroughput(*topology, algorithm=algorithm, warm_start=previous)
+        warm = time.perf_counter() - start
+        if throughput != expected:
+            raise AssertionError("the warm start of " + algorithm + " changed the throughput")
+        print("%16s %9.3fs %9.3fs" % (algorithm, cold, warm))
+
+def run_reduce(edges, seed=0, algorithm="push_relabel"):
+    """
+    Function description:
+        This function prints, for every generator, the time of maxThroughput, of the reduction of ReducedTopology and
+        of the solve on the reduced network, and how much the reduction shrank the network.
+
+    :Time complexity:
+        One solve per generator on the full network and one on the reduced one, plus the reduction
+    """
+    from topology_reduction import ReducedTopology
+
+    print("%-26s %9s %9s %9s %9s %9s" % ("generator", "links", "full", "reduce", "solve", "vertices"))
+    for name in sorted(GENERATORS):
+        topology = GENERATORS[name](edges, seed)
+        start = time.perf_counter()
+        expected = maxThroughput(*topology, algorithm=algorithm)
+        full = time.perf_counter() - start
+
+        start = time.perf_counter()
+        reduced = ReducedTopology(*topology)
+        reduction = time.perf_counter() - start
+        start = time.perf_counter()
+        throughput = reduced.solve(algorithm)
+        solve = time.perf_counter() - start
+        if throughput != expected:
+            raise AssertionError("ReducedTopology disagrees with maxThroughput on " + name)
+
+        vertices = reduced.residual_network.vertex_count / (2 * (len(topology[1]) + 1))
+        print("%-26s %9d %8.3fs %8.3fs %8.3fs %8.1f%%"
+              % (name, len(topology[0]), full, reduction, solve, 100 * vertices))
+
+def run_parametric(edges, samples, high=2, seed=0, algorithm="dinic"):
+    """
+    Function description:
+        This function prints, for every generator but the adversarial one, the time of ThroughputCurve over the limits
+        of all the data centres scaled from 0 to high, and the time of samples solves of maxThroughput at evenly spaced
+        factors, checked against the curve.
+
+    :Time complexity:
+        The time complexity of ThroughputCurve, plus samples solves, per generator
+    """
+    from fractions import Fraction
+
+    from parametric_flow import ThroughputCurve
+
+    print("%-26s %9s %9s %9s %9s %9s" % ("generator", "links", "one", "curve", "solves", "sampled"))
+    for name in sorted(GENERATORS):
+        if name == "edmonds_karp_adversarial":
+            continue
+        connections, maxIn, maxOut, origin, targets = GENERATORS[name](edges, seed)
+        start = time.perf_counter()
+        maxThroughput(connections, maxIn, maxOut, origin, targets, algorithm=algorithm)
+        one = time.perf_counter() - start
+
+        start = time.perf_counter()
+        curve = ThroughputCurve(connections, maxIn, maxOut, origin, targets, 0, high, algorithm=algorithm)
+        parametric = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for k in range(1, samples + 1):
+            # the topology at the factor high * k / samples, in units of 1 / samples so it stays integers
+            factor = Fraction(high * k, samples)
+            scaled = [(u, v, samples * capacity) for u, v, capacity in connections]
+            throughput = maxThroughput(scaled, [high * k * limit for limit in maxIn],
+                                       [high * k * limit for limit in maxOut], origin, targets,
+                                       algorithm=algorithm)
+            if Fraction(throughput, samples) != curve.throughput(factor):
+                raise AssertionError("ThroughputCurve disagrees with maxThroughput on " + name + " at " + str(factor))
+        sampled = time.perf_counter() - start
+        print("%-26s %9d %8.3fs %8.3fs %9d %8.3fs"
+              % (name, len(connections), one, parametric, curve.solves, sampled))
+
+def run_estimate(edges, algorithms, seed=0):
+    """
+    Function description:
+        This function prints, for every generator but the adversarial one and every engine, the time of the exact solve
+        of maxThroughput and of maxThroughputEstimate asked whether half the maximum throughput is reachable, and within
+        10% and 1% of it, with the number of upper bounds each computed, checked against the exact throughput.
+
+    :Time complexity:
+        Four solves per generator and engine, three of them stopped early
+    """
+    print("%-26s %-17s %9s %9s %9s %9s %9s"
+          % ("generator", "algorithm", "links", "exact", "half", "10%", "1%"))
+    for name in sorted(GENERATORS):
+        if name == "edmonds_karp_adversarial":
+            continue
+        connections, maxIn, maxOut, origin, targets = GENERATORS[name](edges, seed)
+        for algorithm in algorithms:
+            start = time.perf_counter()
+            exact = maxThroughput(connections, maxIn, maxOut, origin, targets, algorithm=algorithm)
+            columns = ["%8.3fs" % (time.perf_counter() - start)]
+
+            for demand, epsilon in ((exact // 2, None), (None, 0.1), (None, 0.01)):
+                start = time.perf_counter()
+                estimate = maxThroughputEstimate(connections, maxIn, maxOut, origin, targets, demand, epsilon,
+                                                 algorithm)
+                columns.append("%.3fs/%d" % (time.perf_counter() - start, estimate.bounds))
+                if not estimate.flow <= exact <= estimate.upper_bound:
+                    raise AssertionError("maxThroughputEstimate does not bound maxThroughput on " + name)
+            print("%-26s %-17s %9d %9s %9s %9s %9s" % ((name, algorithm, len(connections)) + tuple(columns)))
+
+def run_startup(edges, runs, seed=0):
+    """
+    Function description:
+        This function writes one layered fabric in every format throughput_cli.py reads, and prints for each one the
+        median time of runs fresh jobs answering one query, from starting the interpreter to reading the first result
+        line and to the end of the job. The first line is the start-up of an empty interpreter.
+
+    :Time complexity:
+        runs interpreters started per format of topology
+    """
+    import os
+    import statistics
+    import subprocess
+    import tempfile
+
+    from compiled_graph import compile_topology
+    from topology_loader import write_binary_edges
+
+    connections, maxIn, maxOut, origin, targets = layered_fabric(edges, seed)
+    query = json.dumps({"origin": origin, "targets": targets}) + "\n"
+    directory = tempfile.mkdtemp()
+    paths = {name: os.path.join(directory, name) for name in ("topology.json", "limits.json", "edges.bin",
+                                                              "edges.csv", "topology.fnet")}
+    with open(paths["topology.json"], "w") as file:
+        json.dump({"connections": connections, "maxIn": maxIn, "maxOut": maxOut}, file)
+    with open(paths["limits.json"], "w") as file:
+        json.dump({"maxIn": maxIn, "maxOut": maxOut}, file)
+    write_binary_edges(paths["edges.bin"], connections)
+    with open(paths["edges.csv"], "w") as file:
+        file.writelines("%d,%d,%d\n" % connection for connection in connections)
+    compile_topology(paths["topology.fnet"], connections, maxIn, maxOut)
+
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "throughput_cli.py")
+    jobs = [
+        ("empty interpreter", [sys.executable, "-c", "print()"]),
+        ("JSON topology", [sys.executable, script, paths["topology.json"]]),
+        ("text edge file", [sys.executable, script, paths["edges.csv"], "--limits", paths["limits.json"]]),
+        ("binary edge file", [sys.executable, script, paths["edges.bin"], "--limits", paths["limits.json"]]),
+        ("compiled graph", [sys.executable, script, paths["topology.fnet"]]),
+    ]
+    print("%d centres, %d links, one query per job, median of %d jobs" % (len(maxIn), len(connections), runs))
+    print("%-20s %12s %12s" % ("", "first result", "whole job"))
+    for name, command in jobs:
+        first, whole = [], []
+        for _ in range(runs):
+            start = time.perf_counter()
+            job = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+            job.stdin.write(query)
+            job.stdin.close()
+            line = job.stdout.readline()
+            first.append(time.perf_counter() - start)
+            job.stdout.read()
+            job.wait()
+            whole.append(time.perf_counter() - start)
+            if name != "empty interpreter" and "throughput" not in line:
+                raise AssertionError("throughput_cli.py failed on the " + name + ": " + line)
+        print("%-20s %11.3fs %11.3fs" % (name, statistics.median(first), statistics.median(whole)))
+    for path in paths.values():
+        os.remove(path)
+    os.rmdir(directory)
+
+def main(argv):
+    """
+    This function parses the command line, see the description of this file.
+
+    :Return:
+        The exit status: 1 if --compare found a regression, otherwise 0.
+
+    :Time complexity:
+        The time complexity of the benchmark run
+    """
+    if argv[:1] == ["bfs"]:
+        run_bfs([10 ** 4, 3 * 10 ** 4, 10 ** 5, 3 * 10 ** 5, 10 ** 6])
+        return 0
+    if argv[:1] == ["batch"]:
+        run_batch(45000, 200)
+        return 0
+    if argv[:1] == ["parallel"]:
+        run_parallel(10 ** 6, [1, 2, 4, 8, 16])
+        return 0
+    if argv[:1] == ["warm"]:
+        run_warm(10 ** 5, ["ford_fulkerson", "dinic", "push_relabel"])
+        return 0
+    if argv[:1] == ["reduce"]:
+        run_reduce(10 ** 5)
+        return 0
+    if argv[:1] == ["startup"]:
+        run_startup(10 ** 4, 7)
+        return 0
+    if argv[:1] == ["estimate"]:
+        run_estimate(10 ** 5, ["dinic", "capacity_scaling"])
+        return 0
+    if argv[:1] == ["parametric"]:
+        run_parametric(10 ** 5, 20)
+        return 0
+    if argv[:1] == ["service"]:
+        run_service(45000, 5, 40, 10)
+        return 0
+    if argv[:1] == ["suite"]:
+        argv = argv[1:]
+
+    parser = argparse.ArgumentParser(description="Time the max-flow engines on synthetic topologies.")
+    parser.add_argument("--generators", nargs="+", default=sorted(GENERATORS), choices=sorted(GENERATORS))
+    parser.add_argument("--sizes", nargs="+", type=int, default=[10 ** 2, 10 ** 3, 10 ** 4, 10 ** 5],
+                        help="approximate numbers of connections, from 10^2 up to 10^6")
+    parser.add_argument("--seeds", nargs="+", type=int, default=[0])
+    parser.add_argument("--algorithms", nargs="+", default=sorted(ALGORITHMS), choices=sorted(ALGORITHMS))
+    parser.add_argument("--backends", nargs="+", default=["python"], choices=sorted(BACKENDS))
+    parser.add_argument("--ford-fulkerson-limit", type=int, default=10 ** 4,
+                        help="skip ford_fulkerson and capacity_scaling on the sizes above this")
+    parser.add_argument("--output", help="save the results to this JSON file")
+    parser.add_argument("--compare", help="report the regressions against this JSON file")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="slow-down reported as a regression by --compare, 0.2 is 20%%")
+    parser.add_argument("--min-seconds", type=float, default=0.01,
+                        help="runs shorter than this are not compared by time")
+    arguments = parser.parse_args(argv)
+
+    results = run_suite(arguments.generators, arguments.sizes, arguments.seeds, arguments.algorithms,
+                        arguments.backends, arguments.ford_fulkerson_limit)
+
+    if arguments.output:
+        with open(arguments.output, "w") as file:
+            json.dump({
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "results": results,
+            }, file, indent=1)
+
+    if arguments.compare:
+        with open(arguments.compare) as file:
+            previous = json.load(file)
+        if compare(previous, results, arguments.threshold, arguments.min_seconds) > 0:
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,242 @@
+"""
+This file compiles a topology once into a binary file holding its residual network, so later processes can
+memory-map it and start solving right away instead of building the network again.
+
+The compiled network is the one of BatchMaxThroughput: it does not depend on the origin and the targets, each data
+centre has an edge to the super target of capacity 0, and every query sets the few capacities it needs. So one
+compiled file answers any (origin, targets) query.
+
+The file is a header followed by arrays of signed 64-bit integers in the byte order of the header:
+
+    header      magic b"FNETGRPH", format version (uint32), byte order (uint32, 0 little-endian, 1 big-endian),
+                data centre count N, connection count C, vertex count V, edge count E (reverse edges included)
+                and split offset (int64 each). The extra vertex of data centre i is i + split offset.
+    head        V integers, the forward star of the residual network (see CompactResidualNetwork)
+    next        E integers
+    to          E integers
+    cap         E integers, the capacities without flow and without a query
+    maxIn       N integers
+    maxOut      N integers
+    incoming    N integers, the capacity of the connections into each data centre
+
+The arrays are used in place over the mapped pages, which are read-only and shared by every process mapping the same
+file. Each query copies only the capacities, into memory of its own.
+
+"""
+import mmap
+import struct
+import sys
+from array import array
+
+from maximum_throughput import ALGORITHMS, BatchMaxThroughput, CompactResidualNetwork, check_algorithm, configure_query
+from topology_loader import DEFAULT_CHUNK_EDGES, edge_chunks
+
+MAGIC = b"FNETGRPH"
+
+# the version of the format written by compile_topology, files of another version are refused
+FORMAT_VERSION = 1
+
+# magic, version, byte order, data centre count, connection count, vertex count, edge count, split offset
+HEADER = struct.Struct("<8sIIqqqqq")
+
+def compile_topology(path, source, maxIn, maxOut, chunk_edges=DEFAULT_CHUNK_EDGES):
+    """
+    Function description:
+        This function builds the residual network of a topology and writes it to a compiled file.
+
+    :Input:
+        path: the path of the compiled file to write
+        source: the connections, as a list or iterable of tuples (u, v, capacity) or a path to a text or binary
+            edge file (see topology_loader.edge_chunks)
+        maxIn, maxOut: the same as maxThroughput
+        chunk_edges: the number of connections read at once
+
+    :Return:
+        None
+
+    :Time complexity:
+        O(V + E), where V is the number of data centres and E is the number of connections
+
+    :Aux space complexity:
+        O(V + E), where V is the number of data centres and E is the number of connections
+    """
+    # no origin and no target, the same network as BatchMaxThroughput
+    network = CompactResidualNetwork.from_connection_chunks(edge_chunks(source, chunk_edges), maxIn, maxOut, None, [])
+    offset = network.data_centre_count + 1
+    for i in range(network.data_centre_count):
+        network.add_edge(i + offset, network.super_target, 0)
+
+    byte_order = 0 if sys.byteorder == "little" else 1
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, byte_order, network.data_centre_count, network.connection_count,
+                         network.vertex_count, len(network.to), offset)
+    with open(path, "wb") as file:
+        file.write(header)
+        for values in (network.head, network.next, network.to, network.cap, array("q", maxIn), array("q", maxOut),
+                       array("q", network.incoming[:network.data_centre_count])):
+            values.tofile(file)
+
+class CompiledGraph(BatchMaxThroughput):
+    """
+    This class answers (origin, targets) queries over a compiled file, like BatchMaxThroughput over the network it
+    would have built. It can be used as a context manager to unmap the file when done.
+    """
+
+    def __init__(self, path, algorithm="dinic"):
+        """
+        This is the constructor for the CompiledGraph class. It maps the compiled file and checks its header.
+
+        :Input:
+            path: the path of a file written by compile_topology
+            algorithm: the name of the engine used for every query, one of the keys of ALGORITHMS
+
+        :Return:
+            None
+
+        :Raise:
+            ValueError, if the algorithm is unknown, or if the file is not a compiled file of this version and byte
+            order
+
+        :Time complexity:
+            O(V), where V is the number of vertex in graph, the arrays are not read
+
+        :Aux space complexity:
+            O(V + E) for the capacities of the queries, the arrays stay in the mapped pages
+        """
+        check_algorithm(algorithm)
+        self.algorithm = algorithm
+        self.path = path
+
+        with open(path, "rb") as file:
+            self.mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.mapped) < HEADER.size:
+            self.mapped.close()
+            raise ValueError(path + " is not a compiled graph: it is shorter than the header")
+        magic, version, byte_order, data_centre_count, connection_count, vertex_count, edge_count, offset = \
+            HEADER.unpack_from(self.mapped)
+        sizes = [vertex_count, edge_count, edge_count, edge_count, data_centre_count, data_centre_count,
+                 data_centre_count]
+        error = None
+        if magic != MAGIC:
+            error = " is not a compiled graph"
+        elif version != FORMAT_VERSION:
+            error = " has format version " + str(version) + ", expected " + str(FORMAT_VERSION) + ", compile it again"
+        elif byte_order != (0 if sys.byteorder == "little" else 1):
+            error = " was compiled on a machine with another byte order, compile it again"
+        elif len(self.mapped) != HEADER.size + 8 * sum(sizes):
+            error = " is truncated or corrupted: its size does not match its header"
+        if error is not None:
+            self.mapped.close()
+            raise ValueError(path + error)
+
+        self.views = []
+        position = HEADER.size
+        for size in sizes:
+            self.views.append(memoryview(self.mapped)[position:position + 8 * size])
+            position += 8 * size
+        head, next_edge, to = (view.cast("q") for view in self.views[:3])
+        # the capacities stay raw bytes, each query copies them into its own array
+        self.base_cap = self.views[3]
+        self.maxIn, self.maxOut, self.incoming = (view.cast("q") for view in self.views[4:])
+
+        cap = array("q", bytes(8 * edge_count))
+        self.residual_network = CompactResidualNetwork.from_arrays(head, next_edge, to, cap, data_centre_count,
+                                                                   connection_count)
+        self.cap_bytes = memoryview(cap).cast("B")
+
+    def solve(self, origin, targets):
+        """
+        This method returns the maximum throughput from origin to targets, the same as maxThroughput.
+
+        :Time complexity:
+            O(E) to copy the capacities, plus the time complexity of the engine
+
+        :Aux space complexity:
+            O(V), where V is the number of vertex in graph
+        """
+        network = self.residual_network
+        # copying the capacities also clears the flow of the previous query
+        self.cap_bytes[:] = self.base_cap
+        network.targets = targets
+        configure_query(network, self.maxIn, self.maxOut, self.incoming, origin, targets)
+        return ALGORITHMS[self.algorithm](network, origin)
+
+    def solve_all(self, queries, processes=None):
+        """
+        This method returns the maximum throughput of every (origin, targets) query, in the order of the queries.
+        The worker processes map the compiled file themselves, so the network is neither copied nor sent to them.
+
+        :Input:
+            queries: an iterable of (origin, targets) tuples
+            processes: None or 1 to solve the queries in this process, otherwise the number of worker processes
+
+        :Return:
+            A list of the maximum throughput of each query.
+
+        :Time complexity:
+            O(Q * (E + engine)), where Q is the number of queries, shared between the processes
+
+        :Aux space complexity:
+            O(E) per process for the capacities being solved
+        """
+        queries = list(queries)
+        if processes is None or processes <= 1 or len(queries) <= 1:
+            return [self.solve(origin, targets) for origin, targets in queries]
+
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(processes, initializer=_compiled_worker_init, initargs=(self.path, self.algorithm)) as pool:
+            chunk_size = max(1, len(queries) // (processes * 4))
+            return list(pool.map(_compiled_worker_solve, queries, chunksize=chunk_size))
+
+    def close(self):
+        """
+        This method unmaps the compiled file. The object cannot solve anymore afterwards.
+
+        :Time complexity:
+            O(1)
+        """
+        network = self.residual_network
+        for view in (network.head, network.next, network.to, self.maxIn, self.maxOut, self.incoming, *self.views):
+            view.release()
+        self.mapped.close()
+
+    def __enter__(self):
+        """
+        This method returns the graph itself, for a with block.
+
+        :Time complexity:
+            O(1)
+        """
+        return self
+
+    def __exit__(self, *exc_info):
+        """
+        This method unmaps the compiled file at the end of a with block, see close.
+
+        :Time complexity:
+            O(1)
+        """
+        self.close()
+
+# the compiled graph of a CompiledGraph worker process, set by _compiled_worker_init
+_compiled_worker_graph = None
+
+def _compiled_worker_init(path, algorithm):
+    """
+    Map the compiled file in a worker process of CompiledGraph.solve_all.
+
+    :Time complexity:
+        O(V), to map the file and check its header
+    """
+    global _compiled_worker_graph
+    _compiled_worker_graph = CompiledGraph(path, algorithm)
+
+def _compiled_worker_solve(query):
+    """
+    Solve one (origin, targets) query in a worker process of CompiledGraph.solve_all.
+
+    :Time complexity:
+        The time complexity of CompiledGraph.solve
+    """
+    origin, targets = query
+    return _compiled_worker_graph.solve(origin, targets)
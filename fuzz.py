@@ -0,0 +1,615 @@
+"""
+This file checks the max-flow engines against each other on many small random topologies (differential fuzzing).
+
+Run it with:
+    python fuzz.py [options]    solve --graphs random topologies with every engine and backend, check each solve
+                                and report the failures shrunk to the smallest topology still failing (see --help)
+    python fuzz.py --replay S   check the topology of seed S alone and print it
+
+Each topology comes from its seed, so a failure is reproduced by its seed alone. The topologies are small (a few
+data centres) but full of the edge cases of the input: an origin with a maxOut of 0, targets which cannot be reached
+or have no connection in (so their edge to the super target has a capacity of 0), duplicate connections, connections
+from a data centre to itself, capacities of 0 and capacities far past 32 bits.
+
+Every engine of ALGORITHMS is run on every backend of BACKENDS, and the flow it leaves in the arrays is checked
+against the capacities of the residual network before the solve:
+    - capacity bounds: the flow on each edge is between 0 and its capacity.
+    - conservation: every vertex but the origin and the super target sends out what it receives.
+    - value: the flow into the super target is the throughput the engine returned.
+    - certificate: the super target cannot be reached from the origin in the residual network, and the capacity of
+      the cut around the reachable vertices is the throughput, so the flow is a maximum one (max-flow = min-cut).
+The throughput must also be the one of ford_fulkerson on the original ResidualNetwork, which is the reference.
+
+The entry points which keep state between solves, or rewrite the topology before solving, are then checked against
+the same reference (see check_features): a warm start from random hints, IncrementalMaxThroughput edited away from
+the topology and back, BatchMaxThroughput after another query, maxThroughputMultiOrigin with the origin alone,
+ThroughputCurve at a factor of 1, ReducedTopology, a compiled graph, the bounds of maxThroughputEstimate and
+GomoryHuTree on the topology with every link made symmetric. The paths of maxThroughputRouting must carry the
+throughput within the flow of each connection, and the bottlenecks of maxThroughputMinCut must add up to the
+throughput, name the limit which binds and be critical exactly when raising them by 1 raises the throughput.
+--engines-only leaves them out.
+
+parallel_push_relabel starts its worker processes on every solve, so it is left out unless asked for with
+--algorithms.
+
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+from compiled_graph import CompiledGraph, compile_topology
+from gomory_hu import GomoryHuTree
+from maximum_throughput import (ALGORITHMS, BACKENDS, ESTIMATE_ALGORITHMS, BatchMaxThroughput, IncrementalMaxThroughput,
+                                ResidualNetwork, ford_fulkerson, import_numpy, maxThroughput, maxThroughputEstimate,
+                                maxThroughputMinCut, maxThroughputMultiOrigin, maxThroughputRouting, split_capacity)
+from parametric_flow import ThroughputCurve
+from topology_reduction import ReducedTopology
+
+# the engines run by default, parallel_push_relabel starts processes on every solve
+DEFAULT_ALGORITHMS = sorted(name for name in ALGORITHMS if name != "parallel_push_relabel")
+
+def random_topology(seed, max_centres=8):
+    """
+    Function description:
+        This function generates the small random topology of a seed, with the edge cases of the description of this
+        file more often than chance would give them.
+
+    :Input:
+        seed: the seed of the random generator
+        max_centres: the largest number of data centres
+
+    :Return:
+        A tuple (connections, maxIn, maxOut, origin, targets) that can be passed to maxThroughput
+
+    :Time complexity:
+        O(V + E), where V is the number of data centres and E is the number of connections
+
+    :Aux space complexity:
+        O(V + E), where V is the number of data centres and E is the number of connections
+    """
+    rng = random.Random(seed)
+    data_centres = rng.randint(1, max_centres)
+    # small capacities give many minimum cuts of the same capacity, large ones overflow 32 bits
+    largest = 10 ** 12 if rng.random() < 0.1 else rng.choice([1, 3, 20])
+
+    def capacity():
+        return 0 if rng.random() < 0.1 else rng.randint(1, largest)
+
+    connections = []
+    for _ in range(rng.randint(0, 3 * data_centres)):
+        if len(connections) > 0 and rng.random() < 0.15:
+            u, v, _ = rng.choice(connections)
+        else:
+            u = rng.randrange(data_centres)
+            v = rng.randrange(data_centres)
+            if u == v and data_centres > 1 and rng.random() < 0.8:
+                v = (u + rng.randint(1, data_centres - 1)) % data_centres
+        connections.append((u, v, capacity()))
+
+    maxIn = [capacity() * rng.randint(1, 3) for _ in range(data_centres)]
+    maxOut = [capacity() * rng.randint(1, 3) for _ in range(data_centres)]
+    origin = rng.randrange(data_centres)
+    if rng.random() < 0.1:
+        maxOut[origin] = 0
+
+    others = [i for i in range(data_centres) if i != origin]
+    targets = rng.sample(others, rng.randint(0, len(others)))
+    if len(targets) > 0 and rng.random() < 0.2:
+        # a target with no connection in
+        cut_off = rng.choice(targets)
+        connections = [connection for connection in connections if connection[1] != cut_off]
+    if len(targets) > 0 and rng.random() < 0.05:
+        targets.append(rng.choice(targets))
+    return connections, maxIn, maxOut, origin, targets
+
+def check_flow(network, origin, throughput, capacities):
+    """
+    Function description:
+        This function checks the flow an engine left in a residual network, see the description of this file.
+
+    :Input:
+        network: A CompactResidualNetwork object after the solve
+        origin: the integer ID origin of the data centre where the data to be backed up is located
+        throughput: the throughput the engine returned
+        capacities: the capacity of each edge before the solve, a copy of network.cap
+
+    :Return:
+        None if the flow passes every check, otherwise a string describing the first check it fails
+
+    :Time complexity:
+        O(V + E),where V is the number of vertex and E is the number of edges in graph
+
+    :Aux space complexity:
+        O(V),where V is the number of vertex in graph
+    """
+    to, cap = network.to, network.cap
+    sink = network.super_target
+    excess = [0] * network.vertex_count
+    for edge in range(0, len(to), 2):
+        capacity = capacities[edge] + capacities[edge + 1]
+        flow = cap[edge + 1] - capacities[edge + 1]
+        if not 0 <= flow <= capacity or cap[edge] + cap[edge + 1] != capacity:
+            return ("edge " + str(edge) + " carries " + str(flow) + " over a capacity of " + str(capacity))
+        excess[to[edge]] += flow
+        excess[to[edge + 1]] -= flow
+
+    for v in range(network.vertex_count):
+        if v != origin and v != sink and excess[v] != 0:
+            return "vertex " + str(v) + " receives " + str(excess[v]) + " more than it sends"
+    if excess[sink] != throughput or excess[origin] != -throughput and origin != sink:
+        return ("the engine returned " + str(throughput) + " but " + str(excess[sink]) + " reaches the super "
+                "target and " + str(-excess[origin]) + " leaves the origin")
+
+    reached = network.source_side(origin)
+    if reached[sink]:
+        return "the super target can still be reached from the origin, the flow is not maximum"
+    cut = 0
+    for edge in range(0, len(to), 2):
+        if reached[to[edge + 1]] and not reached[to[edge]]:
+            cut += capacities[edge] + capacities[edge + 1]
+    if cut != throughput:
+        return "the cut around the reachable vertices has a capacity of " + str(cut) + ", not " + str(throughput)
+    return None
+
+def check_topology(topology, algorithms=DEFAULT_ALGORITHMS, backends=("python",), features=True):
+    """
+    Function description:
+        This function solves a topology with every engine on every backend and checks each solve.
+
+    :Input:
+        topology: a tuple (connections, maxIn, maxOut, origin, targets)
+        algorithms: the names of the engines, keys of ALGORITHMS
+        backends: the names of the residual network classes, keys of BACKENDS
+        features: True to also run check_features
+
+    :Return:
+        A list of strings, one per failed solve, empty if every solve passed
+
+    :Time complexity:
+        The time complexity of the engines, plus O(V + E) per engine and backend to check the flow
+    """
+    connections, maxIn, maxOut, origin, targets = topology
+    failures = []
+    try:
+        # ResidualNetwork rewrites the connections in place
+        expected = ford_fulkerson(ResidualNetwork(list(connections), maxIn, maxOut, origin, targets), origin)
+    except Exception as error:
+        return ["ResidualNetwork: " + type(error).__name__ + ": " + str(error)]
+
+    for backend in backends:
+        for algorithm in algorithms:
+            name = algorithm + "/" + backend
+            try:
+                network = BACKENDS[backend](connections, maxIn, maxOut, origin, targets)
+                capacities = list(network.cap)
+                throughput = ALGORITHMS[algorithm](network, origin)
+            except Exception as error:
+                failures.append(name + ": " + type(error).__name__ + ": " + str(error))
+                continue
+            if throughput != expected:
+                failures.append(name + ": " + str(throughput) + " instead of " + str(expected))
+                continue
+            problem = check_flow(network, origin, throughput, capacities)
+            if problem is not None:
+                failures.append(name + ": " + problem)
+    if features:
+        failures += check_features(topology, expected)
+    return failures
+
+def check_features(topology, expected):
+    """
+    Function description:
+        This function checks the entry points of the description of this file against the maximum throughput of a
+        topology. The random choices (hints, edits, engines, demand) come from a generator seeded with the topology,
+        so a shrunk topology is checked the same way every time.
+
+    :Input:
+        topology: a tuple (connections, maxIn, maxOut, origin, targets)
+        expected: the maximum throughput of the topology
+
+    :Return:
+        A list of strings, one per failed check, empty if every check passed
+
+    :Time complexity:
+        A few solves of the topology, plus V - 1 for GomoryHuTree
+    """
+    connections, maxIn, maxOut, origin, targets = topology
+    rng = random.Random(repr(topology))
+    algorithm = rng.choice(DEFAULT_ALGORITHMS)
+    failures = []
+
+    def check(name, solve):
+        try:
+            throughput = solve()
+        except Exception as error:
+            failures.append(name + ": " + type(error).__name__ + ": " + str(error))
+            return
+        if throughput != expected:
+            failures.append(name + ": " + str(throughput) + " instead of " + str(expected))
+
+    hints = [rng.randint(0, capacity) for _, _, capacity in connections]
+    check("warm start/" + algorithm,
+          lambda: maxThroughput(connections, maxIn, maxOut, origin, targets, algorithm, warm_start=hints))
+    check("IncrementalMaxThroughput/" + algorithm, lambda: _incremental_round_trip(topology, rng, algorithm))
+    check("BatchMaxThroughput/" + algorithm, lambda: _batch_after_other_query(topology, rng, algorithm))
+    check("maxThroughputMultiOrigin/" + algorithm,
+          lambda: maxThroughputMultiOrigin(connections, maxIn, maxOut, [origin], targets, algorithm=algorithm).throughput)
+    check("ThroughputCurve/" + algorithm,
+          lambda: ThroughputCurve(connections, maxIn, maxOut, origin, targets, 0, 2, algorithm=algorithm).throughput(1))
+    check("ReducedTopology/" + algorithm,
+          lambda: ReducedTopology(connections, maxIn, maxOut, origin, targets, rng.random() < 0.5).solve(algorithm))
+    check("CompiledGraph/" + algorithm, lambda: _compiled_solve(topology, algorithm))
+
+    estimate_algorithm = rng.choice(ESTIMATE_ALGORITHMS)
+    demand = rng.choice([None, rng.randint(0, 2 * expected + 1)])
+    epsilon = rng.choice([None, 0, 0.1])
+    name = "maxThroughputEstimate/" + estimate_algorithm
+    try:
+        estimate = maxThroughputEstimate(connections, maxIn, maxOut, origin, targets, demand, epsilon,
+                                         estimate_algorithm)
+        if not estimate.flow <= expected <= estimate.upper_bound:
+            failures.append(name + ": bounds " + str(estimate.flow) + " to " + str(estimate.upper_bound)
+                            + " do not hold " + str(expected))
+        elif demand is None and epsilon is None and not estimate.exact:
+            failures.append(name + ": not exact without demand and epsilon")
+    except Exception as error:
+        failures.append(name + ": " + type(error).__name__ + ": " + str(error))
+
+    failures += _check_routing(topology, expected, algorithm)
+    failures += _check_min_cut(topology, expected, algorithm)
+    failures += _check_gomory_hu(topology, algorithm)
+    return failures
+
+def _incremental_round_trip(topology, rng, algorithm):
+    """
+    Build IncrementalMaxThroughput on the topology with a connection and the limits of a data centre changed, set
+    them back one at a time, and return the throughput it ends with.
+
+    :Time complexity:
+        One solve of the topology, plus two repairs of IncrementalMaxThroughput
+    """
+    connections, maxIn, maxOut, origin, targets = topology
+    changed = list(connections)
+    index = rng.randrange(len(connections)) if len(connections) > 0 else None
+    if index is not None:
+        u, v, capacity = connections[index]
+        changed[index] = (u, v, rng.randint(0, 2 * capacity + 1))
+    data_centre = rng.randrange(len(maxIn))
+    changed_in, changed_out = list(maxIn), list(maxOut)
+    changed_in[data_centre] = rng.randint(0, 2 * maxIn[data_centre] + 1)
+    changed_out[data_centre] = rng.randint(0, 2 * maxOut[data_centre] + 1)
+
+    incremental = IncrementalMaxThroughput(changed, changed_in, changed_out, origin, targets, algorithm)
+    if index is not None:
+        incremental.set_connection_capacity(index, connections[index][2])
+    return incremental.set_data_centre_limits(data_centre, maxIn[data_centre], maxOut[data_centre])
+
+def _batch_after_other_query(topology, rng, algorithm):
+    """
+    Solve another query on BatchMaxThroughput first, so the flow it leaves has to be cleared, then the topology.
+
+    :Time complexity:
+        Two solves of the topology
+    """
+    connections, maxIn, maxOut, origin, targets = topology
+    batch = BatchMaxThroughput(connections, maxIn, maxOut, algorithm)
+    other = rng.randrange(len(maxIn))
+    batch.solve(other, [target for target in range(len(maxIn)) if target != other])
+    return batch.solve(origin, targets)
+
+def _compiled_solve(topology, algorithm):
+    """
+    Compile the topology to a temporary file, map it and solve it.
+
+    :Time complexity:
+        O(V + E) to write and map the file, plus one solve
+    """
+    connections, maxIn, maxOut, origin, targets = topology
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "topology.fnet")
+        compile_topology(path, connections, maxIn, maxOut)
+        with CompiledGraph(path, algorithm) as graph:
+            return graph.solve(origin, targets)
+
+def _check_routing(topology, expected, algorithm):
+    """
+    Check the RoutingPlan of the topology: its paths carry the throughput, along the connections they name, and
+    never more over a connection than its flow.
+
+    :Time complexity:
+        One solve of the topology, plus O(E * P) to split the flow into P paths
+    """
+    connections, maxIn, maxOut, origin, targets = topology
+    name = "maxThroughputRouting/" + algorithm
+    try:
+        plan = maxThroughputRouting(connections, maxIn, maxOut, origin, targets, algorithm, decompose=True)
+    except Exception as error:
+        return [name + ": " + type(error).__name__ + ": " + str(error)]
+    if plan.throughput != expected:
+        return [name + ": " + str(plan.throughput) + " instead of " + str(expected)]
+
+    failures = []
+    carried = sum(rate for rate, _, _ in plan.paths)
+    if carried != plan.throughput:
+        failures.append(name + ": the paths carry " + str(carried) + " instead of " + str(plan.throughput))
+    through = [0] * len(connections)
+    for rate, data_centres, path_connections in plan.paths:
+        if rate <= 0 or data_centres[0] != origin or data_centres[-1] not in targets:
+            failures.append(name + ": path " + str(data_centres) + " with rate " + str(rate))
+        for k in range(len(path_connections)):
+            index = path_connections[k]
+            through[index] += rate
+            if tuple(connections[index][:2]) != (data_centres[k], data_centres[k + 1]):
+                failures.append(name + ": connection " + str(index) + " does not link the data centres of its path")
+    for index in range(len(connections)):
+        if through[index] > plan.connection_flows[index]:
+            failures.append(name + ": the paths send " + str(through[index]) + " over connection " + str(index)
+                            + ", which carries " + str(plan.connection_flows[index]))
+    return failures
+
+def _check_min_cut(topology, expected, algorithm):
+    """
+    Check the MinCutReport of the topology: the capacity of the cut is the throughput, the limit named for each data
+    centre is the one which binds, and a bottleneck is critical if and only if raising it by 1 raises the throughput.
+
+    :Time complexity:
+        One solve of the topology, plus one solve per bottleneck
+    """
+    connections, maxIn, maxOut, origin, targets = topology
+    name = "maxThroughputMinCut/" + algorithm
+    try:
+        report = maxThroughputMinCut(connections, maxIn, maxOut, origin, targets, algorithm)
+    except Exception as error:
+        return [name + ": " + type(error).__name__ + ": " + str(error)]
+    if report.throughput != expected or report.capacity != expected:
+        return [name + ": throughput " + str(report.throughput) + " and cut capacity " + str(report.capacity)
+                + " instead of " + str(expected)]
+
+    failures = []
+    capacity = 0
+    # each bottleneck with the topology where it is raised by 1
+    raised = []
+    for index, critical in report.connections:
+        capacity += connections[index][2]
+        changed = list(connections)
+        u, v, amount = connections[index]
+        changed[index] = (u, v, amount + 1)
+        raised.append(("connection " + str(index), critical, changed, maxIn, maxOut))
+    for data_centre, limit, critical in report.data_centres:
+        capacity += split_capacity(data_centre, maxIn, maxOut, origin, targets)
+        changed_in, changed_out = list(maxIn), list(maxOut)
+        if limit in ("maxIn", "maxIn/maxOut"):
+            changed_in[data_centre] += 1
+        if limit in ("maxOut", "maxIn/maxOut"):
+            changed_out[data_centre] += 1
+        if data_centre == origin:
+            binding = limit == "maxOut"
+        elif data_centre in targets:
+            binding = limit == "maxIn"
+        else:
+            # the smaller limit binds, both of them when they are equal
+            binding = limit == ("maxIn" if maxIn[data_centre] < maxOut[data_centre] else
+                                "maxOut" if maxOut[data_centre] < maxIn[data_centre] else "maxIn/maxOut")
+        if not binding:
+            failures.append(name + ": " + limit + " of data centre " + str(data_centre) + " does not bind")
+        raised.append((limit + " of data centre " + str(data_centre), critical, connections, changed_in, changed_out))
+    if capacity != report.capacity:
+        failures.append(name + ": the bottlenecks add up to " + str(capacity) + " instead of " + str(report.capacity))
+
+    for label, critical, changed, changed_in, changed_out in raised:
+        gain = maxThroughput(changed, changed_in, changed_out, origin, targets, algorithm) > expected
+        if gain != critical:
+            failures.append(name + ": " + label + " is " + ("" if critical else "not ") + "critical, but raising it "
+                            + ("raises" if gain else "does not raise") + " the throughput")
+    return failures
+
+def _check_gomory_hu(topology, algorithm):
+    """
+    Check GomoryHuTree on the topology with every link made symmetric, between the origin and its first target.
+
+    :Time complexity:
+        V solves of the symmetric topology for the tree, plus the pairs solved by all_pairs
+    """
+    connections, maxIn, maxOut, origin, targets = topology
+    if len(targets) == 0:
+        return []
+    target = targets[0]
+    symmetric = list(connections) + [(v, u, capacity) for u, v, capacity in connections]
+    name = "GomoryHuTree/" + algorithm
+    try:
+        expected = maxThroughput(symmetric, maxIn, maxOut, origin, [target], algorithm)
+        tree = GomoryHuTree(symmetric, maxIn, maxOut, True, algorithm)
+        answers = (tree.max_throughput(origin, target), tree.all_pairs()[origin][target])
+    except Exception as error:
+        return [name + ": " + type(error).__name__ + ": " + str(error)]
+    if answers != (expected, expected):
+        return [name + ": " + str(answers) + " instead of " + str(expected)]
+    return []
+
+def shrink(topology, fails):
+    """
+    Function description:
+        This function shrinks a failing topology to a smaller one which still fails: it drops connections, targets and
+        data centres and lowers the capacities one at a time, keeping each change after which fails(topology) is still
+        true, until no change is kept.
+
+    :Input:
+        topology: a tuple (connections, maxIn, maxOut, origin, targets) for which fails is true
+        fails: a function of a topology returning True if it fails
+
+    :Return:
+        The smallest failing topology found
+
+    :Time complexity:
+        O((V + E)^2) calls of fails in the worst case, where V is the number of data centres and E is the number of
+        connections
+    """
+    changed = True
+    while changed:
+        changed = False
+        for candidate in _smaller_topologies(topology):
+            if fails(candidate):
+                topology = candidate
+                changed = True
+                break
+    return topology
+
+def _smaller_topologies(topology):
+    """
+    Generate the topologies one step smaller than a topology, the largest steps first.
+
+    :Time complexity:
+        O(V + E) per topology generated
+    """
+    connections, maxIn, maxOut, origin, targets = topology
+    for i in range(len(connections)):
+        yield connections[:i] + connections[i + 1:], maxIn, maxOut, origin, targets
+    for i in range(len(targets)):
+        yield connections, maxIn, maxOut, origin, targets[:i] + targets[i + 1:]
+    for removed in range(len(maxIn)):
+        if removed != origin:
+            yield _remove_data_centre(topology, removed)
+    for i in range(len(connections)):
+        u, v, capacity = connections[i]
+        for smaller in _smaller_values(capacity):
+            yield connections[:i] + [(u, v, smaller)] + connections[i + 1:], maxIn, maxOut, origin, targets
+    for limits in (maxIn, maxOut):
+        for i in range(len(limits)):
+            for smaller in _smaller_values(limits[i]):
+                lowered = limits[:i] + [smaller] + limits[i + 1:]
+                if limits is maxIn:
+                    yield connections, lowered, maxOut, origin, targets
+                else:
+                    yield connections, maxIn, lowered, origin, targets
+
+def _smaller_values(value):
+    """
+    The values tried in place of a capacity by shrink, smallest first.
+
+    :Time complexity:
+        O(1)
+    """
+    return [smaller for smaller in sorted({0, 1, value // 2, value - 1}) if 0 <= smaller < value]
+
+def _remove_data_centre(topology, removed):
+    """
+    Remove a data centre and its connections from a topology, the data centres after it moving down by one.
+
+    :Time complexity:
+        O(V + E), where V is the number of data centres and E is the number of connections
+    """
+    connections, maxIn, maxOut, origin, targets = topology
+
+    def renumber(data_centre):
+        return data_centre - 1 if data_centre > removed else data_centre
+
+    return ([(renumber(u), renumber(v), capacity) for u, v, capacity in connections if removed not in (u, v)],
+            maxIn[:removed] + maxIn[removed + 1:], maxOut[:removed] + maxOut[removed + 1:], renumber(origin),
+            [renumber(target) for target in targets if target != removed])
+
+def fuzz_seeds(first, count, max_centres=8, algorithms=DEFAULT_ALGORITHMS, backends=("python",), features=True):
+    """
+    Function description:
+        This function checks the topologies of the seeds from first to first + count - 1.
+
+    :Return:
+        A list of tuples (seed, failures) for the failing seeds
+
+    :Time complexity:
+        count times the time complexity of check_topology
+    """
+    failing = []
+    for seed in range(first, first + count):
+        failures = check_topology(random_topology(seed, max_centres), algorithms, backends, features)
+        if len(failures) > 0:
+            failing.append((seed, failures))
+    return failing
+
+def _fuzz_chunk(arguments):
+    """
+    Run fuzz_seeds in a worker process.
+
+    :Time complexity:
+        The time complexity of fuzz_seeds
+    """
+    return fuzz_seeds(*arguments)
+
+def main(argv):
+    """
+    This function parses the command line, see the description of this file.
+
+    :Return:
+        The exit status: 1 if a topology failed, otherwise 0.
+
+    :Time complexity:
+        --graphs times the time complexity of check_topology, shared between the processes
+    """
+    parser = argparse.ArgumentParser(description="Check the max-flow engines against each other on random topologies.")
+    parser.add_argument("--graphs", type=int, default=10 ** 5, help="the number of random topologies")
+    parser.add_argument("--seed", type=int, default=0, help="the seed of the first topology")
+    parser.add_argument("--max-centres", type=int, default=8, help="the largest number of data centres")
+    parser.add_argument("--algorithms", nargs="+", default=DEFAULT_ALGORITHMS, choices=sorted(ALGORITHMS))
+    parser.add_argument("--backends", nargs="+", default=None, choices=sorted(BACKENDS),
+                        help="the residual networks to check, all of them by default (numpy if it is installed)")
+    parser.add_argument("--processes", type=int, default=1, help="the number of worker processes")
+    parser.add_argument("--chunk", type=int, default=2000, help="the number of topologies per task of a worker")
+    parser.add_argument("--replay", type=int, help="check the topology of this seed alone and print it")
+    parser.add_argument("--engines-only", action="store_true",
+                        help="only check the engines, not the entry points of check_features")
+    arguments = parser.parse_args(argv)
+
+    backends = arguments.backends
+    if backends is None:
+        backends = ["python"]
+        try:
+            import_numpy()
+            backends.append("numpy")
+        except ImportError:
+            pass
+
+    features = not arguments.engines_only
+
+    def fails(topology):
+        return len(check_topology(topology, arguments.algorithms, backends, features)) > 0
+
+    if arguments.replay is not None:
+        topology = random_topology(arguments.replay, arguments.max_centres)
+        print(topology)
+        failures = check_topology(topology, arguments.algorithms, backends, features)
+        for failure in failures:
+            print("  " + failure)
+        if len(failures) == 0:
+            print("  ok")
+        return 1 if len(failures) > 0 else 0
+
+    start = time.perf_counter()
+    tasks = [(first, min(arguments.chunk, arguments.seed + arguments.graphs - first), arguments.max_centres,
+              arguments.algorithms, backends, features)
+             for first in range(arguments.seed, arguments.seed + arguments.graphs, arguments.chunk)]
+    if arguments.processes > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(arguments.processes) as pool:
+            chunks = list(pool.map(_fuzz_chunk, tasks))
+    else:
+        chunks = [_fuzz_chunk(task) for task in tasks]
+    failing = [failure for chunk in chunks for failure in chunk]
+    elapsed = time.perf_counter() - start
+
+    print("%d topologies, %d engine solves each, in %.1fs (%.0f topologies per second)"
+          % (arguments.graphs, len(arguments.algorithms) * len(backends) + 1, elapsed,
+             arguments.graphs / max(elapsed, 1e-9)))
+    for seed, failures in failing[:10]:
+        print("seed %d:" % seed)
+        for failure in failures:
+            print("  " + failure)
+        print("  shrunk to: " + repr(shrink(random_topology(seed, arguments.max_centres), fails)))
+    if len(failing) > 10:
+        print("... and %d more failing seeds" % (len(failing) - 10))
+    return 1 if len(failing) > 0 else 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
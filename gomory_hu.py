@@ -0,0 +1,265 @@
+"""
+This file builds a Gomory-Hu cut tree of the data centres, so the maximum throughput between every pair of data
+centres can be read from a tree instead of running one max-flow per pair.
+
+The tree is built with Gusfield's algorithm: V - 1 max-flow runs, all on the same BatchMaxThroughput network.
+The maximum throughput between two data centres is then the smallest weight on the path joining them in the tree.
+
+A cut tree only exists for symmetric capacities, where the minimum cut between s and t is also the minimum cut
+between t and s. It can also only describe cuts made of links: the limit of a data centre on the way cuts the flow
+without splitting the data centres in two groups. So:
+    - symmetric=True expects every link to have the same capacity in both directions (the capacities of parallel
+      links are added). The tree is built on the links only and upper_bound returns
+      min(maxOut[origin], maxIn[target], tree minimum). It is exactly maxThroughput(connections, maxIn, maxOut,
+      origin, [target]) when no data centre in between has a min(maxIn, maxOut) below it: a flow without cycles
+      passes at most its whole value through each data centre, so these limits cannot bind. max_throughput checks
+      this in O(1) with the three smallest limits, and otherwise solves the pair on a shared network, built once on
+      the first such query. The limits of the data centres cannot be put in the tree instead: the cuts through data
+      centres do not split them in two groups, and such cuts have no cut tree in general.
+    - symmetric=False is the fallback for directed graphs. The tree is built on the links made symmetric
+      (c(u, v) + c(v, u) in both directions), so it only gives an upper bound. max_throughput then runs an exact
+      solve on the shared network, without rebuilding it.
+
+"""
+from maximum_throughput import BatchMaxThroughput
+
+class GomoryHuTree:
+    """
+    This class is the Gomory-Hu cut tree of the data centres. The tree is stored with parent pointers rooted at data
+    centre 0: the edge between data centre i and parent[i] has the weight weight[i], the value of a minimum cut
+    between them.
+    """
+
+    def __init__(self, connections, maxIn, maxOut, symmetric=True, algorithm="dinic"):
+        """
+        This is the constructor for the GomoryHuTree class. It runs Gusfield's algorithm.
+
+        :Input:
+            connections, maxIn, maxOut: the same as maxThroughput
+            symmetric: True if every link has the same capacity in both directions, otherwise the tree is built on
+                the symmetric version of the links and only gives upper bounds
+            algorithm: the name of the engine used for each max-flow run, one of the keys of ALGORITHMS
+
+        :Return:
+            None
+
+        :Raise:
+            ValueError, if symmetric is True and the capacities of the links are not symmetric
+
+        :Time complexity:
+            O(V * (E + engine)), V - 1 max-flow runs on a network built once
+
+        :Aux space complexity:
+            O(V + E),where V is the number of vertex and E is the number of edges in graph
+        """
+        self.maxIn = list(maxIn)
+        self.maxOut = list(maxOut)
+        self.symmetric = symmetric
+        self.connections = connections
+        self.algorithm = algorithm
+        data_centre_count = len(maxIn)
+        # the three data centres with the smallest limit as a data centre in between, see _tree_is_exact
+        self._smallest = sorted(range(data_centre_count), key=lambda i: min(maxIn[i], maxOut[i]))[:3]
+
+        if symmetric:
+            capacity = {}
+            for u, v, c in connections:
+                capacity[(u, v)] = capacity.get((u, v), 0) + c
+            for (u, v), c in capacity.items():
+                if capacity.get((v, u), 0) != c:
+                    raise ValueError("the capacity from " + str(u) + " to " + str(v) + " is not the same in both directions, "
+                                     "use symmetric=False")
+            links = list(connections)
+            # built by _solve on the first query whose data centres in between may bind
+            self.batch = None
+        else:
+            links = list(connections) + [(v, u, c) for u, v, c in connections]
+            self.batch = BatchMaxThroughput(connections, maxIn, maxOut, algorithm)
+
+        # the data centre limits cannot be part of a cut tree, make them larger than any cut
+        unbounded = sum(c for _, _, c in links) + 1
+        links_only = BatchMaxThroughput(links, [unbounded] * data_centre_count, [unbounded] * data_centre_count, algorithm)
+
+        self.parent = [0] * data_centre_count
+        self.weight = [0] * data_centre_count
+        for s in range(1, data_centre_count):
+            t = self.parent[s]
+            flow = links_only.solve(s, [t])
+
+            # the vertex of ID i is the data centre i, the vertices of the extra vertices come after
+            side = links_only.residual_network.source_side(s)[:data_centre_count]
+            # the edge from t to the super target may be the one cut, t still belongs to the other side
+            side[t] = False
+
+            self.weight[s] = flow
+            for i in range(data_centre_count):
+                if i != s and side[i] and self.parent[i] == t:
+                    self.parent[i] = s
+            if side[self.parent[t]]:
+                self.parent[s] = self.parent[t]
+                self.parent[t] = s
+                self.weight[s] = self.weight[t]
+                self.weight[t] = flow
+
+        self.depth = [-1] * data_centre_count
+        for i in range(data_centre_count):
+            self._set_depth(i)
+
+    def _set_depth(self, data_centre):
+        """
+        Set the depth of a data centre in the tree, and of its ancestors which do not have one yet.
+
+        :Time complexity:
+            O(V) for the first call, O(V) in total over all the data centres
+        """
+        path = []
+        while self.depth[data_centre] == -1 and self.parent[data_centre] != data_centre:
+            path.append(data_centre)
+            data_centre = self.parent[data_centre]
+        if self.depth[data_centre] == -1:
+            # the root
+            self.depth[data_centre] = 0
+        depth = self.depth[data_centre]
+        for i in reversed(path):
+            depth += 1
+            self.depth[i] = depth
+
+    def min_cut(self, s, t):
+        """
+        This method returns the value of a minimum cut made of links between two data centres, the smallest weight
+        on the path joining them in the tree.
+
+        :Input:
+            s, t: the IDs of two different data centres
+
+        :Return:
+            The capacity of the minimum cut.
+
+        :Raise:
+            ValueError, if s and t are the same data centre
+
+        :Time complexity:
+            O(V), where V is the number of data centres
+
+        :Aux space complexity:
+            O(1)
+        """
+        if s == t:
+            raise ValueError("there is no cut between data centre " + str(s) + " and itself")
+        cut = None
+        while s != t:
+            if self.depth[s] < self.depth[t]:
+                s, t = t, s
+            if cut is None or self.weight[s] < cut:
+                cut = self.weight[s]
+            s = self.parent[s]
+        return cut
+
+    def upper_bound(self, origin, target):
+        """
+        This method returns an upper bound of the maximum throughput from origin to target read from the tree. It is
+        the exact value when symmetric is True and the data centres in between do not limit the flow.
+
+        :Time complexity:
+            O(V), where V is the number of data centres
+
+        :Aux space complexity:
+            O(1)
+        """
+        return min(self.maxOut[origin], self.maxIn[target], self.min_cut(origin, target))
+
+    def _tree_is_exact(self, origin, target, bound):
+        """
+        Return True if no data centre other than origin and target has a min(maxIn, maxOut) below bound, so the value
+        bound read from the tree is the maximum throughput (see the description of this file).
+
+        :Time complexity:
+            O(1)
+        """
+        for data_centre in self._smallest:
+            if data_centre != origin and data_centre != target:
+                return min(self.maxIn[data_centre], self.maxOut[data_centre]) >= bound
+        return True
+
+    def _solve(self, origin, target):
+        """
+        Solve one pair exactly on the network shared by all the queries, built on the first call.
+
+        :Time complexity:
+            O(V + E) for the first call, plus one max-flow run
+        """
+        if self.batch is None:
+            self.batch = BatchMaxThroughput(self.connections, self.maxIn, self.maxOut, self.algorithm)
+        return self.batch.solve(origin, [target])
+
+    def max_throughput(self, origin, target):
+        """
+        This method returns the maximum throughput from origin to target. With symmetric capacities it is read from
+        the tree unless a data centre in between may bind, otherwise it is solved on the shared network (see the
+        description of this file).
+
+        :Input:
+            origin: the integer ID origin of the data centre where the data to be backed up is located
+            target: the ID of the data centre where the data is stored
+
+        :Return:
+            An interger of the maximum possible data throughput from origin to target.
+
+        :Raise:
+            ValueError, if origin and target are the same data centre
+
+        :Time complexity:
+            O(V) when read from the tree, one max-flow run otherwise
+
+        :Aux space complexity:
+            O(1) when read from the tree, O(V + E) otherwise
+        """
+        if self.symmetric:
+            bound = self.upper_bound(origin, target)
+            if self._tree_is_exact(origin, target, bound):
+                return bound
+        return self._solve(origin, target)
+
+    def all_pairs(self):
+        """
+        This method returns the maximum throughput between every pair of data centres, as a list of lists where
+        all_pairs()[s][t] is max_throughput(s, t) and the diagonal is 0.
+
+        :Time complexity:
+            O(V^2) with symmetric capacities, by walking the tree from every data centre, plus one max-flow run for
+            every pair where a data centre in between may bind. V * (V - 1) max-flow runs otherwise
+
+        :Aux space complexity:
+            O(V^2), where V is the number of data centres
+        """
+        data_centre_count = len(self.parent)
+        if not self.symmetric:
+            return [[self.max_throughput(s, t) if s != t else 0 for t in range(data_centre_count)]
+                    for s in range(data_centre_count)]
+
+        # the tree as an adjacency list
+        neighbours = [[] for _ in range(data_centre_count)]
+        for i in range(data_centre_count):
+            if self.parent[i] != i:
+                neighbours[i].append((self.parent[i], self.weight[i]))
+                neighbours[self.parent[i]].append((i, self.weight[i]))
+
+        result = []
+        for s in range(data_centre_count):
+            # the smallest weight on the path from s to every data centre
+            cut = [None] * data_centre_count
+            cut[s] = 0
+            stack = [s]
+            while len(stack) > 0:
+                u = stack.pop()
+                for v, weight in neighbours[u]:
+                    if cut[v] is None:
+                        cut[v] = weight if u == s else min(cut[u], weight)
+                        stack.append(v)
+            row = [0] * data_centre_count
+            for t in range(data_centre_count):
+                if t != s:
+                    bound = min(self.maxOut[s], self.maxIn[t], cut[t])
+                    row[t] = bound if self._tree_is_exact(s, t, bound) else self._solve(s, t)
+            result.append(row)
+        return result
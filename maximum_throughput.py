@@ -1,3 +1,5 @@
+import time
+from array import array
 from collections import deque
 """
 This file consisits of one main method - maxThroughput 
@@ -13,6 +15,8 @@ class Vertex:
     """ 
     This is the Vertex class. It is used to represent a vertex in the graph. 
     """
+    __slots__ = ("id", "edges", "discovered", "visited", "parent", "incoming", "incoming_vertex")
+
     def __init__(self, id):
         """
         This is the constructor for the Vertex class. It takes in an integer to represent the id of the vertex.
@@ -111,6 +115,8 @@ class Edge:
     """ 
     This is the Edge class. It is used to represent a edge between the vertices in the graph.     
     """
+    __slots__ = ("u", "v", "capacity", "flow", "forward", "reverse")
+
     def __init__(self, u, v, capacity, forward = True):
         """
         This is the constructor for the Edge class. The edge ensure that the flow we have won't exceed the limit of the capacity of the edge.
@@ -445,7 +451,19 @@ class ResidualNetwork:
                         return True
 
         return False
-    
+
+    def bfs_edge_scans(self):
+        """
+        This method returns the number of edges scanned by the last has_AugmentingPath, the edges of every vertex 
+        it visited. It is used by SolverStats, so the breadth first search itself does not count anything.
+
+        :Time complexity: 
+            O(V),where V is the number of vertices in graph
+
+        :Aux space complexity:
+            O(1)
+        """
+        return sum(len(vertex.edges) for vertex in self.residual_network_vertices if vertex.visited)
  
     def get_AugmentingPath(self, origin):
         """
@@ -471,8 +489,8 @@ class ResidualNetwork:
         while vertex != self.residual_network_vertices[origin]:
             parent = vertex.parent
             for edge in parent.edges:
-                # to ensure the edge is connected 
-                if edge.v.id == vertex.id:
+                # to ensure the edge is connected, and not a saturated one of several parallel edges
+                if edge.v.id == vertex.id and edge.capacity > edge.flow:
                         max_flow_to_be_added_lst.append(edge.capacity - edge.flow)
                         self.path.append(edge)
                         break
@@ -513,96 +531,3075 @@ class ResidualNetwork:
 
     
 
-def maxThroughput(connections, maxIn, maxOut, origin, targets):
+class CompactResidualNetwork:
+    """ 
+    This class builds the same residual network as ResidualNetwork (same vertex IDs, the same extra vertex for each 
+    data centre and the same super target), but stores it in flat arrays instead of Vertex and Edge objects, so a 
+    graph with a million links fits in a few tens of megabytes.
+
+    The adjacency list is a forward star (head/next arrays): head[u] is the ID of the last edge added from u and
+    next[e] is the ID of the edge added from u before e, -1 ending the list. to[e] is the vertex the edge e goes to 
+    and cap[e] is its residual capacity. Each edge is stored right next to its reverse edge, so the reverse edge 
+    of e is e ^ 1 and augmenting e by x is cap[e] -= x and cap[e ^ 1] += x. The flow on an edge is the residual 
+    capacity of its reverse edge.
+
+    The edges are added in a fixed order: connection i of the input is edge 2 * i, the edge between data centre i 
+    and its extra vertex is edge 2 * (len(connections) + i), and the edges to the super target follow.
     """
-    Function description:
-        This function returns the maximum possible data throughput from the 
-        data centre origin to the data centres specified in targets.
 
-    Approach description:
-        This is inspired by the https://cs.stackexchange.com/questions/55041/residual-graph-in-maximum-flow
-        and https://en.wikipedia.org/wiki/Edmonds–Karp_algorithm 
+    def __init__(self, connections, maxIn, maxOut, origin, targets):
+        """
+        This is the constructor for the CompactResidualNetwork class. It takes the same input as ResidualNetwork, 
+        but it does not rewrite connections in place.
 
-        I will use Ford–Fulkerson method with Edmonds-Karp algorithm. This allows me to select shortest augmenting path
-        by using breadth-first-search. We will find augmenting paths with the fewest number of edges. This can also ensure that
-        the time complexity of my function will not exceed O(VE^2). 
+        :Input:
+            connections: a list of tuples (u, v, capacity), a directed communication channel from data centre u to 
+                data centre v with its maximum throughput
+            maxIn: a list of integers in which maxIn[i] specifies the maximum amount of incoming data that 
+                data centre i can process per second
+            maxOut: a list of integers in which maxOut[i] specifies the maximum amount of outgoing data that 
+                data centre i can process per second.
+            origin: the integer ID origin of the data centre where the data to be backed up is located
+            targets: a of data centres that are deemed appropriate locations for the backup data to be stored.
         
-        Besides that, I will have multiple of 2 of the vertices given. Each vertex will have another extra vertexto ensure that 
-        their incoming and outgoing flow is within the bound. The id of the extra vertex will always be original_vertex_id + (len(maxIn)+1).
-        For example, if the original vertex id is 0, then the extra vertex id will be 0 + (len(maxIn)+1), in this case is 6. 
-        This is to ensure that the flow conservation property is satisfied. 
+        :Return:
+            None
 
-        For the connections given, we have to update the incoming vertex.id as we did an extra vertex above, we need to link them back.
-        For instance, connection (0,1,3000) given, I will update this connnection to (6,1,3000) to make sure all the vertices
-        are connected. 
+        :Time complexity: 
+            O(V + E),where V is the number of vertex and E is the number of edges in graph
 
-        After setting up the graph, we will run ford-fulkerson method to obtain the maximum possible data throughput from the 
-        data centre origin to the data centres specified in targets.
+        :Aux space complexity:
+            O(V + E),where V is the number of vertex and E is the number of edges in graph
+        """
+        self._start(len(maxIn), targets)
 
-    :Input:
-        connections: A list of integers representing the vertices that are passengers
-        maxIn: a list of integers in which maxIn[i] specifies the maximum amount of incoming data that data centre i can process per second
-        maxOut: a list of integers in which maxOut[i] specifies the maximum amount of outgoing data that data centre i can process per second.
-        origin: the integer ID origin of the data centre where the data to be backed up is located
-        targets: a of data centres that are deemed appropriate locations for the backup data to be stored.
+        # the connections leave from the extra vertex of their data centre
+        offset = self.data_centre_count + 1
+        for connection in connections:
+            self.add_edge(connection[0] + offset, connection[1], connection[2])
 
-    :Return:
-        An interger of the maximum possible data throughput from the 
-            data centre origin to the data centres specified in targets.
+        self._add_data_centre_edges(maxIn, maxOut, origin, targets)
+        self._finish()
 
-    :Time complexity: 
-        Best = Worst: O(VE^2), where V is the number of vertex and E is the number of edges
+    @classmethod
+    def from_connection_chunks(cls, chunks, maxIn, maxOut, origin, targets):
+        """
+        This method is used to build the residual network from connections streamed in chunks, so a topology 
+        larger than memory as a list of tuples can be loaded straight into the arrays. Each chunk is a flat 
+        sequence of integers u0, v0, capacity0, u1, v1, capacity1, ..., such as an array('q') or a memoryview cast 
+        to 'q' over a memory-mapped file. The chunks are only read, and none of them is kept.
 
-    :Aux space complexity: 
-        O(V), where V is the number of element in graph
-    """
-    # # initialise the residual network
-    residual_network = ResidualNetwork(connections, maxIn, maxOut, origin, targets)
-    return ford_fulkerson(residual_network, origin)
+        :Input:
+            chunks: an iterable of flat sequences of integers, three per connection
+            maxIn, maxOut, origin, targets: the same as the constructor
 
-def ford_fulkerson(residual_network, origin):
-    """
-    Function description:
-        This function returns the maximum flow that can be augmented on the residual network
+        :Return:
+            A residual network of this class, the same as the one built from the list of all the connections
 
-    Approach description:
-        This is inspired by the https://cs.stackexchange.com/questions/55041/residual-graph-in-maximum-flow
-        and https://en.wikipedia.org/wiki/Edmonds–Karp_algorithm 
+        :Time complexity: 
+            O(V + E),where V is the number of vertex and E is the number of edges in graph
 
-        I will use Ford–Fulkerson method with Edmonds-Karp algorithm. This allows me to select shortest augmenting path
-        by using breadth-first-search. We will find augmenting paths with the fewest number of edges. This can also ensure that
-        the time complexity of my function will not exceed O(VE^2). 
+        :Aux space complexity:
+            O(V + E + C), where C is the size of the largest chunk
+        """
+        network = cls.__new__(cls)
+        network._start(len(maxIn), targets)
+        for chunk in chunks:
+            network.add_connections(chunk)
+        network._add_data_centre_edges(maxIn, maxOut, origin, targets)
+        network._finish()
+        return network
+
+    def _start(self, data_centre_count, targets):
+        """
+        Set up an empty residual network, with the vertices of data_centre_count data centres and no edge.
 
-    :Input:
-        residual_network: A residualNetwork object 
-        origin: the integer ID origin of the data centre where the data to be backed up is located
+        :Time complexity: 
+            O(V),where V is the number of vertex in graph
+        """
+        self.targets = targets
+        self.path = []
+        self.data_centre_count = data_centre_count
 
-    :Return:
-        flow: An interger of the maximum possible data throughput from the 
-            data centre origin to the data centres specified in targets.
+        # keep one for super target 
+        self.vertex_count = (self.data_centre_count + 1) * 2
+        self.super_target = self.vertex_count - 1
 
-    :Time complexity: 
-        Best = Worst: O(VE^2), where V is the number of vertex and E is the number of edges. Based on the lecture slides given, 
-        we know that the time complexity of Edmonds-Karp algorithm is always O(VE^2).
+        self.head = array('q', [-1]) * self.vertex_count
+        self.next = array('q')
+        self.to = array('q')
+        self.cap = array('q')
+        self.incoming = [0] * self.vertex_count
 
-    :Aux space complexity: 
-        O(1)
-    """
-    flow = 0
-    
-    # find an augmenting path
-    while residual_network.has_AugmentingPath(origin):
+    def add_connections(self, chunk):
+        """
+        This method is used to add the connections of a chunk, after the connections already added and before the 
+        edges of the data centres.
 
-        # obtain the path
-        path = residual_network.get_AugmentingPath(origin) 
+        :Input:
+            chunk: a flat sequence of integers u0, v0, capacity0, u1, v1, capacity1, ..., three per connection
 
-        #augment the flow equal to the residual capacity
-        flow += residual_network.max_flow_to_be_added_in_the_path
+        :Return:
+            None
 
-        # update the residual network
-        residual_network.augmentFlow(path) 
+        :Time complexity: 
+            O(C), where C is the number of connections in the chunk
 
-    return flow 
+        :Aux space complexity:
+            O(C) amortised, where C is the number of connections in the chunk
+        """
+        head, next_edge, to, cap, incoming = self.head, self.next, self.to, self.cap, self.incoming
+        offset = self.data_centre_count + 1
+        edge = len(to)
+        for i in range(0, len(chunk), 3):
+            u = chunk[i] + offset
+            v = chunk[i + 1]
+            capacity = chunk[i + 2]
+            to.append(v)
+            cap.append(capacity)
+            next_edge.append(head[u])
+            head[u] = edge
+            to.append(u)
+            cap.append(0)
+            next_edge.append(head[v])
+            head[v] = edge + 1
+            incoming[v] += capacity
+            edge += 2
+
+    def _add_data_centre_edges(self, maxIn, maxOut, origin, targets):
+        """
+        Add the edge between each data centre and its extra vertex and the edges to the super target, once every 
+        connection has been added.
+
+        :Time complexity: 
+            O(V),where V is the number of vertex in graph
+        """
+        self.connection_count = len(self.to) // 2
+        offset = self.data_centre_count + 1
+
+        # compare maxIn and maxOut pick the minimum, and link each vertex to its extra vertex
+        self.max_min_flow = []
+        target_set = set(targets)
+        for i in range(self.data_centre_count):
+            flow = split_capacity(i, maxIn, maxOut, origin, target_set)
+            self.max_min_flow.append(flow)
+            self.add_edge(i, i + offset, flow)
+
+        # always make a super node as destination, taking the incoming capacity of each target
+        for target_id in targets:
+            self.add_edge(target_id + offset, self.super_target, self.incoming[target_id])
+
+    def _finish(self):
+        """
+        Set up the state of the breadth first search once every edge has been added.
+
+        :Time complexity: 
+            O(V),where V is the number of vertex in graph
+        """
+        self.parent_edge = array('q', [-1]) * self.vertex_count
+        self.bfs_queue = []
+        self.bfs_expanded = 0
+        self._out_degree = None
+
+    @classmethod
+    def from_arrays(cls, head, next_edge, to, cap, data_centre_count, connection_count):
+        """
+        This method is used to wrap arrays that already hold a residual network (for example arrays in shared or 
+        memory-mapped memory) without copying them. The arrays can be any sequence of integers supporting indexing, 
+        such as array('q') or a memoryview cast to 'q', and cap must be writable to be solved.
+
+        :Input:
+            head, next_edge, to, cap: the head, next, to and cap arrays of the residual network, laid out as in the constructor
+            data_centre_count: the number of data centres, len(maxIn)
+            connection_count: the number of connections
+
+        :Return:
+            A CompactResidualNetwork object
+
+        :Time complexity: 
+            O(V),where V is the number of vertex in graph
+
+        :Aux space complexity:
+            O(V),where V is the number of vertex in graph
+        """
+        network = cls.__new__(cls)
+        network.targets = []
+        network.path = []
+        network.data_centre_count = data_centre_count
+        network.connection_count = connection_count
+        network.vertex_count = len(head)
+        network.super_target = network.vertex_count - 1
+        network.head = head
+        network.next = next_edge
+        network.to = to
+        network.cap = cap
+        network.incoming = None
+        network.max_min_flow = None
+        network.parent_edge = array('q', [-1]) * network.vertex_count
+        network.bfs_queue = []
+        network.bfs_expanded = 0
+        network._out_degree = None
+        return network
+
+    def add_edge(self, u, v, capacity):
+        """
+        This method is used to add an edge from u to v and its reverse edge to the residual network.
+
+        :Input:
+            u: the ID of the starting vertex of the edge
+            v: the ID of the ending vertex of the edge
+            capacity: An integer to represent the capacity of the edge
+
+        :Return:
+            The ID of the new edge, its reverse edge is the ID + 1
+
+        :Time complexity: 
+            O(1) amortised
+
+        :Aux space complexity:
+            O(1) amortised
+        """
+        edge = len(self.to)
+
+        self.to.append(v)
+        self.cap.append(capacity)
+        self.next.append(self.head[u])
+        self.head[u] = edge
+
+        self.to.append(u)
+        self.cap.append(0)
+        self.next.append(self.head[v])
+        self.head[v] = edge + 1
+
+        self.incoming[v] += capacity
+        return edge
+
+    def __str__(self):
+        """
+        This method is used to print the graph, one line per edge with its flow and capacity.
+
+        :Time complexity: 
+            O(E),where E is the number of edges in graph
+
+        :Aux space complexity:
+            O(E),where E is the number of edges in graph
+        """
+        lines = []
+        for edge in range(0, len(self.to), 2):
+            lines.append(str(self.to[edge + 1]) + ", " + str(self.to[edge]) + ", flow: " + str(self.cap[edge + 1]) 
+                         + ", capacity: " + str(self.cap[edge] + self.cap[edge + 1]))
+        return "\n".join(lines) + "\n"
+
+    def has_AugmentingPath(self, origin, delta=1):
+        """
+        This method is used to check if there's a path to augment, with breadth first search from the origin. 
+        The edge used to discover each vertex is kept in parent_edge for get_AugmentingPath.
+
+        :Input:
+            origin: the integer ID origin of the data centre where the data to be backed up is located
+            delta: the smallest residual capacity of an edge the path may use, 1 for any edge not saturated
+        
+        :Return:
+            True, if there is a path to augment. Otherwise, False.
+
+        :Time complexity: 
+            O(V + E),where V is the number of vertex and E is the number of edges in graph
+
+        :Aux space complexity:
+            O(V), where V is the number of vertex in graph
+        """
+        head, next_edge, to, cap = self.head, self.next, self.to, self.cap
+        parent_edge = self.parent_edge
+        for i in range(self.vertex_count):
+            parent_edge[i] = -1
+        # the origin points to itself so it is never discovered again
+        parent_edge[origin] = origin
+
+        # the queue is kept whole, so bfs_edge_scans can tell which vertices were expanded
+        discovered = [origin]
+        expanded = 0
+        self.bfs_queue = discovered
+        while expanded < len(discovered):
+            u = discovered[expanded]
+            expanded += 1
+            edge = head[u]
+            while edge != -1:
+                v = to[edge]
+                if parent_edge[v] == -1 and cap[edge] >= delta:
+                    parent_edge[v] = edge
+                    #reach the target
+                    if v == self.super_target:
+                        self.bfs_expanded = expanded
+                        return True
+                    discovered.append(v)
+                edge = next_edge[edge]
+
+        self.bfs_expanded = expanded
+        return False
+
+    def bfs_edge_scans(self):
+        """
+        This method returns the number of edges scanned by the last has_AugmentingPath, the edges of every vertex 
+        it expanded. It is used by SolverStats, so the breadth first search itself does not count anything.
+
+        :Time complexity: 
+            O(V),where V is the number of vertex in graph
+
+        :Aux space complexity:
+            O(1)
+        """
+        degree = self.out_degree()
+        return sum(degree[u] for u in self.bfs_queue[:self.bfs_expanded])
+
+    def out_degree(self):
+        """
+        This method returns the number of edges leaving each vertex, reverse edges included. It is computed on the 
+        first call and kept until an edge is added.
+
+        :Return:
+            A list of the out degree of each vertex.
+
+        :Time complexity: 
+            O(E) for the first call, O(1) after
+
+        :Aux space complexity:
+            O(V), where V is the number of vertex in graph
+        """
+        if self._out_degree is None or self._out_degree[0] != len(self.to):
+            degree = [0] * self.vertex_count
+            for u in self.to:
+                # every edge comes with its reverse edge, so counting the vertices edges go to counts the vertices they leave
+                degree[u] += 1
+            self._out_degree = (len(self.to), degree)
+        return self._out_degree[1]
+
+    def get_AugmentingPath(self, origin):
+        """
+        This method is get the path I am going to augment the flow, by following parent_edge back from the super target.
+
+        :Input:
+            origin: the integer ID origin of the data centre where the data to be backed up is located
+        
+        :Return:
+            The list of the edge IDs of the path which will be augment. 
+
+        :Time complexity: 
+            O(V),where V is the number of vertex in graph
+
+        :Aux space complexity:
+            O(V),where V is the number of vertex in graph
+        """
+        self.path = []
+        vertex = self.super_target
+        while vertex != origin:
+            edge = self.parent_edge[vertex]
+            self.path.append(edge)
+            vertex = self.to[edge ^ 1]
+        self.path.reverse()
+
+        if len(self.path) > 0:
+            self.max_flow_to_be_added_in_the_path = min(self.cap[edge] for edge in self.path)
+        else:
+            self.max_flow_to_be_added_in_the_path = 0
+        return self.path
+
+    def source_side(self, origin):
+        """
+        This method returns the vertices which can be reached from the origin in the residual network. Once the flow 
+        is maximum they are the source side of a minimum cut, every edge leaving them being saturated.
+
+        :Input:
+            origin: the integer ID origin of the data centre where the data to be backed up is located
+        
+        :Return:
+            A list of booleans, True for each vertex reachable from the origin.
+
+        :Time complexity: 
+            O(V + E),where V is the number of vertex and E is the number of edges in graph
+
+        :Aux space complexity:
+            O(V), where V is the number of vertex in graph
+        """
+        head, next_edge, to, cap = self.head, self.next, self.to, self.cap
+        reached = [False] * self.vertex_count
+        reached[origin] = True
+        discovered = deque()
+        discovered.append(origin)
+        while len(discovered) > 0:
+            u = discovered.popleft()
+            edge = head[u]
+            while edge != -1:
+                v = to[edge]
+                if not reached[v] and cap[edge] > 0:
+                    reached[v] = True
+                    discovered.append(v)
+                edge = next_edge[edge]
+        return reached
+
+    def sink_side(self):
+        """
+        This method returns the vertices which can still reach the super target in the residual network, with a 
+        backward breadth first search from the super target. An edge into the super target takes the incoming 
+        capacity of its target, so it is never a tighter limit than the links into the target: it is always 
+        followed, even when saturated (the incoming capacity grows with the links into the target).
+
+        :Return:
+            A list of booleans, True for each vertex which can reach the super target.
+
+        :Time complexity: 
+            O(V + E),where V is the number of vertex and E is the number of edges in graph
+
+        :Aux space complexity:
+            O(V), where V is the number of vertex in graph
+        """
+        head, next_edge, to, cap = self.head, self.next, self.to, self.cap
+        reached = [False] * self.vertex_count
+        reached[self.super_target] = True
+        discovered = deque()
+        discovered.append(self.super_target)
+        while len(discovered) > 0:
+            v = discovered.popleft()
+            edge = head[v]
+            while edge != -1:
+                # the reverse edge goes from to[edge] to v
+                u = to[edge]
+                if not reached[u] and (cap[edge ^ 1] > 0 or v == self.super_target):
+                    reached[u] = True
+                    discovered.append(u)
+                edge = next_edge[edge]
+        return reached
+
+    def connection_flows(self):
+        """
+        This method returns the flow on each connection, the flow on edge 2 * i being the residual capacity of its 
+        reverse edge.
+
+        :Return:
+            A list where the i-th element is the flow on the i-th connection of the input.
+
+        :Time complexity: 
+            O(E),where E is the number of edges in graph
+
+        :Aux space complexity:
+            O(E),where E is the number of edges in graph
+        """
+        return self.cap[1:2 * self.connection_count:2].tolist()
+
+    def decompose_flow(self, origin):
+        """
+        This method splits the flow into paths from the origin to the super target, each with the rate it carries. 
+        The paths are followed along the edges which still carry flow, and a flow cycle met on the way (flow going 
+        round without reaching a target) is cancelled, as it does not add to the throughput. The flow stored in 
+        the network is left unchanged.
+
+        :Input:
+            origin: the integer ID origin of the data centre where the data to be backed up is located
+        
+        :Return:
+            A list of tuples (rate, edges), where edges is the list of the forward edge IDs of the path.
+
+        :Time complexity: 
+            O(E * P), where E is the number of edges in graph and P the number of paths
+
+        :Aux space complexity:
+            O(E),where E is the number of edges in graph
+        """
+        head, next_edge, to = self.head, self.next, self.to
+        # the flow left to decompose on forward edge e is remaining[e >> 1]
+        remaining = self.cap[1::2].tolist()
+        current = list(head)
+        paths = []
+
+        while True:
+            path = []
+            # the index in path of the edge leaving each vertex of the path
+            on_path = {origin: 0}
+            u = origin
+            while u != self.super_target:
+                edge = current[u]
+                while edge != -1 and (edge & 1 or remaining[edge >> 1] == 0):
+                    edge = next_edge[edge]
+                current[u] = edge
+                if edge == -1:
+                    break
+
+                v = to[edge]
+                if v in on_path:
+                    # cancel the flow cycle and go on from v
+                    start = on_path[v]
+                    cycle = path[start:] + [edge]
+                    amount = min(remaining[e >> 1] for e in cycle)
+                    for e in cycle:
+                        remaining[e >> 1] -= amount
+                    for e in path[start:]:
+                        del on_path[to[e]]
+                    del path[start:]
+                    u = v
+                    continue
+
+                path.append(edge)
+                on_path[v] = len(path)
+                u = v
+
+            if u != self.super_target:
+                return paths
+
+            amount = min(remaining[e >> 1] for e in path)
+            for e in path:
+                remaining[e >> 1] -= amount
+            paths.append((amount, path))
+
+    def augmentFlow(self, path):
+        """
+        This method is augment the path we found. 
+
+        :Input:
+            path: a list of edge IDs which is the path we can augment 
+        
+        :Return:
+            None 
+
+        :Time complexity: 
+            O(V),where V is the number of vertex in graph
+
+        :Aux space complexity:
+            O(1)
+        """
+        amount = self.max_flow_to_be_added_in_the_path
+        cap = self.cap
+        for edge in path:
+            cap[edge] -= amount
+            cap[edge ^ 1] += amount
+
+def split_capacity(data_centre, maxIn, maxOut, origin, targets):
+    """
+    Function description:
+        This function returns the capacity of the edge between a data centre and its extra vertex: maxOut for the 
+        origin, maxIn for a target and the minimum of both for any other data centre, as in the constructor of 
+        ResidualNetwork.
+
+    :Input:
+        data_centre: the ID of the data centre
+        maxIn, maxOut, origin: the same as maxThroughput
+        targets: the targets of the query, a set or a list
+
+    :Return:
+        The capacity of the edge, an integer
+
+    :Time complexity: 
+        O(1) when targets is a set, O(T) for a list of T targets
+
+    :Aux space complexity:
+        O(1)
+    """
+    if data_centre == origin:
+        return maxOut[data_centre]
+    elif data_centre in targets:
+        return maxIn[data_centre]
+    return min(maxIn[data_centre], maxOut[data_centre])
+
+class NumpyResidualNetwork(CompactResidualNetwork):
+    """ 
+    This class is a CompactResidualNetwork whose breadth first search runs on NumPy. Instead of serving the vertices 
+    from a queue one by one, it expands a whole frontier (all the vertices at the same distance from the origin) 
+    at once: the edges of the frontier are gathered from a compressed sparse row index of the edges, masked by 
+    their residual capacity and by whether their ending vertex is already discovered, and the parent edge of every 
+    newly discovered vertex is assigned in one vectorised step.
+
+    The residual capacities stay in the cap array of CompactResidualNetwork, NumPy reads them through a view of the 
+    same buffer, so every engine working on the arrays can still be used on this network.
+
+    NumPy is imported when the first NumpyResidualNetwork is created, it is not needed for the other backends.
+    """
+
+    def __init__(self, connections, maxIn, maxOut, origin, targets):
+        """
+        This is the constructor for the NumpyResidualNetwork class. It builds the CompactResidualNetwork and then 
+        sorts the edges by their starting vertex to build the compressed sparse row index.
+
+        :Input:
+            The same as CompactResidualNetwork.
+        
+        :Return:
+            None
+
+        :Time complexity: 
+            O(V + E log E),where V is the number of vertex and E is the number of edges in graph
+
+        :Aux space complexity:
+            O(V + E),where V is the number of vertex and E is the number of edges in graph
+        """
+        # fail before building anything when NumPy is missing
+        import_numpy()
+        CompactResidualNetwork.__init__(self, connections, maxIn, maxOut, origin, targets)
+
+    def add_connections(self, chunk):
+        """
+        This method is used to add the connections of a chunk like CompactResidualNetwork.add_connections, but 
+        with NumPy over the whole chunk. The edges leaving the same vertex are chained in the same order as one by 
+        one, by sorting the starting vertices of the chunk.
+
+        :Time complexity: 
+            O(C log C), where C is the number of connections in the chunk, in O(1) NumPy calls plus one Python step 
+            per data centre receiving a connection
+
+        :Aux space complexity:
+            O(C), where C is the number of connections in the chunk
+        """
+        numpy = import_numpy()
+        records = numpy.asarray(chunk, dtype=numpy.int64).reshape(-1, 3)
+        if len(records) == 0:
+            return
+        first = len(self.to)
+        offset = self.data_centre_count + 1
+
+        tails = numpy.empty(2 * len(records), dtype=numpy.int64)
+        tails[0::2] = records[:, 0] + offset
+        tails[1::2] = records[:, 1]
+        to = numpy.empty_like(tails)
+        to[0::2] = records[:, 1]
+        to[1::2] = tails[0::2]
+        cap = numpy.zeros_like(tails)
+        cap[0::2] = records[:, 2]
+
+        # next of an edge is the edge added before it from the same vertex: the previous one in the chunk, or the 
+        # head of the vertex before the chunk for the first one
+        head = numpy.frombuffer(self.head, dtype=numpy.int64)
+        order = numpy.argsort(tails, kind="stable")
+        sorted_tails = tails[order]
+        same = sorted_tails[1:] == sorted_tails[:-1]
+        next_edge = numpy.empty_like(tails)
+        next_edge[order[0]] = head[sorted_tails[0]]
+        next_edge[order[1:]] = numpy.where(same, order[:-1] + first, head[sorted_tails[1:]])
+        last = numpy.append(~same, True)
+        head[sorted_tails[last]] = order[last] + first
+        del head
+
+        self.to.frombytes(to.tobytes())
+        self.cap.frombytes(cap.tobytes())
+        self.next.frombytes(next_edge.tobytes())
+
+        vertices, inverse = numpy.unique(records[:, 1], return_inverse=True)
+        totals = numpy.zeros(len(vertices), dtype=numpy.int64)
+        numpy.add.at(totals, inverse, records[:, 2])
+        incoming = self.incoming
+        for v, total in zip(vertices.tolist(), totals.tolist()):
+            incoming[v] += total
+
+    def _finish(self):
+        """
+        Build the compressed sparse row index once every edge has been added, by sorting the edges by their 
+        starting vertex.
+
+        :Time complexity: 
+            O(V + E log E),where V is the number of vertex and E is the number of edges in graph
+        """
+        CompactResidualNetwork._finish(self)
+        numpy = import_numpy()
+        self.numpy = numpy
+
+        to = numpy.frombuffer(self.to, dtype=numpy.int64)
+        tails = to[numpy.arange(len(to)) ^ 1]
+
+        # csr_edges[csr_offsets[u]:csr_offsets[u + 1]] are the edges leaving u and csr_to the vertex each one goes to
+        self.csr_edges = numpy.argsort(tails, kind="stable")
+        self.csr_to = to[self.csr_edges]
+        self.csr_offsets = numpy.zeros(self.vertex_count + 1, dtype=numpy.int64)
+        numpy.cumsum(numpy.bincount(tails, minlength=self.vertex_count), out=self.csr_offsets[1:])
+
+        self.residual = numpy.frombuffer(self.cap, dtype=numpy.int64)
+        self.parent_edge = numpy.full(self.vertex_count, -1, dtype=numpy.int64)
+        self.bfs_scans = 0
+
+    def has_AugmentingPath(self, origin, delta=1):
+        """
+        This method is used to check if there's a path to augment, with a frontier by frontier breadth first search 
+        from the origin. The edge used to discover each vertex is kept in parent_edge for get_AugmentingPath.
+
+        :Input:
+            origin: the integer ID origin of the data centre where the data to be backed up is located
+            delta: the smallest residual capacity of an edge the path may use, 1 for any edge not saturated
+        
+        :Return:
+            True, if there is a path to augment. Otherwise, False.
+
+        :Time complexity: 
+            O(V + E log E),where V is the number of vertex and E is the number of edges in graph, in O(V) NumPy calls
+
+        :Aux space complexity:
+            O(E), where E is the number of edges in graph
+        """
+        numpy = self.numpy
+        parent_edge = self.parent_edge
+        parent_edge.fill(-1)
+        # the origin points to itself so it is never discovered again
+        parent_edge[origin] = origin
+
+        self.bfs_scans = 0
+        frontier = numpy.array([origin], dtype=numpy.int64)
+        while len(frontier) > 0:
+            # gather the position of every edge leaving the frontier in the compressed sparse row index
+            starts = self.csr_offsets[frontier]
+            counts = self.csr_offsets[frontier + 1] - starts
+            total = int(counts.sum())
+            self.bfs_scans += total
+            if total == 0:
+                return False
+            ends = numpy.cumsum(counts)
+            positions = numpy.repeat(starts - (ends - counts), counts) + numpy.arange(total)
+
+            edges = self.csr_edges[positions]
+            vertices = self.csr_to[positions]
+            keep = (self.residual[edges] >= delta) & (parent_edge[vertices] == -1)
+            if not keep.any():
+                return False
+
+            # a vertex reached by several edges takes the first one as its parent
+            frontier, first = numpy.unique(vertices[keep], return_index=True)
+            parent_edge[frontier] = edges[keep][first]
+
+            #reach the target
+            if parent_edge[self.super_target] != -1:
+                return True
+
+        return False
+
+    def bfs_edge_scans(self):
+        """
+        This method returns the number of edges gathered by the last has_AugmentingPath.
+
+        :Time complexity: 
+            O(1)
+        """
+        return self.bfs_scans
+
+def import_numpy():
+    """
+    Function description:
+        This function imports NumPy for the backends which need it, so the rest of the package can be imported 
+        without it.
+
+    :Return:
+        The numpy module
+
+    :Raise:
+        ImportError, if NumPy is not installed
+
+    :Time complexity:
+        O(1)
+    """
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("the numpy backend needs NumPy, install it with: pip install numpy") from None
+    return numpy
+
+BACKENDS = {
+    "python": CompactResidualNetwork,
+    "numpy": NumpyResidualNetwork,
+}
+
+def maxThroughput(connections, maxIn, maxOut, origin, targets, algorithm="ford_fulkerson", backend="python", stats=None, 
+                  warm_start=None):
+    """
+    Function description:
+        This function returns the maximum possible data throughput from the 
+        data centre origin to the data centres specified in targets.
+
+    Approach description:
+        This is inspired by the https://cs.stackexchange.com/questions/55041/residual-graph-in-maximum-flow
+        and https://en.wikipedia.org/wiki/Edmonds–Karp_algorithm 
+
+        I will use Ford–Fulkerson method with Edmonds-Karp algorithm. This allows me to select shortest augmenting path
+        by using breadth-first-search. We will find augmenting paths with the fewest number of edges. This can also ensure that
+        the time complexity of my function will not exceed O(VE^2). 
+        
+        Besides that, I will have multiple of 2 of the vertices given. Each vertex will have another extra vertexto ensure that 
+        their incoming and outgoing flow is within the bound. The id of the extra vertex will always be original_vertex_id + (len(maxIn)+1).
+        For example, if the original vertex id is 0, then the extra vertex id will be 0 + (len(maxIn)+1), in this case is 6. 
+        This is to ensure that the flow conservation property is satisfied. 
+
+        For the connections given, we have to update the incoming vertex.id as we did an extra vertex above, we need to link them back.
+        For instance, connection (0,1,3000) given, I will add it as an edge from 6 to 1 with capacity 3000 to make sure all the vertices
+        are connected. 
+
+        The graph is stored in a CompactResidualNetwork, flat arrays of a few machine words per edge, and connections is 
+        left unchanged. After setting up the graph, we will run ford-fulkerson method to obtain the maximum possible data throughput from the 
+        data centre origin to the data centres specified in targets.
+
+    :Input:
+        connections: A list of integers representing the vertices that are passengers
+        maxIn: a list of integers in which maxIn[i] specifies the maximum amount of incoming data that data centre i can process per second
+        maxOut: a list of integers in which maxOut[i] specifies the maximum amount of outgoing data that data centre i can process per second.
+        origin: the integer ID origin of the data centre where the data to be backed up is located
+        targets: a of data centres that are deemed appropriate locations for the backup data to be stored.
+        algorithm: the name of the max-flow engine to run on the residual network, one of the keys of ALGORITHMS.
+            "ford_fulkerson" (Edmonds-Karp) is the default, "push_relabel" and "dinic" are faster on large topologies,
+            "capacity_scaling" needs fewer augmenting paths when the capacities range over many orders of magnitude.
+        backend: the name of the residual network class, one of the keys of BACKENDS. "python" is the default, 
+            "numpy" runs the breadth first search of ford_fulkerson on whole frontiers with NumPy.
+        stats: None, or a SolverStats object to collect the counters and the timers of the solve, construction of 
+            the residual network included. It is left out of the solve when None.
+        warm_start: None, or the flows of a previous solve to start from instead of zero flow (see apply_warm_start): 
+            a list of the flow on each connection, such as RoutingPlan.connection_flows, or a dictionary 
+            {(u, v): flow} when the connections changed since.
+
+    :Return:
+        An interger of the maximum possible data throughput from the 
+            data centre origin to the data centres specified in targets.
+
+    :Raise:
+        ValueError, if the algorithm or the backend is unknown, or if warm_start is a list of another length than 
+        connections
+
+    :Time complexity: 
+        Best = Worst: O(VE^2), where V is the number of vertex and E is the number of edges
+
+    :Aux space complexity: 
+        O(V + E), where V is the number of vertex and E is the number of edges
+    """
+    check_algorithm(algorithm)
+    check_backend(backend)
+
+    if stats is None and warm_start is None:
+        # # initialise the residual network
+        residual_network = BACKENDS[backend](connections, maxIn, maxOut, origin, targets)
+        return ALGORITHMS[algorithm](residual_network, origin)
+
+    start = time.perf_counter()
+    residual_network = BACKENDS[backend](connections, maxIn, maxOut, origin, targets)
+    if stats is not None:
+        stats.add_time("construction", time.perf_counter() - start)
+    return _solve_from(residual_network, connections, origin, algorithm, stats, warm_start)
+
+def _solve_from(residual_network, connections, origin, algorithm, stats, warm_start):
+    """
+    Run an engine on a residual network, after pushing the flow of warm_start (see maxThroughput) if it is given.
+
+    :Return:
+        The flow pushed by the warm start and the engine together.
+
+    :Time complexity:
+        O(V + E) for the warm start, plus the time complexity of the engine
+    """
+    flow = 0
+    if warm_start is not None:
+        start = time.perf_counter()
+        flow = apply_warm_start(residual_network, origin, _connection_hints(connections, warm_start))
+        if stats is not None:
+            stats.add_time("warm_start", time.perf_counter() - start)
+    if stats is None:
+        return flow + ALGORITHMS[algorithm](residual_network, origin)
+    return flow + ALGORITHMS[algorithm](residual_network, origin, stats)
+
+def _connection_hints(connections, warm_start):
+    """
+    Return the previous flow on each connection from warm_start: a list in the order of the connections, or a 
+    dictionary {(u, v): flow} whose flow is given to the connections from u to v in turn, up to their capacity.
+
+    :Raise:
+        ValueError, if warm_start is a list of another length than connections
+
+    :Time complexity: 
+        O(E), where E is the number of connections
+
+    :Aux space complexity:
+        O(E), where E is the number of connections
+    """
+    if not isinstance(warm_start, dict):
+        if len(warm_start) != len(connections):
+            raise ValueError("warm_start has " + str(len(warm_start)) + " flows for " + str(len(connections)) 
+                             + " connections")
+        return warm_start
+
+    left = dict(warm_start)
+    hints = []
+    for connection in connections:
+        u, v, capacity = connection[0], connection[1], connection[2]
+        amount = min(left.get((u, v), 0), capacity)
+        if amount > 0:
+            left[(u, v)] -= amount
+        hints.append(amount)
+    return hints
+
+# the number of vertices the warm start searches around an excess for a deficit to send it to
+_WARM_START_SEARCH = 256
+
+def _nearest_deficit(network, source, excess, limit):
+    """
+    Find the shortest path in the residual network from source to a vertex with a deficit or to the super target, 
+    with a breadth first search that gives up after limit vertices.
+
+    :Return:
+        The list of the edges of the path, or None if none was found in time.
+
+    :Time complexity: 
+        O(limit * D), where D is the largest number of edges of a vertex
+
+    :Aux space complexity:
+        O(limit)
+    """
+    head, next_edge, to, cap = network.head, network.next, network.to, network.cap
+    sink = network.super_target
+    parent_edge = {source: -1}
+    queue = deque([source])
+    while len(queue) > 0 and len(parent_edge) < limit:
+        u = queue.popleft()
+        edge = head[u]
+        while edge != -1:
+            v = to[edge]
+            if cap[edge] > 0 and v not in parent_edge:
+                parent_edge[v] = edge
+                if v == sink or excess[v] < 0:
+                    path = []
+                    while v != source:
+                        path.append(parent_edge[v])
+                        v = to[parent_edge[v] ^ 1]
+                    path.reverse()
+                    return path
+                queue.append(v)
+            edge = next_edge[edge]
+    return None
+
+def apply_warm_start(network, origin, hints):
+    """
+    Function description:
+        This function sets the flow of a previous solve on a residual network of maxThroughput without flow, as a 
+        starting point for an engine, and repairs it where it does not fit anymore.
+
+    Approach description:
+        The flow on each connection is its hint, cut down to the capacity of the connection. The data centre limits 
+        then let through as much as arrives, up to their capacity, and each target sends what it has left to the super 
+        target, up to the capacity of the edge. Where the topology changed, a vertex can be left receiving more than it 
+        sends (excess) or sending more than it receives (deficit). Each excess is first rerouted along a residual path 
+        to a deficit nearby or to the super target, found by a breadth first search limited to _WARM_START_SEARCH 
+        vertices. What is left is cancelled: an excess back along the edges bringing flow to its vertex (or to the 
+        super target when the vertex has an edge to it), a deficit forward along the edges taking flow from its vertex, 
+        until they reach the origin or the super target. This only touches the vertices around the changes, and leaves 
+        a valid flow which the engine augments from.
+
+    :Input:
+        network: A CompactResidualNetwork object without flow, built by maxThroughput
+        origin: the integer ID origin of the data centre where the data to be backed up is located
+        hints: the previous flow on each connection, in the order of the connections
+
+    :Return:
+        The amount of flow into the super target.
+
+    :Time complexity: 
+        O(V + E) to set the flow, plus O(E) per vertex of the changed region to repair it
+
+    :Aux space complexity:
+        O(V + E),where V is the number of vertex and E is the number of edges in graph
+    """
+    head, next_edge, to, cap = network.head, network.next, network.to, network.cap
+    sink = network.super_target
+    connection_count = network.connection_count
+    data_centre_count = network.data_centre_count
+    offset = data_centre_count + 1
+    excess = [0] * network.vertex_count
+
+    for i in range(connection_count):
+        edge = 2 * i
+        amount = min(max(hints[i], 0), cap[edge])
+        if amount > 0:
+            cap[edge] -= amount
+            cap[edge + 1] += amount
+            excess[to[edge]] += amount
+            excess[to[edge + 1]] -= amount
+
+    # the limits of the data centres, the origin sends what its connections take
+    for i in range(data_centre_count):
+        edge = 2 * (connection_count + i)
+        if i == origin:
+            amount = min(-excess[i + offset], cap[edge])
+        else:
+            amount = min(excess[i], cap[edge])
+        if amount > 0:
+            cap[edge] -= amount
+            cap[edge + 1] += amount
+            excess[i] -= amount
+            excess[i + offset] += amount
+
+    # the targets keep what their connections do not take
+    first_target_edge = 2 * (connection_count + data_centre_count)
+    for j in range(len(network.targets)):
+        edge = first_target_edge + 2 * j
+        amount = min(excess[to[edge + 1]], cap[edge])
+        if amount > 0:
+            cap[edge] -= amount
+            cap[edge + 1] += amount
+            excess[to[edge + 1]] -= amount
+            excess[sink] += amount
+
+    # reroute the excess to a deficit nearby or to the super target
+    for u in range(network.vertex_count):
+        while excess[u] > 0 and u != origin and u != sink:
+            path = _nearest_deficit(network, u, excess, _WARM_START_SEARCH)
+            if path is None:
+                break
+            v = to[path[-1]]
+            amount = min(excess[u], min(cap[edge] for edge in path))
+            if v != sink:
+                amount = min(amount, -excess[v])
+            for edge in path:
+                cap[edge] -= amount
+                cap[edge ^ 1] += amount
+            excess[u] -= amount
+            excess[v] += amount
+
+    # cancel the rest, every vertex has enough flow in (or out) to cancel its excess (or deficit), so one scan of 
+    # its edges is enough
+    work = [v for v in range(network.vertex_count) if excess[v] != 0 and v != origin and v != sink]
+    while len(work) > 0:
+        u = work.pop()
+        edge = head[u]
+        while edge != -1 and excess[u] != 0:
+            v = to[edge]
+            amount = 0
+            if excess[u] > 0 and (edge & 1 or v == sink):
+                # send the excess to the super target, or back along an edge bringing flow to u
+                amount = min(excess[u], cap[edge])
+            elif excess[u] < 0 and edge & 1 == 0:
+                # take back the flow of an edge taking flow from u
+                amount = -min(-excess[u], cap[edge ^ 1])
+            if amount != 0:
+                cap[edge] -= amount
+                cap[edge ^ 1] += amount
+                excess[u] -= amount
+                # a vertex already out of balance is already in the work list
+                if excess[v] == 0 and v != origin and v != sink:
+                    work.append(v)
+                excess[v] += amount
+            edge = next_edge[edge]
+    return excess[sink]
+
+class RoutingPlan:
+    """ 
+    This class is the routing of a maximum throughput: how much data goes through each connection, how much 
+    each origin sends and each target receives and, when asked for, the paths from the origins to the targets 
+    with their rates.
+    """
+
+    def __init__(self, residual_network, origin, throughput, decompose):
+        """
+        This is the constructor for the RoutingPlan class. It reads the flow of a solved CompactResidualNetwork.
+
+        :Input:
+            residual_network: A solved CompactResidualNetwork object
+            origin: the integer ID origin of the data centre where the data to be backed up is located
+            throughput: the maximum throughput found by the engine
+            decompose: True to split the flow into paths
+
+        :Return:
+            None
+
+        :Time complexity: 
+            O(E), or O(E * P) to split the flow into P paths
+
+        :Aux space complexity:
+            O(E),where E is the number of edges in graph
+        """
+        network = residual_network
+        self.throughput = throughput
+        self.connection_flows = network.connection_flows()
+
+        if origin < network.data_centre_count:
+            self.origin_flows = {origin: throughput}
+        else:
+            # the super source of maxThroughputMultiOrigin, each of its edges goes to one origin
+            self.origin_flows = {}
+            edge = network.head[origin]
+            while edge != -1:
+                if edge & 1 == 0:
+                    self.origin_flows[network.to[edge]] = network.cap[edge ^ 1]
+                edge = network.next[edge]
+
+        self.target_flows = {}
+        first_target_edge = 2 * (network.connection_count + network.data_centre_count)
+        for i in range(len(network.targets)):
+            target = network.targets[i]
+            self.target_flows[target] = self.target_flows.get(target, 0) + network.cap[first_target_edge + 2 * i + 1]
+
+        self.paths = None
+        if decompose:
+            self.paths = []
+            for rate, edges in network.decompose_flow(origin):
+                # the paths from the super source start with the edge to their origin
+                data_centres = [origin if origin < network.data_centre_count else network.to[edges[0]]]
+                connections = []
+                for edge in edges:
+                    # connection i is edge 2 * i, it ends at the vertex of its data centre
+                    if edge >> 1 < network.connection_count:
+                        connections.append(edge >> 1)
+                        data_centres.append(network.to[edge])
+                self.paths.append((rate, data_centres, connections))
+
+    def __str__(self):
+        """
+        This method is used to print the routing plan.
+
+        :Time complexity: 
+            O(E + P * V), where P is the number of paths
+
+        :Aux space complexity:
+            O(E + P * V), where P is the number of paths
+        """
+        lines = ["throughput: " + str(self.throughput)]
+        for target in sorted(self.target_flows):
+            lines.append("target " + str(target) + " receives " + str(self.target_flows[target]))
+        if self.paths is not None:
+            for rate, data_centres, _ in self.paths:
+                lines.append(" -> ".join(str(i) for i in data_centres) + ": " + str(rate))
+        return "\n".join(lines)
+
+def maxThroughputRouting(connections, maxIn, maxOut, origin, targets, algorithm="ford_fulkerson", backend="python", decompose=False, 
+                         warm_start=None):
+    """
+    Function description:
+        This function solves the same problem as maxThroughput, but returns the routing of the maximum throughput
+        instead of only its value.
+
+    :Input:
+        connections, maxIn, maxOut, origin, targets, algorithm, backend, warm_start: the same as maxThroughput
+        decompose: True to also split the flow into origin to target paths with their rates
+
+    :Return:
+        A RoutingPlan object: throughput, connection_flows (the flow on each connection, in input order), 
+        origin_flows (the flow sent by the origin), target_flows (the flow received by each target) and paths (a list of tuples (rate, data centres on the 
+        path, indices of the connections on the path), or None when decompose is False).
+
+    :Time complexity: 
+        The time complexity of the engine, plus O(E) to read the flows or O(E * P) to split them into P paths
+
+    :Aux space complexity: 
+        O(V + E), where V is the number of vertex and E is the number of edges
+    """
+    check_algorithm(algorithm)
+    check_backend(backend)
+
+    residual_network = BACKENDS[backend](connections, maxIn, maxOut, origin, targets)
+    throughput = _solve_from(residual_network, connections, origin, algorithm, None, warm_start)
+    return RoutingPlan(residual_network, origin, throughput, decompose)
+
+def maxThroughputMultiOrigin(connections, maxIn, maxOut, origins, targets, supply=None, storage=None, 
+                             algorithm="ford_fulkerson", backend="python", decompose=False):
+    """
+    Function description:
+        This function returns the maximum total throughput from several origins at once to the targets, in a single 
+        max-flow run, so the origins share the connections instead of each one counting on all of them.
+
+    Approach description:
+        The residual network is the one of maxThroughput with a super source added: the vertex of ID len(maxIn), 
+        which no data centre uses. It has an edge to each origin, whose capacity is the supply of the origin (the 
+        amount of data it has to back up), or maxOut of the origin when it has no supply cap. Like the origin of 
+        maxThroughput, each origin is limited by its maxOut. Each target is limited by its maxIn, and its edge to 
+        the super target takes its storage cap instead of its incoming capacity when it has one. The engine then 
+        runs from the super source.
+
+    :Input:
+        connections, maxIn, maxOut, targets, algorithm, backend, decompose: the same as maxThroughputRouting
+        origins: a list of the IDs of the data centres where the data to be backed up is located
+        supply: None, or a dictionary mapping an origin to the most data it sends, the other origins are uncapped
+        storage: None, or a dictionary mapping a target to the most data it receives, the other targets are uncapped
+
+    :Return:
+        A RoutingPlan object, see maxThroughputRouting. origin_flows holds the flow sent by each origin.
+
+    :Raise:
+        ValueError, if there is no origin, if supply or storage names a data centre which is not an origin or a 
+        target, or if a cap is negative
+
+    :Time complexity: 
+        O(V + E) to build the network, plus the time complexity of the engine
+
+    :Aux space complexity: 
+        O(V + E), where V is the number of vertex and E is the number of edges
+    """
+    check_algorithm(algorithm)
+    check_backend(backend)
+    origins = list(dict.fromkeys(origins))
+    if len(origins) == 0:
+        raise ValueError("at least one origin is needed")
+    supply = {} if supply is None else supply
+    storage = {} if storage is None else storage
+    for caps, allowed, name in ((supply, origins, "supply"), (storage, targets, "storage")):
+        for data_centre, cap in caps.items():
+            if data_centre not in allowed:
+                raise ValueError(name + " is given for data centre " + str(data_centre) + ", which is not one of the " 
+                                 + ("origins" if name == "supply" else "targets"))
+            if cap < 0:
+                raise ValueError("the " + name + " of data centre " + str(data_centre) + " is negative")
+
+    network_class = BACKENDS[backend]
+    network = network_class.__new__(network_class)
+    network._start(len(maxIn), targets)
+    offset = network.data_centre_count + 1
+    for connection in connections:
+        network.add_edge(connection[0] + offset, connection[1], connection[2])
+    network._add_data_centre_edges(maxIn, maxOut, None, targets)
+
+    # the origins send through their maxOut, as the origin of maxThroughput
+    split_edge = 2 * network.connection_count
+    for origin in origins:
+        network.cap[split_edge + 2 * origin] = maxOut[origin]
+        network.max_min_flow[origin] = maxOut[origin]
+    super_edge = 2 * (network.connection_count + network.data_centre_count)
+    for i in range(len(targets)):
+        if targets[i] in storage:
+            network.cap[super_edge + 2 * i] = storage[targets[i]]
+
+    super_source = network.data_centre_count
+    for origin in origins:
+        network.add_edge(super_source, origin, supply.get(origin, maxOut[origin]))
+    network._finish()
+
+    throughput = ALGORITHMS[algorithm](network, super_source)
+    return RoutingPlan(network, super_source, throughput, decompose)
+
+class MinCutReport:
+    """ 
+    This class is the bottleneck report of a maximum throughput: the edges of a minimum cut mapped back to the 
+    connections and data centre limits of the input. The cut is the one closest to the origin, made of the 
+    saturated edges leaving the vertices the origin can still reach once the flow is maximum. Its capacity is 
+    equal to the throughput, which certifies that the throughput is maximum.
+
+    Each bottleneck is also marked critical or not. A critical edge is in every minimum cut: the origin reaches its 
+    starting vertex and its ending vertex reaches the super target in the residual network, so raising its capacity 
+    alone raises the throughput. Raising a bottleneck which is not critical does nothing until other bottlenecks are 
+    raised too.
+
+    The edges into the super target are never part of this cut: their capacity is the incoming capacity of their 
+    target, so the origin cannot reach a target's extra vertex without an augmenting path.
+
+    The report only holds integers, strings and lists, so it can be cached or pickled as is.
+    """
+
+    def __init__(self, residual_network, origin, throughput, maxIn, maxOut):
+        """
+        This is the constructor for the MinCutReport class. It reads the cut of a solved CompactResidualNetwork.
+
+        :Input:
+            residual_network: A CompactResidualNetwork object holding a maximum flow
+            origin: the integer ID origin of the data centre where the data to be backed up is located
+            throughput: the maximum throughput found by the engine
+            maxIn, maxOut: the data centre limits the network was built from
+
+        :Return:
+            None
+
+        :Time complexity: 
+            O(V + E),where V is the number of vertex and E is the number of edges in graph
+
+        :Aux space complexity:
+            O(V + E),where V is the number of vertex and E is the number of edges in graph
+        """
+        network = residual_network
+        self.throughput = throughput
+        # the connections cut, as (connection index, critical)
+        self.connections = []
+        # the data centre limits cut, as (data centre, "maxIn", "maxOut" or "maxIn/maxOut", critical)
+        self.data_centres = []
+        self.capacity = 0
+
+        source_side = network.source_side(origin)
+        sink_side = network.sink_side()
+        split_edge = 2 * network.connection_count
+        super_edge = 2 * (network.connection_count + network.data_centre_count)
+        to, cap = network.to, network.cap
+
+        for edge in range(0, super_edge, 2):
+            u = to[edge + 1]
+            v = to[edge]
+            if not source_side[u] or source_side[v]:
+                continue
+            self.capacity += cap[edge] + cap[edge + 1]
+            critical = sink_side[v]
+
+            if edge < split_edge:
+                self.connections.append((edge >> 1, critical))
+            else:
+                i = (edge - split_edge) >> 1
+                if i == origin or (i not in network.targets and maxOut[i] < maxIn[i]):
+                    limit = "maxOut"
+                elif i in network.targets or maxIn[i] < maxOut[i]:
+                    limit = "maxIn"
+                else:
+                    # both limits have to be raised
+                    limit = "maxIn/maxOut"
+                self.data_centres.append((i, limit, critical))
+
+    def __str__(self):
+        """
+        This method is used to print the bottleneck report.
+
+        :Time complexity: 
+            O(C), where C is the number of edges in the cut
+
+        :Aux space complexity:
+            O(C), where C is the number of edges in the cut
+        """
+        lines = ["throughput: " + str(self.throughput) + ", cut capacity: " + str(self.capacity)]
+        for index, critical in self.connections:
+            lines.append("connection " + str(index) + (" (critical)" if critical else ""))
+        for data_centre, limit, critical in self.data_centres:
+            lines.append(limit + " of data centre " + str(data_centre) + (" (critical)" if critical else ""))
+        return "\n".join(lines)
+
+def maxThroughputMinCut(connections, maxIn, maxOut, origin, targets, algorithm="ford_fulkerson", backend="python"):
+    """
+    Function description:
+        This function solves the same problem as maxThroughput, and returns the bottleneck report of the maximum 
+        throughput: the connections and data centre limits of a minimum cut.
+
+    :Input:
+        connections, maxIn, maxOut, origin, targets, algorithm, backend: the same as maxThroughput
+
+    :Return:
+        A MinCutReport object.
+
+    :Time complexity: 
+        The time complexity of the engine, plus O(V + E) to read the cut
+
+    :Aux space complexity: 
+        O(V + E), where V is the number of vertex and E is the number of edges
+    """
+    check_algorithm(algorithm)
+    check_backend(backend)
+
+    residual_network = BACKENDS[backend](connections, maxIn, maxOut, origin, targets)
+    throughput = ALGORITHMS[algorithm](residual_network, origin)
+    return MinCutReport(residual_network, origin, throughput, maxIn, maxOut)
+
+# the engines maxThroughputEstimate can stop early, as they hold a valid flow between two augmentations
+ESTIMATE_ALGORITHMS = ("capacity_scaling", "dinic", "ford_fulkerson")
+
+class ThroughputEstimate:
+    """ 
+    This class is the answer of maxThroughputEstimate: the maximum throughput is between flow and upper_bound. flow 
+    is the throughput of a valid flow found before stopping and upper_bound the residual capacity of a cut added to 
+    it. exact is True when both are equal, and bounds counts the upper bounds computed during the solve.
+    """
+
+    def __init__(self, flow, upper_bound, bounds):
+        """
+        This is the constructor for the ThroughputEstimate class.
+
+        :Input:
+            flow: the throughput of the flow found, a lower bound of the maximum throughput
+            upper_bound: an upper bound of the maximum throughput
+            bounds: the number of upper bounds computed
+
+        :Return:
+            None
+
+        :Time complexity:
+            O(1)
+        """
+        self.flow = flow
+        self.upper_bound = upper_bound
+        self.exact = flow == upper_bound
+        self.bounds = bounds
+
+    def meets(self, demand):
+        """
+        This method tells whether the maximum throughput is at least demand.
+
+        :Return:
+            True or False, or None when the bounds are on both sides of the demand, which only happens if the solve 
+            was stopped by epsilon or for another demand.
+
+        :Time complexity: 
+            O(1)
+        """
+        if self.flow >= demand:
+            return True
+        if self.upper_bound < demand:
+            return False
+        return None
+
+    def relative_gap(self):
+        """
+        This method returns (upper_bound - flow) / upper_bound, the largest fraction of the maximum throughput the 
+        flow can miss, 0.0 when exact.
+
+        :Time complexity: 
+            O(1)
+        """
+        if self.upper_bound == 0:
+            return 0.0
+        return (self.upper_bound - self.flow) / self.upper_bound
+
+    def __str__(self):
+        """
+        This method is used to print the estimate.
+
+        :Time complexity: 
+            O(1)
+        """
+        if self.exact:
+            return "throughput: " + str(self.flow) + " (exact)"
+        return ("throughput: between " + str(self.flow) + " and " + str(self.upper_bound) + " (gap "
+                + "%.2f%%" % (100 * self.relative_gap()) + ")")
+
+def maxThroughputEstimate(connections, maxIn, maxOut, origin, targets, demand=None, epsilon=None, algorithm="dinic", 
+                          backend="python", stats=None):
+    """
+    Function description:
+        This function bounds the maximum possible data throughput from the data centre origin to the data centres 
+        specified in targets, and stops the solve as soon as the bounds are good enough: once the flow reaches 
+        demand or the upper bound falls below it, for "is the throughput at least demand", or once the upper bound 
+        is within epsilon of the flow, for an answer within epsilon.
+
+    Approach description:
+        The engines which augment a valid flow (ford_fulkerson, capacity_scaling and dinic) have a lower bound at 
+        any time: the flow found so far. An upper bound is the flow plus the residual capacity of any cut, and the 
+        breadth first search dinic runs every phase gives one cut per level (see _level_cut_bound) in O(V + E). 
+        The smallest of these bounds is kept, and the solve stops as soon as the bounds answer the question. 
+        Without demand and epsilon, it runs to the end like maxThroughput and the estimate is exact.
+
+    :Input:
+        connections, maxIn, maxOut, origin, targets, backend: the same as maxThroughput
+        demand: None, or the throughput asked for
+        epsilon: None, or the largest gap allowed between the bounds, relative to the flow: 0.01 stops once the 
+            upper bound is at most 1% above the flow
+        algorithm: the name of the engine, one of ESTIMATE_ALGORITHMS
+        stats: None, or a SolverStats object to collect the counters of the solve
+
+    :Return:
+        A ThroughputEstimate object.
+
+    :Raise:
+        ValueError, if the algorithm or the backend is unknown, or if demand or epsilon is negative
+
+    :Time complexity: 
+        At most the time complexity of the engine, plus O(V + E) per upper bound
+
+    :Aux space complexity: 
+        O(V + E), where V is the number of vertex and E is the number of edges
+    """
+    check_algorithm(algorithm, ESTIMATE_ALGORITHMS)
+    check_backend(backend)
+    if demand is not None and demand < 0:
+        raise ValueError("demand must be at least 0, not " + str(demand))
+    if epsilon is not None and epsilon < 0:
+        raise ValueError("epsilon must be at least 0, not " + str(epsilon))
+
+    residual_network = BACKENDS[backend](connections, maxIn, maxOut, origin, targets)
+    if algorithm == "dinic":
+        flow, upper_bound, bounds = _estimate_dinic(residual_network, origin, demand, epsilon, stats)
+    else:
+        flow, upper_bound, bounds = _estimate_augmenting(residual_network, origin, algorithm == "capacity_scaling", 
+                                                         demand, epsilon, stats)
+    return ThroughputEstimate(flow, upper_bound, bounds)
+
+class SolverStats:
+    """ 
+    This class collects the counters and timers of one or more solves, when passed as the stats argument of 
+    maxThroughput or of an engine. The engines only look at it between their inner loops: the edge scans of a 
+    breadth first search are counted afterwards from the vertices it expanded, so the loops themselves are 
+    unchanged and a solve without stats costs the same as before.
+
+    Counters:
+        augmentations: the number of augmenting paths pushed (ford_fulkerson, capacity_scaling and dinic)
+        bfs_runs: the number of breadth first searches, level graphs and global relabels included
+        edge_scans: the number of edges scanned by those breadth first searches
+        phases: the number of blocking flow phases (dinic), of scaling phases (capacity_scaling) or of discharge 
+            rounds between two global relabels (push_relabel) or of synchronous rounds (parallel_push_relabel)
+        relabels, gap_relabels, global_relabels: the relabel operations of push_relabel and parallel_push_relabel
+
+    timers maps the name of each stage to the time spent in it in seconds, added up over the solves: construction 
+    (maxThroughput only), then bfs, path_extraction and augmentation for ford_fulkerson and capacity_scaling, 
+    level_graph and blocking_flow for dinic, global_relabel and discharge for push_relabel, setup (shared memory 
+    and worker processes), global_relabel, parallel_rounds and return_excess for parallel_push_relabel.
+
+    on_augment, if given, is called as on_augment(amount, path) after every augmentation of ford_fulkerson, 
+    capacity_scaling and dinic, where path is the list of the edges of the path as the residual network stores 
+    them. dinic reuses the list, copy it to keep it.
+    """
+
+    def __init__(self, on_augment=None):
+        """
+        This is the constructor for the SolverStats class.
+
+        :Input:
+            on_augment: None, or a function called as on_augment(amount, path) after every augmentation
+
+        :Return:
+            None
+
+        :Time complexity: 
+            O(1)
+
+        :Aux space complexity:
+            O(1)
+        """
+        self.on_augment = on_augment
+        self.augmentations = 0
+        self.bfs_runs = 0
+        self.edge_scans = 0
+        self.phases = 0
+        self.relabels = 0
+        self.gap_relabels = 0
+        self.global_relabels = 0
+        self.timers = {}
+
+    def add_time(self, stage, seconds):
+        """
+        This method adds seconds to the timer of a stage.
+
+        :Time complexity: 
+            O(1)
+        """
+        self.timers[stage] = self.timers.get(stage, 0.0) + seconds
+
+    def augmented(self, amount, path):
+        """
+        This method counts one augmentation and calls on_augment.
+
+        :Time complexity: 
+            O(1), plus the time of on_augment
+        """
+        self.augmentations += 1
+        if self.on_augment is not None:
+            self.on_augment(amount, path)
+
+    def as_dict(self):
+        """
+        This method returns the counters and the timers as a dictionary, ready to be saved as JSON.
+
+        :Time complexity: 
+            O(1)
+
+        :Aux space complexity:
+            O(1)
+        """
+        return {
+            "augmentations": self.augmentations,
+            "bfs_runs": self.bfs_runs,
+            "edge_scans": self.edge_scans,
+            "phases": self.phases,
+            "relabels": self.relabels,
+            "gap_relabels": self.gap_relabels,
+            "global_relabels": self.global_relabels,
+            "timers": dict(self.timers),
+        }
+
+    def __str__(self):
+        """
+        This method is used to print the counters and the timers.
+
+        :Time complexity: 
+            O(1)
+
+        :Aux space complexity:
+            O(1)
+        """
+        counters = self.as_dict()
+        timers = counters.pop("timers")
+        lines = [name + ": " + str(value) for name, value in counters.items()]
+        for stage in timers:
+            lines.append(stage + ": %.6fs" % timers[stage])
+        return "\n".join(lines)
+
+def ford_fulkerson(residual_network, origin, stats=None):
+    """
+    Function description:
+        This function returns the maximum flow that can be augmented on the residual network
+
+    Approach description:
+        This is inspired by the https://cs.stackexchange.com/questions/55041/residual-graph-in-maximum-flow
+        and https://en.wikipedia.org/wiki/Edmonds–Karp_algorithm 
+
+        I will use Ford–Fulkerson method with Edmonds-Karp algorithm. This allows me to select shortest augmenting path
+        by using breadth-first-search. We will find augmenting paths with the fewest number of edges. This can also ensure that
+        the time complexity of my function will not exceed O(VE^2). 
+
+    :Input:
+        residual_network: A ResidualNetwork or CompactResidualNetwork object 
+        origin: the integer ID origin of the data centre where the data to be backed up is located
+        stats: None, or a SolverStats object to collect the counters and the timers of each stage
+
+    :Return:
+        flow: An interger of the maximum possible data throughput from the 
+            data centre origin to the data centres specified in targets.
+
+    :Time complexity: 
+        Best = Worst: O(VE^2), where V is the number of vertex and E is the number of edges. Based on the lecture slides given, 
+        we know that the time complexity of Edmonds-Karp algorithm is always O(VE^2).
+
+    :Aux space complexity: 
+        O(1)
+    """
+    if stats is not None:
+        return _ford_fulkerson_profiled(residual_network, origin, stats)
+
+    flow = 0
+    
+    # find an augmenting path
+    while residual_network.has_AugmentingPath(origin):
+
+        # obtain the path
+        path = residual_network.get_AugmentingPath(origin) 
+
+        #augment the flow equal to the residual capacity
+        flow += residual_network.max_flow_to_be_added_in_the_path
+
+        # update the residual network
+        residual_network.augmentFlow(path) 
+
+    return flow 
+
+def _ford_fulkerson_profiled(residual_network, origin, stats, delta=None):
+    """
+    The loop of ford_fulkerson with a timer around each stage, see SolverStats. It is kept apart so the loop of 
+    ford_fulkerson does not read the clock when nobody asked for it. With a delta, only the paths whose edges all 
+    have a residual capacity of at least delta are augmented (one phase of capacity_scaling).
+
+    :Time complexity: 
+        The time complexity of ford_fulkerson, plus O(V) per breadth first search to count its edge scans
+    """
+    network = residual_network
+    clock = time.perf_counter
+    bfs = path_extraction = augmentation = 0.0
+    flow = 0
+    while True:
+        start = clock()
+        if delta is None:
+            found = network.has_AugmentingPath(origin)
+        else:
+            found = network.has_AugmentingPath(origin, delta)
+        bfs += clock() - start
+        stats.bfs_runs += 1
+        stats.edge_scans += network.bfs_edge_scans()
+        if not found:
+            break
+
+        start = clock()
+        path = network.get_AugmentingPath(origin)
+        path_extraction += clock() - start
+
+        start = clock()
+        amount = network.max_flow_to_be_added_in_the_path
+        flow += amount
+        network.augmentFlow(path)
+        augmentation += clock() - start
+        stats.augmented(amount, path)
+
+    stats.add_time("bfs", bfs)
+    stats.add_time("path_extraction", path_extraction)
+    stats.add_time("augmentation", augmentation)
+    return flow
+
+def capacity_scaling(residual_network, origin, stats=None):
+    """
+    Function description:
+        This function returns the maximum flow that can be augmented on the residual network, using augmenting paths 
+        with capacity scaling.
+
+    Approach description:
+        This is inspired by https://en.wikipedia.org/wiki/Ford–Fulkerson_algorithm#Capacity_scaling
+
+        When the capacities range from a few units to millions, the shortest paths of ford_fulkerson often go 
+        through a thin edge and each one only adds a little flow. Here the augmenting paths are searched in phases 
+        with a threshold delta, starting at the largest power of 2 not above the largest capacity. A phase only 
+        uses the edges with a residual capacity of at least delta, so every path it augments adds at least delta. 
+        When no such path is left, delta is halved. The last phase has delta = 1, where every edge not saturated 
+        can be used, so the flow is maximum. The residual capacity of a minimum cut is below 2 * E * delta at the 
+        start of each phase, so a phase augments at most 2 * E paths.
+
+    :Input:
+        residual_network: A CompactResidualNetwork object 
+        origin: the integer ID origin of the data centre where the data to be backed up is located
+        stats: None, or a SolverStats object to collect the phases, the augmentations and the time spent in each stage
+
+    :Return:
+        flow: An interger of the maximum possible data throughput from the 
+            data centre origin to the data centres specified in targets.
+
+    :Time complexity: 
+        Worst: O(E^2 log U), where E is the number of edges and U is the largest capacity. It is O(E log U) 
+        augmentations, whatever the number of paths.
+
+    :Aux space complexity: 
+        O(V), where V is the number of vertex in graph
+    """
+    network = residual_network
+    largest = max(network.cap, default=0)
+    delta = 1 << (largest.bit_length() - 1) if largest > 0 else 0
+    flow = 0
+
+    while delta >= 1:
+        if stats is not None:
+            stats.phases += 1
+            flow += _ford_fulkerson_profiled(network, origin, stats, delta)
+        else:
+            while network.has_AugmentingPath(origin, delta):
+                path = network.get_AugmentingPath(origin)
+                flow += network.max_flow_to_be_added_in_the_path
+                network.augmentFlow(path)
+        delta >>= 1
+
+    return flow
+
+def push_relabel(residual_network, origin, stats=None):
+    """
+    Function description:
+        This function returns the maximum flow that can be pushed through the residual network, using the 
+        push-relabel method instead of augmenting paths.
+
+    Approach description:
+        This is inspired by https://en.wikipedia.org/wiki/Push–relabel_maximum_flow_algorithm
+
+        Every edge leaving the origin is saturated first, so the vertices behind it hold excess flow. Vertices with 
+        excess are then discharged in highest-label order: the excess is pushed along admissible edges 
+        (height[u] == height[v] + 1) and a vertex is relabelled when it has no admissible edge left. Two heuristics 
+        keep the number of relabels low on large graphs:
+            - gap relabelling: when no vertex is left at some height h, every vertex above h can no longer reach 
+              the super target, so they are lifted to V at once. The vertices are kept in a linked list per 
+              height, so a gap only visits the vertices it lifts.
+            - global relabelling: every V relabels the heights are recomputed exactly with a backward breadth-first-search 
+              from the super target.
+
+        Once no vertex below height V holds excess, the flow into the super target is maximum. The excess still
+        stranded inside the network is then discharged back to the origin in a second pass, so the flow stored in the
+        edges is a valid flow afterwards (the same state ford_fulkerson leaves behind).
+
+    :Input:
+        residual_network: A CompactResidualNetwork object 
+        origin: the integer ID origin of the data centre where the data to be backed up is located
+        stats: None, or a SolverStats object to collect the relabels and the time spent in each stage
+
+    :Return:
+        flow: An interger of the maximum possible data throughput from the 
+            data centre origin to the data centres specified in targets.
+
+    :Time complexity: 
+        Worst: O(V^2 * sqrt(E)), where V is the number of vertex and E is the number of edges
+
+    :Aux space complexity: 
+        O(V), where V is the number of vertex in graph
+    """
+    network = residual_network
+    sink = network.super_target
+    height = [0] * network.vertex_count
+    excess = [0] * network.vertex_count
+
+    # saturate every edge leaving the origin
+    edge = network.head[origin]
+    while edge != -1:
+        amount = network.cap[edge]
+        if amount > 0:
+            network.cap[edge] = 0
+            network.cap[edge ^ 1] += amount
+            excess[network.to[edge]] += amount
+            excess[origin] -= amount
+        edge = network.next[edge]
+
+    # phase 1: move as much excess as possible into the super target
+    _discharge_excess(network, origin, sink, height, excess, True, stats)
+
+    # phase 2: return the excess that cannot reach the super target to the origin
+    _discharge_excess(network, sink, origin, height, excess, False, stats)
+
+    return excess[sink]
+
+def _global_relabel(network, fixed, sink, height):
+    """
+    Set every height to the exact distance to the sink in the residual network, using a backward breadth-first-search.
+    Vertices that cannot reach the sink, and the fixed vertex, are lifted to V.
+
+    :Time complexity: 
+        O(V + E),where V is the number of vertex and E is the number of edges in graph
+
+    :Aux space complexity:
+        O(V), where V is the number of vertex in graph
+    """
+    head, next_edge, to, cap = network.head, network.next, network.to, network.cap
+    vertex_count = network.vertex_count
+    for i in range(vertex_count):
+        height[i] = vertex_count
+    height[sink] = 0
+
+    queue = deque()
+    queue.append(sink)
+    while len(queue) > 0:
+        v = queue.popleft()
+        next_height = height[v] + 1
+        edge = head[v]
+        while edge != -1:
+            # the reverse edge goes from to[edge] back to v
+            u = to[edge]
+            if height[u] == vertex_count and u != fixed and cap[edge ^ 1] > 0:
+                height[u] = next_height
+                queue.append(u)
+            edge = next_edge[edge]
+
+def _discharge_excess(network, fixed, sink, height, excess, gap, stats=None):
+    """
+    Discharge every vertex holding excess below height V into the sink, highest label first. The fixed vertex 
+    keeps height V, so no excess is pushed into it.
+
+    :Input:
+        network: A CompactResidualNetwork object
+        fixed: the ID of the vertex that is never relabelled (the origin in phase 1, the super target in phase 2)
+        sink: the ID of the vertex collecting the excess
+        height: a list of the height of each vertex, updated in place
+        excess: a list of the excess of each vertex, updated in place
+        gap: True to apply the gap relabelling heuristic
+        stats: None, or a SolverStats object, updated once per global relabel
+
+    :Return:
+        None
+
+    :Time complexity: 
+        O(V^2 * sqrt(E)), where V is the number of vertex and E is the number of edges
+
+    :Aux space complexity: 
+        O(V), where V is the number of vertex in graph
+    """
+    head, next_edge, to, cap = network.head, network.next, network.to, network.cap
+    vertex_count = network.vertex_count
+
+    while True:
+        if stats is not None:
+            start = time.perf_counter()
+            _global_relabel(network, fixed, sink, height)
+            stats.add_time("global_relabel", time.perf_counter() - start)
+            # the breadth first search scans the edges of every vertex it reaches
+            degree = network.out_degree()
+            stats.edge_scans += sum(degree[v] for v in range(vertex_count) if height[v] < vertex_count)
+            stats.bfs_runs += 1
+            stats.global_relabels += 1
+            stats.phases += 1
+            start = time.perf_counter()
+        else:
+            _global_relabel(network, fixed, sink, height)
+
+        # bucket the active vertices by height, and keep every vertex below V in a doubly linked list per height 
+        # (layer), so a gap relabelling only visits the vertices it lifts
+        buckets = [[] for _ in range(vertex_count)]
+        layer_head = [-1] * vertex_count
+        layer_next = [-1] * vertex_count
+        layer_prev = [-1] * vertex_count
+        highest = -1
+        # the highest layer which is not empty, the layers below it are never empty as the heights are distances
+        top = -1
+        for v in range(vertex_count):
+            h = height[v]
+            if h < vertex_count:
+                first = layer_head[h]
+                layer_next[v] = first
+                if first != -1:
+                    layer_prev[first] = v
+                layer_head[h] = v
+                top = max(top, h)
+                if excess[v] > 0 and v != sink:
+                    buckets[h].append(v)
+                    highest = max(highest, h)
+        # the edge each vertex resumes its scan from, -1 once every edge has been tried
+        current = list(head)
+        relabels = 0
+        gaps = 0
+
+        while highest >= 0 and relabels < vertex_count:
+            bucket = buckets[highest]
+            if len(bucket) == 0:
+                highest -= 1
+                continue
+
+            u = bucket.pop()
+            # skip the stale entries left behind by a gap relabelling
+            if height[u] != highest or excess[u] == 0:
+                continue
+
+            h = highest
+            edge = current[u]
+            while excess[u] > 0:
+                if edge == -1:
+                    # no admissible edge left, relabel u
+                    relabels += 1
+                    new_height = vertex_count
+                    scan = head[u]
+                    while scan != -1:
+                        if cap[scan] > 0 and height[to[scan]] < new_height:
+                            new_height = height[to[scan]]
+                        scan = next_edge[scan]
+                    new_height += 1
+
+                    # take u out of the layer of height h
+                    previous, following = layer_prev[u], layer_next[u]
+                    if previous == -1:
+                        layer_head[h] = following
+                    else:
+                        layer_next[previous] = following
+                    if following != -1:
+                        layer_prev[following] = previous
+
+                    if gap and layer_head[h] == -1:
+                        # nothing left at height h, the vertices above it are cut off from the sink
+                        gaps += 1
+                        for level in range(h + 1, top + 1):
+                            v = layer_head[level]
+                            while v != -1:
+                                height[v] = vertex_count
+                                v = layer_next[v]
+                            layer_head[level] = -1
+                        top = h - 1
+                        new_height = vertex_count
+
+                    edge = head[u]
+                    if new_height >= vertex_count:
+                        height[u] = vertex_count
+                        break
+                    height[u] = new_height
+                    first = layer_head[new_height]
+                    layer_prev[u] = -1
+                    layer_next[u] = first
+                    if first != -1:
+                        layer_prev[first] = u
+                    layer_head[new_height] = u
+                    top = max(top, new_height)
+                    h = new_height
+                    continue
+
+                residual = cap[edge]
+                v = to[edge]
+                if residual > 0 and h == height[v] + 1:
+                    amount = min(excess[u], residual)
+                    cap[edge] -= amount
+                    cap[edge ^ 1] += amount
+                    if excess[v] == 0 and v != sink and v != fixed:
+                        buckets[height[v]].append(v)
+                        highest = max(highest, height[v])
+                    excess[u] -= amount
+                    excess[v] += amount
+                    if amount < residual:
+                        break
+                edge = next_edge[edge]
+
+            current[u] = edge
+            if excess[u] > 0 and height[u] < vertex_count:
+                buckets[height[u]].append(u)
+                highest = max(highest, height[u])
+
+        if stats is not None:
+            stats.add_time("discharge", time.perf_counter() - start)
+            stats.relabels += relabels
+            stats.gap_relabels += gaps
+        if highest < 0:
+            return
+
+def parallel_push_relabel(residual_network, origin, stats=None, workers=None):
+    """
+    Function description:
+        This function returns the same maximum flow as push_relabel, with the discharges spread over several 
+        worker processes.
+
+    Approach description:
+        This is the synchronous version of push-relabel (Goldberg and Tarjan's pulses). The vertices are split in 
+        one block per worker, and the arrays of the network, the excess and the heights are placed in shared 
+        memory. Every round has two steps, separated by barriers:
+            - push: each worker pushes the excess of its active vertices along the admissible edges, with the 
+              heights of the start of the round. An edge and its reverse edge can never both be admissible, so 
+              the worker of the tail is the only one writing to the pair. The excess pushed into another block 
+              is added to a delta array of the worker, as two workers may push into the same vertex.
+            - relabel: each worker adds the deltas of its vertices to their excess and relabels its vertices 
+              which still hold excess. The new heights are written to a second height array and the old ones 
+              are read, so a relabel never sees the half updated heights of another block.
+        The main process swaps the height arrays between the rounds and runs a global relabel (see push_relabel) 
+        once the rounds since the last one took as long as it did. Once no vertex below height V holds excess, the flow into the super target is maximum, 
+        and the stranded excess is returned to the origin by the second phase of push_relabel in this process.
+
+        Each worker keeps the list of its active vertices, and finds the vertices touched by the pushes of the 
+        other workers with one scan of a byte per vertex. The rounds only pay off with a core per worker on large 
+        graphs: the barriers, the global relabels and the second phase are not shared.
+
+    :Input:
+        residual_network: A CompactResidualNetwork object 
+        origin: the integer ID origin of the data centre where the data to be backed up is located
+        stats: None, or a SolverStats object to collect the rounds, the global relabels and the time of each stage
+        workers: the number of worker processes, the number of CPUs by default
+
+    :Return:
+        flow: An interger of the maximum possible data throughput from the 
+            data centre origin to the data centres specified in targets.
+
+    :Time complexity: 
+        Worst: O(V^2 * sqrt(E)) work, O(V^2) rounds of O(V / workers + E / workers) each
+
+    :Aux space complexity: 
+        O(V * workers + E) in shared memory
+    """
+    import os
+    from multiprocessing import Barrier, Process, shared_memory
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("workers must be at least 1, not " + str(workers))
+
+    network = residual_network
+    vertex_count = network.vertex_count
+    edge_count = len(network.to)
+    sink = network.super_target
+    clock = time.perf_counter
+    start = clock()
+    sizes = _parallel_sizes(vertex_count, edge_count, workers)
+    memory = shared_memory.SharedMemory(create=True, size=8 * sum(sizes))
+    views = []
+    processes = []
+    barrier = Barrier(workers + 1)
+    try:
+        views = _parallel_views(memory, sizes)
+        head, next_edge, to, cap, excess, heights, _, touched, control, active, relabels = views
+        head[:] = array('q', network.head)
+        next_edge[:] = array('q', network.next)
+        to[:] = array('q', network.to)
+        cap[:] = array('q', network.cap)
+        # the global relabels run on a copy of the capacities, reading the shared memory item by item is slow
+        local_cap = array('q', bytes(8 * edge_count))
+        local_bytes = memoryview(local_cap).cast("B")
+        shared_bytes = cap.cast("B")
+        local = CompactResidualNetwork.from_arrays(network.head, network.next, network.to, local_cap, 
+                                                   network.data_centre_count, network.connection_count)
+        local_height = array('q', bytes(8 * vertex_count))
+
+        # saturate every edge leaving the origin
+        edge = head[origin]
+        while edge != -1:
+            amount = cap[edge]
+            if amount > 0:
+                cap[edge] = 0
+                cap[edge ^ 1] += amount
+                excess[to[edge]] += amount
+                excess[origin] -= amount
+                # the workers start from the vertices touched by a push
+                touched[to[edge]] = 1
+            edge = next_edge[edge]
+
+        for worker in range(workers):
+            process = Process(target=_parallel_push_relabel_worker, 
+                              args=(memory.name, sizes, worker, workers, origin, sink, barrier), daemon=True)
+            process.start()
+            processes.append(process)
+        if stats is not None:
+            stats.add_time("setup", clock() - start)
+
+        rounds = 0
+        global_relabels = 0
+        # a global relabel once the rounds since the last one took as long as it did, so neither can take more 
+        # than half of the time
+        rounds_time = 0
+        relabel_time = -1
+        start = clock()
+        while True:
+            if rounds_time > relabel_time:
+                relabel_start = clock()
+                local_bytes[:] = shared_bytes
+                _global_relabel(local, origin, sink, local_height)
+                heights[control[0] * vertex_count:(control[0] + 1) * vertex_count] = local_height
+                global_relabels += 1
+                rounds_time = 0
+                relabel_time = clock() - relabel_start
+                if stats is not None:
+                    stats.add_time("global_relabel", relabel_time)
+            round_start = clock()
+            control[1] = _PARALLEL_RUN
+            # push, relabel, done
+            barrier.wait()
+            barrier.wait()
+            barrier.wait()
+            control[0] ^= 1
+            rounds += 1
+            rounds_time += clock() - round_start
+            if sum(active) == 0:
+                break
+        control[1] = _PARALLEL_STOP
+        barrier.wait()
+        for process in processes:
+            process.join()
+
+        if stats is not None:
+            stats.add_time("parallel_rounds", clock() - start)
+            stats.phases += rounds
+            stats.relabels += sum(relabels)
+            stats.global_relabels += global_relabels
+            stats.bfs_runs += global_relabels
+
+        # phase 2 in this process, on the flow of the shared arrays
+        network.cap[:] = array('q', cap)
+        height = list(heights[control[0] * vertex_count:(control[0] + 1) * vertex_count])
+        excess = list(excess)
+        start = clock()
+        _discharge_excess(network, sink, origin, height, excess, False)
+        if stats is not None:
+            stats.add_time("return_excess", clock() - start)
+        return excess[sink]
+    except BaseException:
+        barrier.abort()
+        raise
+    finally:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+        local_bytes = shared_bytes = head = next_edge = to = cap = heights = touched = control = active = relabels = None
+        for view in views:
+            view.release()
+        memory.close()
+        memory.unlink()
+
+# the commands of the main process to the workers of parallel_push_relabel
+_PARALLEL_RUN = 0
+_PARALLEL_STOP = 1
+
+def _parallel_sizes(vertex_count, edge_count, workers):
+    """
+    The sizes in 64-bit words of the shared arrays of parallel_push_relabel: head, next, to, cap, excess, the two 
+    height arrays, the deltas of each worker, the touched flags (one byte per vertex), control, and the number of 
+    active vertices and of relabels of each worker.
+
+    :Time complexity:
+        O(1)
+    """
+    return [vertex_count, edge_count, edge_count, edge_count, vertex_count, 2 * vertex_count,
+            workers * vertex_count, (vertex_count + 7) // 8, 2, workers, workers]
+
+def _parallel_views(memory, sizes):
+    """
+    Cut the shared memory of parallel_push_relabel into its arrays, see _parallel_sizes.
+
+    :Time complexity:
+        O(1), the views share the memory of the block
+    """
+    views = []
+    position = 0
+    for i in range(len(sizes)):
+        view = memory.buf[position:position + 8 * sizes[i]]
+        # the touched flags are bytes, so a worker can look for the set ones with bytes.find
+        views.append(view.cast("B") if i == 7 else view.cast("q"))
+        view.release()
+        position += 8 * sizes[i]
+    return views
+
+def _parallel_push_relabel_worker(name, sizes, worker, workers, origin, sink, barrier):
+    """
+    The loop of a worker process of parallel_push_relabel, on its block of vertices. The worker keeps the list of 
+    its active vertices: the ones left with excess after their pushes, and the ones touched by a push.
+
+    :Time complexity:
+        O(V^2 * sqrt(E) / P) per worker, where P is the number of workers, plus the waits at the barriers
+    """
+    from multiprocessing import shared_memory
+
+    memory = shared_memory.SharedMemory(name=name)
+    views = []
+    try:
+        views = _parallel_views(memory, sizes)
+        head, next_edge, to, cap, excess, heights, deltas, touched, control, active, relabels = views
+        vertex_count = len(head)
+        first = worker * vertex_count // workers
+        last = (worker + 1) * vertex_count // workers
+        own_delta = worker * vertex_count
+        candidates = []
+
+        while True:
+            barrier.wait()
+            if control[1] == _PARALLEL_STOP:
+                return
+            old = heights[control[0] * vertex_count:(control[0] + 1) * vertex_count]
+            new = heights[(1 - control[0]) * vertex_count:(2 - control[0]) * vertex_count]
+
+            # push along the admissible edges, with the heights of the start of the round
+            relabel = []
+            for u in candidates:
+                amount_left = excess[u]
+                h = old[u]
+                if amount_left <= 0 or h >= vertex_count:
+                    continue
+                edge = head[u]
+                while edge != -1 and amount_left > 0:
+                    residual = cap[edge]
+                    if residual > 0:
+                        v = to[edge]
+                        if h == old[v] + 1:
+                            amount = min(amount_left, residual)
+                            cap[edge] = residual - amount
+                            cap[edge ^ 1] += amount
+                            amount_left -= amount
+                            deltas[own_delta + v] += amount
+                            touched[v] = 1
+                    edge = next_edge[edge]
+                excess[u] = amount_left
+                if amount_left > 0:
+                    relabel.append(u)
+            barrier.wait()
+
+            # collect the excess pushed into the block
+            candidates = []
+            flags = touched[first:last].tobytes()
+            u = flags.find(1)
+            while u != -1:
+                v = first + u
+                touched[v] = 0
+                for position in range(v, workers * vertex_count, vertex_count):
+                    if deltas[position]:
+                        excess[v] += deltas[position]
+                        deltas[position] = 0
+                if v != sink and v != origin:
+                    candidates.append(v)
+                u = flags.find(1, u + 1)
+
+            # relabel into the other height array
+            new[first:last] = old[first:last]
+            for u in relabel:
+                new_height = vertex_count
+                edge = head[u]
+                while edge != -1:
+                    if cap[edge] > 0 and old[to[edge]] < new_height:
+                        new_height = old[to[edge]]
+                    edge = next_edge[edge]
+                new[u] = min(new_height + 1, vertex_count)
+                candidates.append(u)
+            relabels[worker] += len(relabel)
+
+            candidates = [u for u in dict.fromkeys(candidates) if excess[u] > 0 and new[u] < vertex_count]
+            active[worker] = len(candidates)
+            old.release()
+            new.release()
+            barrier.wait()
+    except BaseException:
+        barrier.abort()
+        raise
+    finally:
+        for view in views:
+            view.release()
+        memory.close()
+
+def dinic(residual_network, origin, stats=None):
+    """
+    Function description:
+        This function returns the maximum flow that can be augmented on the residual network, using Dinic's 
+        blocking flow algorithm.
+
+    Approach description:
+        This is inspired by https://en.wikipedia.org/wiki/Dinic%27s_algorithm
+
+        ford_fulkerson runs one breadth-first-search per augmenting path. Here, each phase runs a single 
+        breadth-first-search from the origin to label every vertex with its level (its distance from the origin), 
+        and then pushes as many augmenting paths as possible through the level graph, the edges going from 
+        level i to level i + 1. The paths are found by a depth-first-search that keeps a current edge per vertex: 
+        an edge which is saturated or leads to a dead end is skipped for the rest of the phase, so no edge is 
+        scanned twice in a phase. The distance from the origin to the super target grows after every phase, 
+        so there are at most V phases.
+
+    :Input:
+        residual_network: A CompactResidualNetwork object 
+        origin: the integer ID origin of the data centre where the data to be backed up is located
+        stats: None, or a SolverStats object to collect the phases, the augmentations and the time spent in each stage
+
+    :Return:
+        flow: An interger of the maximum possible data throughput from the 
+            data centre origin to the data centres specified in targets.
+
+    :Time complexity: 
+        Worst: O(V^2 * E), where V is the number of vertex and E is the number of edges. When all the capacities are
+        equal (unit capacity graphs), it is O(E * sqrt(V)).
+
+    :Aux space complexity: 
+        O(V), where V is the number of vertex in graph
+    """
+    network = residual_network
+    level = [-1] * network.vertex_count
+    flow = 0
+
+    if stats is not None:
+        return _dinic_profiled(network, origin, level, stats)
+
+    while _build_level_graph(network, origin, level):
+        # the edge each vertex resumes its scan from, -1 once every edge has been tried
+        current = list(network.head)
+        flow += _blocking_flow(network, origin, level, current)
+
+    return flow
+
+def _dinic_profiled(network, origin, level, stats):
+    """
+    The loop of dinic with a timer around each stage, see SolverStats.
+
+    :Time complexity: 
+        The time complexity of dinic, plus O(V) per phase to count the edge scans of the level graph
+    """
+    clock = time.perf_counter
+    sink = network.super_target
+    degree = network.out_degree()
+    flow = 0
+    while True:
+        start = clock()
+        found = _build_level_graph(network, origin, level)
+        stats.add_time("level_graph", clock() - start)
+        stats.bfs_runs += 1
+        # the breadth first search expands every vertex below the level of the sink
+        last = level[sink] if found else len(level)
+        stats.edge_scans += sum(degree[v] for v in range(len(level)) if 0 <= level[v] < last)
+        if not found:
+            return flow
+
+        stats.phases += 1
+        start = clock()
+        current = list(network.head)
+        flow += _blocking_flow(network, origin, level, current, stats)
+        stats.add_time("blocking_flow", clock() - start)
+
+def _build_level_graph(network, origin, level, delta=1):
+    """
+    Label every vertex with its distance from the origin in the residual network, using breadth-first-search. 
+    Vertices which cannot be reached keep the level -1. Only the edges with a residual capacity of at least delta 
+    are followed.
+
+    :Return:
+        True, if the super target can be reached. Otherwise, False.
+
+    :Time complexity: 
+        O(V + E),where V is the number of vertex and E is the number of edges in graph
+
+    :Aux space complexity:
+        O(V), where V is the number of vertex in graph
+    """
+    head, next_edge, to, cap = network.head, network.next, network.to, network.cap
+    sink = network.super_target
+    for i in range(len(level)):
+        level[i] = -1
+    level[origin] = 0
+
+    queue = deque()
+    queue.append(origin)
+    while len(queue) > 0:
+        u = queue.popleft()
+        # the vertices beyond the level of the sink are never part of a shortest path
+        if level[sink] != -1 and level[u] >= level[sink]:
+            break
+        edge = head[u]
+        while edge != -1:
+            v = to[edge]
+            if level[v] == -1 and cap[edge] >= delta:
+                level[v] = level[u] + 1
+                queue.append(v)
+            edge = next_edge[edge]
+
+    return level[sink] != -1
+
+def _blocking_flow(network, origin, level, current, stats=None, limit=None):
+    """
+    Push augmenting paths through the level graph until the origin cannot reach the super target anymore. The 
+    depth-first-search is iterative, so it does not hit the recursion limit on deep graphs. After an augmentation 
+    it retreats only to the tail of the first saturated edge of the path instead of restarting from the origin.
+
+    :Input:
+        current: a list of the next edge to try for each vertex, updated in place
+        stats: None, or a SolverStats object told about every augmentation
+        limit: None, or an amount of flow after which the phase stops early, the level graph being left unfinished
+
+    :Return:
+        The amount of flow added in this phase.
+
+    :Time complexity: 
+        O(V * E),where V is the number of vertex and E is the number of edges in graph
+
+    :Aux space complexity:
+        O(V), where V is the number of vertex in graph
+    """
+    next_edge, to, cap = network.next, network.to, network.cap
+    sink = network.super_target
+    flow = 0
+    path = []
+    u = origin
+    while True:
+        if u == sink:
+            amount = min(cap[edge] for edge in path)
+            for edge in path:
+                cap[edge] -= amount
+                cap[edge ^ 1] += amount
+            flow += amount
+            if stats is not None:
+                stats.augmented(amount, path)
+            if limit is not None and flow >= limit:
+                return flow
+
+            # retreat to the tail of the first saturated edge
+            for i in range(len(path)):
+                if cap[path[i]] == 0:
+                    u = to[path[i] ^ 1]
+                    del path[i:]
+                    break
+            continue
+
+        edge = current[u]
+        next_level = level[u] + 1
+        while edge != -1 and (cap[edge] == 0 or level[to[edge]] != next_level):
+            edge = next_edge[edge]
+        current[u] = edge
+
+        if edge != -1:
+            # advance
+            path.append(edge)
+            u = to[edge]
+        else:
+            # dead end, retreat and skip the edge which led here
+            if u == origin:
+                return flow
+            level[u] = -1
+            edge = path.pop()
+            u = to[edge ^ 1]
+            current[u] = next_edge[edge]
+
+def _level_cut_bound(network, level):
+    """
+    Return how much flow can still be added at most, from the levels of _build_level_graph. For each level k below 
+    the last level fully expanded (the level of the super target, or the deepest level when it cannot be reached), 
+    the vertices of level at most k are the source side of a cut. An edge from level a to level b, or to a vertex 
+    not reached, crosses the cuts from a to b - 1, so the residual capacities of all the cuts are summed in a single 
+    pass with a difference array. The smallest of them and of the cut around the super target alone is returned. 
+    It is 0 when the super target cannot be reached with delta = 1.
+
+    :Time complexity: 
+        O(V + E),where V is the number of vertex and E is the number of edges in graph
+
+    :Aux space complexity:
+        O(V), where V is the number of vertex in graph
+    """
+    head, next_edge, to, cap = network.head, network.next, network.to, network.cap
+    sink = network.super_target
+    last = level[sink] if level[sink] != -1 else max(level) + 1
+
+    crossing = [0] * (last + 1)
+    for edge in range(len(to)):
+        if cap[edge] > 0:
+            a = level[to[edge ^ 1]]
+            if 0 <= a < last:
+                b = level[to[edge]]
+                if b == -1 or b > last:
+                    b = last
+                if a < b:
+                    crossing[a] += cap[edge]
+                    crossing[b] -= cap[edge]
+
+    bound = 0
+    edge = head[sink]
+    # the edges out of the super target are reverse edges, the residual capacity into it is on their reverses
+    while edge != -1:
+        bound += cap[edge ^ 1]
+        edge = next_edge[edge]
+    cut = 0
+    for k in range(last):
+        cut += crossing[k]
+        bound = min(bound, cut)
+    return bound
+
+def _estimate_done(flow, upper_bound, demand, epsilon):
+    """
+    Return True once the bounds answer the question of maxThroughputEstimate: they are equal, the flow reached the 
+    demand or the upper bound fell below it, or the upper bound is within epsilon of the flow.
+
+    :Time complexity: 
+        O(1)
+    """
+    if flow >= upper_bound:
+        return True
+    if demand is not None and (flow >= demand or upper_bound < demand):
+        return True
+    return epsilon is not None and upper_bound - flow <= epsilon * flow
+
+def _estimate_dinic(network, origin, demand, epsilon, stats=None):
+    """
+    The loop of dinic, taking an upper bound from each level graph (see _level_cut_bound) before its blocking flow 
+    and stopping as soon as _estimate_done. A blocking flow stops early once the flow reaches the demand.
+
+    :Return:
+        A tuple (flow, upper bound, number of upper bounds computed)
+
+    :Time complexity: 
+        The time complexity of dinic, plus O(V + E) per phase for the bound
+    """
+    level = [-1] * network.vertex_count
+    flow = 0
+    upper_bound = None
+    bounds = 0
+    while True:
+        found = _build_level_graph(network, origin, level)
+        bound = flow + _level_cut_bound(network, level)
+        upper_bound = bound if upper_bound is None else min(upper_bound, bound)
+        bounds += 1
+        if stats is not None:
+            stats.bfs_runs += 1
+        if not found or _estimate_done(flow, upper_bound, demand, epsilon):
+            return flow, upper_bound, bounds
+
+        if stats is not None:
+            stats.phases += 1
+        current = list(network.head)
+        flow += _blocking_flow(network, origin, level, current, stats, None if demand is None else demand - flow)
+
+# the number of augmenting paths between two upper bounds of _estimate_augmenting
+_ESTIMATE_BOUND_INTERVAL = 32
+
+def _estimate_augmenting(network, origin, scaling, demand, epsilon, stats=None):
+    """
+    The loop of ford_fulkerson, or of capacity_scaling when scaling is True, taking an upper bound (see 
+    _level_cut_bound) at the start, every _ESTIMATE_BOUND_INTERVAL augmenting paths and at the end of each phase 
+    of capacity_scaling, and stopping as soon as _estimate_done. The demand is checked after every path. The levels 
+    of a bound only follow the edges of at least delta, the threshold of the phase: at the end of a phase, the cut 
+    around the vertices they reach is left with less than delta on each of its edges.
+
+    :Return:
+        A tuple (flow, upper bound, number of upper bounds computed)
+
+    :Time complexity: 
+        The time complexity of the engine, plus O(V + E) per bound
+    """
+    level = [-1] * network.vertex_count
+    delta = 1
+    if scaling:
+        largest = max(network.cap, default=0)
+        delta = 1 << (largest.bit_length() - 1) if largest > 0 else 1
+    flow = 0
+    upper_bound = None
+    bounds = 0
+    since_bound = _ESTIMATE_BOUND_INTERVAL
+    while True:
+        if since_bound >= _ESTIMATE_BOUND_INTERVAL:
+            _build_level_graph(network, origin, level, delta)
+            bound = flow + _level_cut_bound(network, level)
+            upper_bound = bound if upper_bound is None else min(upper_bound, bound)
+            bounds += 1
+            since_bound = 0
+            if _estimate_done(flow, upper_bound, demand, epsilon):
+                return flow, upper_bound, bounds
+
+        found = network.has_AugmentingPath(origin, delta)
+        if stats is not None:
+            stats.bfs_runs += 1
+        if not found:
+            if delta == 1:
+                return flow, flow, bounds
+            if stats is not None:
+                stats.phases += 1
+            # the bound of the cut the phase ends on, before the threshold is lowered
+            _build_level_graph(network, origin, level, delta)
+            upper_bound = min(upper_bound, flow + _level_cut_bound(network, level))
+            bounds += 1
+            since_bound = 0
+            if _estimate_done(flow, upper_bound, demand, epsilon):
+                return flow, upper_bound, bounds
+            delta >>= 1
+            continue
+
+        path = network.get_AugmentingPath(origin)
+        amount = network.max_flow_to_be_added_in_the_path
+        flow += amount
+        network.augmentFlow(path)
+        if stats is not None:
+            stats.augmented(amount, path)
+        since_bound += 1
+        if demand is not None and flow >= demand:
+            return flow, upper_bound, bounds
+
+ALGORITHMS = {
+    "ford_fulkerson": ford_fulkerson,
+    "push_relabel": push_relabel,
+    "dinic": dinic,
+    "capacity_scaling": capacity_scaling,
+    "parallel_push_relabel": parallel_push_relabel,
+}
+
+def check_algorithm(algorithm, table=ALGORITHMS):
+    """
+    Function description:
+        This function checks the name of the max-flow engine given to an entry point.
+
+    :Input:
+        algorithm: the name of the engine
+        table: the engines the entry point can run, ALGORITHMS by default or a subset of it
+
+    :Return:
+        None
+
+    :Raise:
+        ValueError, if algorithm is not one of the keys of table
+
+    :Time complexity: 
+        O(1)
+    """
+    if algorithm not in table:
+        raise ValueError("unknown algorithm " + repr(algorithm) + ", expected one of " + ", ".join(sorted(table)))
+
+def check_backend(backend):
+    """
+    Function description:
+        This function checks the name of the residual network class given to an entry point.
+
+    :Input:
+        backend: the name of the residual network class
+
+    :Return:
+        None
+
+    :Raise:
+        ValueError, if backend is not one of the keys of BACKENDS
+
+    :Time complexity: 
+        O(1)
+    """
+    if backend not in BACKENDS:
+        raise ValueError("unknown backend " + repr(backend) + ", expected one of " + ", ".join(sorted(BACKENDS)))
+
+class IncrementalMaxThroughput:
+    """ 
+    This class keeps the residual network and its maximum flow alive between queries, so the maximum throughput 
+    can be updated after the bandwidth of one connection or the limits of one data centre change, without 
+    rebuilding the network and augmenting from zero flow again.
+
+    When a capacity grows, the current flow is still valid and only the new augmenting paths are searched. When a 
+    capacity shrinks below the flow on its edge, the flow on the edge is cut down to the new capacity, which leaves
+    the extra flow stranded at the starting vertex of the edge. It is first rerouted to the ending vertex along other 
+    paths of the residual network, and what cannot be rerouted is cancelled back to the origin and from the super 
+    target. The engine then augments from the repaired flow.
+    """
+
+    def __init__(self, connections, maxIn, maxOut, origin, targets, algorithm="dinic"):
+        """
+        This is the constructor for the IncrementalMaxThroughput class. It builds the residual network and solves it once.
+
+        :Input:
+            connections, maxIn, maxOut, origin, targets: the same as maxThroughput
+            algorithm: the name of the engine used to augment, one of the keys of ALGORITHMS
+
+        :Return:
+            None
+
+        :Time complexity: 
+            The time complexity of the engine on the whole network.
+
+        :Aux space complexity:
+            O(V + E),where V is the number of vertex and E is the number of edges in graph
+        """
+        check_algorithm(algorithm)
+
+        self.connections = list(connections)
+        self.maxIn = list(maxIn)
+        self.maxOut = list(maxOut)
+        self.origin = origin
+        self.targets = targets
+        self.engine = ALGORITHMS[algorithm]
+
+        self.residual_network = CompactResidualNetwork(self.connections, self.maxIn, self.maxOut, origin, targets)
+
+        # the edges into the super target of each target, their capacity follows the incoming capacity of the target
+        self.target_edges = {}
+        first_target_edge = 2 * (len(self.connections) + len(self.maxIn))
+        for i in range(len(targets)):
+            self.target_edges.setdefault(targets[i], []).append(first_target_edge + 2 * i)
+
+        self.throughput = self.engine(self.residual_network, origin)
+        self._min_cut = None
+
+    def min_cut(self):
+        """
+        This method returns the bottleneck report of the current maximum throughput. It is computed once and kept 
+        until the next change of capacity.
+
+        :Return:
+            A MinCutReport object.
+
+        :Time complexity: 
+            O(V + E) for the first call after a change, O(1) after
+
+        :Aux space complexity:
+            O(V + E),where V is the number of vertex and E is the number of edges in graph
+        """
+        if self._min_cut is None:
+            self._min_cut = MinCutReport(self.residual_network, self.origin, self.throughput, self.maxIn, self.maxOut)
+        return self._min_cut
+
+    def set_connection_capacity(self, index, capacity):
+        """
+        This method is used to change the bandwidth of a connection and update the maximum throughput.
+
+        :Input:
+            index: the index of the connection in the connections given to the constructor
+            capacity: the new capacity of the connection
+
+        :Return:
+            The new maximum throughput.
+
+        :Time complexity: 
+            O(E) per augmenting path used to repair and augment the flow, where E is the number of edges in graph
+
+        :Aux space complexity:
+            O(V), where V is the number of vertex in graph
+        """
+        u, v, old_capacity = self.connections[index]
+        self.connections[index] = (u, v, capacity)
+        self._set_edge_capacity(2 * index, capacity)
+
+        # the edge from the target to the super target takes the incoming capacity of the target
+        network = self.residual_network
+        network.incoming[v] += capacity - old_capacity
+        for edge in self.target_edges.get(v, []):
+            self._set_edge_capacity(edge, network.incoming[v])
+
+        return self._augment()
+
+    def set_data_centre_limits(self, data_centre, maxIn=None, maxOut=None):
+        """
+        This method is used to change the maxIn and/or maxOut of a data centre and update the maximum throughput.
+
+        :Input:
+            data_centre: the ID of the data centre
+            maxIn: the new maximum amount of incoming data, or None to keep it
+            maxOut: the new maximum amount of outgoing data, or None to keep it
+
+        :Return:
+            The new maximum throughput.
+
+        :Time complexity: 
+            O(E) per augmenting path used to repair and augment the flow, where E is the number of edges in graph
+
+        :Aux space complexity:
+            O(V), where V is the number of vertex in graph
+        """
+        if maxIn is not None:
+            self.maxIn[data_centre] = maxIn
+        if maxOut is not None:
+            self.maxOut[data_centre] = maxOut
+
+        flow = split_capacity(data_centre, self.maxIn, self.maxOut, self.origin, self.targets)
+        self.residual_network.max_min_flow[data_centre] = flow
+        self._set_edge_capacity(2 * (len(self.connections) + data_centre), flow)
+
+        return self._augment()
+
+    def _set_edge_capacity(self, edge, capacity):
+        """
+        Set the capacity of a forward edge and repair the flow if it is now above the capacity.
+
+        :Time complexity: 
+            O(E) per augmenting path used to repair the flow, where E is the number of edges in graph
+
+        :Aux space complexity:
+            O(V), where V is the number of vertex in graph
+        """
+        network = self.residual_network
+        cap, to = network.cap, network.to
+        flow = cap[edge ^ 1]
+        if capacity >= flow:
+            cap[edge] = capacity - flow
+            return
+
+        # cut the flow down to the capacity, the rest is stuck at u and missing at v
+        u = to[edge ^ 1]
+        v = to[edge]
+        cap[edge] = 0
+        cap[edge ^ 1] = capacity
+        stranded = flow - capacity
+
+        # reroute it from u to v, and cancel what cannot be rerouted
+        stranded -= _augment_between(network, u, v, stranded)
+        if stranded > 0:
+            _augment_between(network, u, self.origin, stranded)
+            _augment_between(network, network.super_target, v, stranded)
+            self.throughput -= stranded
+
+    def _augment(self):
+        """
+        Augment the repaired flow to a maximum flow again.
+
+        :Return:
+            The new maximum throughput.
+
+        :Time complexity:
+            The time complexity of the engine, from the repaired flow
+        """
+        self.throughput += self.engine(self.residual_network, self.origin)
+        self._min_cut = None
+        return self.throughput
+
+def _augment_between(network, source, sink, limit):
+    """
+    Push up to limit units of flow from source to sink along shortest augmenting paths of a CompactResidualNetwork.
+
+    :Return:
+        The amount of flow pushed.
+
+    :Time complexity: 
+        O(V + E) per augmenting path,where V is the number of vertex and E is the number of edges in graph
+
+    :Aux space complexity:
+        O(V), where V is the number of vertex in graph
+    """
+    if source == sink:
+        return limit
+
+    head, next_edge, to, cap = network.head, network.next, network.to, network.cap
+    pushed = 0
+    while pushed < limit:
+        parent_edge = [-1] * network.vertex_count
+        parent_edge[source] = source
+
+        discovered = deque()
+        discovered.append(source)
+        while len(discovered) > 0 and parent_edge[sink] == -1:
+            u = discovered.popleft()
+            edge = head[u]
+            while edge != -1:
+                v = to[edge]
+                if parent_edge[v] == -1 and cap[edge] > 0:
+                    parent_edge[v] = edge
+                    discovered.append(v)
+                edge = next_edge[edge]
+        if parent_edge[sink] == -1:
+            break
+
+        path = []
+        vertex = sink
+        while vertex != source:
+            path.append(parent_edge[vertex])
+            vertex = to[parent_edge[vertex] ^ 1]
+        amount = min(limit - pushed, min(cap[edge] for edge in path))
+        for edge in path:
+            cap[edge] -= amount
+            cap[edge ^ 1] += amount
+        pushed += amount
+
+    return pushed
+
+class BatchMaxThroughput:
+    """ 
+    This class answers many (origin, targets) queries over the same connections, maxIn and maxOut while building the 
+    residual network only once.
+
+    Only a few capacities of the residual network depend on the query: the edge between the origin and its extra 
+    vertex (maxOut instead of min(maxIn, maxOut)), the same edge for the targets (maxIn), and the edges into the 
+    super target. So the network is built once with an edge from every data centre to the super target, all of 
+    capacity 0, and a copy of its capacities is kept. Each query copies the capacities back, which also clears the 
+    flow of the previous query, sets the capacities of its origin and targets, and runs the engine.
+
+    solve_all can also spread the queries over a process pool. The arrays of the network are then placed once in 
+    shared memory, each worker reads the structure from there and only copies the capacities it solves on.
+    """
+
+    def __init__(self, connections, maxIn, maxOut, algorithm="dinic"):
+        """
+        This is the constructor for the BatchMaxThroughput class. It builds the residual network shared by the queries.
+
+        :Input:
+            connections, maxIn, maxOut: the same as maxThroughput
+            algorithm: the name of the engine used for every query, one of the keys of ALGORITHMS
+
+        :Return:
+            None
+
+        :Time complexity: 
+            O(V + E),where V is the number of vertex and E is the number of edges in graph
+
+        :Aux space complexity:
+            O(V + E),where V is the number of vertex and E is the number of edges in graph
+        """
+        check_algorithm(algorithm)
+        # no origin and no target, every data centre gets min(maxIn, maxOut)
+        self._setup(CompactResidualNetwork(connections, maxIn, maxOut, None, []), maxIn, maxOut, algorithm)
+
+    @classmethod
+    def from_connection_chunks(cls, chunks, maxIn, maxOut, algorithm="dinic"):
+        """
+        This method is used to build the network shared by the queries from connections streamed in chunks, see 
+        CompactResidualNetwork.from_connection_chunks.
+
+        :Input:
+            chunks: an iterable of flat sequences of integers, three per connection
+            maxIn, maxOut, algorithm: the same as the constructor
+
+        :Return:
+            A BatchMaxThroughput object
+
+        :Raise:
+            ValueError, if the algorithm is unknown
+
+        :Time complexity: 
+            O(V + E),where V is the number of vertex and E is the number of edges in graph
+
+        :Aux space complexity:
+            O(V + E + C), where C is the size of the largest chunk
+        """
+        check_algorithm(algorithm)
+        batch = cls.__new__(cls)
+        batch._setup(CompactResidualNetwork.from_connection_chunks(chunks, maxIn, maxOut, None, []), maxIn, maxOut, 
+                     algorithm)
+        return batch
+
+    def _setup(self, network, maxIn, maxOut, algorithm):
+        """
+        Add the edges of the data centres to the super target to a network built without origin and targets, and 
+        keep a copy of its capacities.
+
+        :Time complexity: 
+            O(V + E),where V is the number of vertex and E is the number of edges in graph
+        """
+        self.algorithm = algorithm
+        self.maxIn = list(maxIn)
+        self.maxOut = list(maxOut)
+
+        offset = network.data_centre_count + 1
+        for i in range(network.data_centre_count):
+            network.add_edge(i + offset, network.super_target, 0)
+
+        self.residual_network = network
+        self.incoming = network.incoming[:network.data_centre_count]
+        self.base_cap = array('q', network.cap)
+
+    def solve(self, origin, targets):
+        """
+        This method returns the maximum throughput from origin to targets, the same as maxThroughput.
+
+        :Input:
+            origin: the integer ID origin of the data centre where the data to be backed up is located
+            targets: a of data centres that are deemed appropriate locations for the backup data to be stored.
+
+        :Return:
+            An interger of the maximum possible data throughput from the 
+                data centre origin to the data centres specified in targets.
+
+        :Time complexity: 
+            O(E) to reset the capacities, plus the time complexity of the engine
+
+        :Aux space complexity:
+            O(V), where V is the number of vertex in graph
+        """
+        network = self.residual_network
+        network.cap[:] = self.base_cap
+        network.targets = targets
+        configure_query(network, self.maxIn, self.maxOut, self.incoming, origin, targets)
+        return ALGORITHMS[self.algorithm](network, origin)
+
+    def solve_all(self, queries, processes=None):
+        """
+        This method returns the maximum throughput of every (origin, targets) query, in the order of the queries.
+
+        :Input:
+            queries: an iterable of (origin, targets) tuples
+            processes: None or 1 to solve the queries in this process, otherwise the number of worker processes
+
+        :Return:
+            A list of the maximum throughput of each query.
+
+        :Time complexity: 
+            O(Q * (E + engine)), where Q is the number of queries, shared between the processes
+
+        :Aux space complexity:
+            O(V + E) once in shared memory, plus O(E) per process for the capacities being solved
+        """
+        queries = list(queries)
+        if processes is None or processes <= 1 or len(queries) <= 1:
+            return [self.solve(origin, targets) for origin, targets in queries]
+
+        from concurrent.futures import ProcessPoolExecutor
+        from multiprocessing import shared_memory
+
+        network = self.residual_network
+        arrays = (network.head, network.next, network.to, self.base_cap)
+        memory = shared_memory.SharedMemory(create=True, size=max(1, sum(len(a) for a in arrays) * 8))
+        try:
+            sizes = []
+            position = 0
+            for a in arrays:
+                memory.buf[position:position + len(a) * 8] = a.tobytes()
+                position += len(a) * 8
+                sizes.append(len(a))
+
+            state = (memory.name, sizes, network.data_centre_count, network.connection_count,
+                     self.maxIn, self.maxOut, self.incoming, self.algorithm)
+            with ProcessPoolExecutor(processes, initializer=_batch_worker_init, initargs=(state,)) as pool:
+                chunk_size = max(1, len(queries) // (processes * 4))
+                return list(pool.map(_batch_worker_solve, queries, chunksize=chunk_size))
+        finally:
+            memory.close()
+            memory.unlink()
+
+def configure_query(network, maxIn, maxOut, incoming, origin, targets):
+    """
+    Function description:
+        This function sets the capacities of a BatchMaxThroughput network which depend on the origin and the 
+        targets of a query, the capacities of the other data centres being already reset.
+
+    :Input:
+        network: the CompactResidualNetwork of a BatchMaxThroughput or of a CompiledGraph
+        maxIn, maxOut: the same as maxThroughput
+        incoming: the total capacity of the connections into each data centre
+        origin, targets: the origin and the targets of the query
+
+    :Return:
+        None
+
+    :Time complexity: 
+        O(T), where T is the number of targets
+
+    :Aux space complexity:
+        O(1)
+    """
+    cap = network.cap
+    split_edge = 2 * network.connection_count
+    super_edge = 2 * (network.connection_count + network.data_centre_count)
+
+    for target in targets:
+        if target != origin:
+            cap[split_edge + 2 * target] = maxIn[target]
+        cap[super_edge + 2 * target] = incoming[target]
+    cap[split_edge + 2 * origin] = maxOut[origin]
+
+# the shared network of a BatchMaxThroughput worker process, set by _batch_worker_init
+_batch_worker_state = None
+
+def _batch_worker_init(state):
+    """
+    Attach a worker process of BatchMaxThroughput.solve_all to the shared memory holding the network.
+
+    :Time complexity:
+        O(V + E) to build the network of the worker
+    """
+    global _batch_worker_state
+    from multiprocessing import shared_memory
+
+    name, sizes, data_centre_count, connection_count, maxIn, maxOut, incoming, algorithm = state
+    # keep a reference to the shared memory, the views below do not
+    memory = shared_memory.SharedMemory(name=name)
+    views = []
+    position = 0
+    for size in sizes:
+        views.append(memory.buf[position:position + size * 8])
+        position += size * 8
+    # the capacities stay raw bytes, each query copies them into its own array
+    head, next_edge, to = (view.cast("q") for view in views[:3])
+    base_cap = views[3]
+
+    network = CompactResidualNetwork.from_arrays(head, next_edge, to, array('q'), data_centre_count, connection_count)
+    _batch_worker_state = (memory, network, base_cap, maxIn, maxOut, incoming, ALGORITHMS[algorithm])
+
+def _batch_worker_solve(query):
+    """
+    Solve one (origin, targets) query in a worker process of BatchMaxThroughput.solve_all.
+
+    :Time complexity:
+        The time complexity of BatchMaxThroughput.solve
+    """
+    _, network, base_cap, maxIn, maxOut, incoming, engine = _batch_worker_state
+    origin, targets = query
+
+    cap = array('q')
+    cap.frombytes(base_cap)
+    network.cap = cap
+    network.targets = targets
+    configure_query(network, maxIn, maxOut, incoming, origin, targets)
+    return engine(network, origin)
 
 if __name__ == "__main__":
     connections = [(0, 1, 3000), (1, 2, 2000), (1, 3, 1000),(0, 3, 2000), (3, 4, 2000), (3, 2, 1000)]
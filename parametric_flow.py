@@ -0,0 +1,275 @@
+"""
+This file computes the maximum throughput of a topology as a function of a scaling factor, for capacity planning:
+the limits of some data centres (maxIn and maxOut) and the capacities of some connections are multiplied by a
+factor l, the others stay as they are, and throughput(l) is wanted over a whole range of l.
+
+Every cut of the residual network has a capacity a + b * l, where a is the capacity of its edges which are not
+scaled and b the capacity of its scaled edges at l = 1. throughput(l) is the smallest of these lines, so it is
+concave and piecewise linear, and its breakpoints are where the minimum cut changes. ThroughputCurve finds every
+line of the curve with the search of Eisner and Severance: solve at both ends of the range, which gives the lines
+of a minimum cut there, and solve again where the two lines cross. If the throughput there is on the two lines,
+the crossing is a breakpoint (or no breakpoint at all, if they are the same line); otherwise the new minimum cut
+gives a third line, and both halves are searched the same way. This takes at most 2 * B + 1 solves for B
+breakpoints.
+
+Gallo, Grigoriadis and Tarjan do better (one solve for the whole curve) when the scaled edges all leave the source
+or all enter the sink, as the minimum cuts are then nested. Here the scaled edges are the split edges of the data
+centres (the max_min_flow of the residual network) and the connections, in the middle of the network, so the cuts
+are not nested and the search above is used instead. What it keeps from them is the reuse of work between the
+solves: all of them run on the same network, whose capacities are reset in O(E), and each one warm starts (see
+apply_warm_start) from the flow of the previous one, so the later solves only repair the flow around the cuts which
+change.
+
+The breakpoints are exact fractions: at l = p / q the capacities are multiplied by q so they stay integers, and the
+capacities of the network are Python integers since they can grow past 64 bits.
+
+"""
+from fractions import Fraction
+
+from maximum_throughput import ALGORITHMS, CompactResidualNetwork, apply_warm_start, check_algorithm
+
+# the engines which can solve a network whose capacities are a list of Python integers
+PARAMETRIC_ALGORITHMS = {name: ALGORITHMS[name] for name in ALGORITHMS if name != "parallel_push_relabel"}
+
+class ThroughputCurve:
+    """
+    This class holds the maximum throughput of a topology as a function of the scaling factor, see the description
+    of this file. segments is a list of tuples (start, end, intercept, slope), sorted by start: throughput(l) is
+    intercept + slope * l for l from start to end. breakpoints is the list of the factors where the slope changes,
+    and solves counts the max-flow solves run to find them.
+    """
+
+    def __init__(self, connections, maxIn, maxOut, origin, targets, low=0, high=1, data_centres=None, links=(),
+                 algorithm="dinic"):
+        """
+        This is the constructor for the ThroughputCurve class. It finds every segment of the curve from low to high.
+
+        :Input:
+            connections, maxIn, maxOut, origin, targets: the same as maxThroughput, the topology at a factor of 1
+            low, high: the range of the factor, numbers (integers, fractions or floats) with 0 <= low <= high
+            data_centres: the data centres whose maxIn and maxOut are scaled, None for all of them
+            links: the indices in connections of the connections whose capacity is scaled
+            algorithm: the name of the max-flow engine, one of the keys of PARAMETRIC_ALGORITHMS
+
+        :Return:
+            None
+
+        :Raise:
+            ValueError, if the algorithm is unknown, if the range is not 0 <= low <= high, or if a data centre or a
+            link is out of range
+
+        :Time complexity:
+            O(B * (E + F)), where B is the number of breakpoints, E is the number of edges and F the time of a
+            warm started solve of the engine
+
+        :Aux space complexity:
+            O(V + E),where V is the number of vertex and E is the number of edges in graph
+        """
+        check_algorithm(algorithm, PARAMETRIC_ALGORITHMS)
+        low, high = Fraction(low), Fraction(high)
+        if not 0 <= low <= high:
+            raise ValueError("the range of the factor must be 0 <= low <= high, not " + str(low) + " to " + str(high))
+        if data_centres is None:
+            data_centres = range(len(maxIn))
+        for data_centre in data_centres:
+            if not 0 <= data_centre < len(maxIn):
+                raise ValueError("data centre " + repr(data_centre) + " is out of range")
+        for link in links:
+            if not 0 <= link < len(connections):
+                raise ValueError("link " + repr(link) + " is out of range")
+
+        network = CompactResidualNetwork(connections, maxIn, maxOut, origin, targets)
+        network.cap = list(network.cap)
+        self.residual_network = network
+        self.origin = origin
+        self.algorithm = algorithm
+        self.solves = 0
+        self._flows = None
+
+        # the capacity of edge 2 * i is fixed[i] + scaled[i] * l
+        connection_count = network.connection_count
+        data_centre_count = network.data_centre_count
+        self.fixed = [0] * (len(network.to) // 2)
+        self.scaled = [0] * (len(network.to) // 2)
+        fixed_in = [0] * data_centre_count
+        scaled_in = [0] * data_centre_count
+        scaled_links = set(links)
+        for i in range(connection_count):
+            v, capacity = connections[i][1], connections[i][2]
+            if i in scaled_links:
+                self.scaled[i] = capacity
+                scaled_in[v] += capacity
+            else:
+                self.fixed[i] = capacity
+                fixed_in[v] += capacity
+        scaled_centres = set(data_centres)
+        for i in range(data_centre_count):
+            if i in scaled_centres:
+                self.scaled[connection_count + i] = network.max_min_flow[i]
+            else:
+                self.fixed[connection_count + i] = network.max_min_flow[i]
+        # the edge of a target to the super target takes what its connections bring in
+        for j in range(len(targets)):
+            self.fixed[connection_count + data_centre_count + j] = fixed_in[targets[j]]
+            self.scaled[connection_count + data_centre_count + j] = scaled_in[targets[j]]
+
+        self.segments = self._search(low, high)
+        self.breakpoints = [segment[0] for segment in self.segments[1:]]
+        self._flows = None
+
+    def _search(self, low, high):
+        """
+        Find the segments of the curve from low to high, by the search of Eisner and Severance.
+
+        :Time complexity:
+            O(B) solves, where B is the number of breakpoints
+        """
+        low_line = self._solve(low)
+        if low == high:
+            return [(low, high) + low_line]
+
+        segments = []
+        stack = [(low, low_line, high, self._solve(high))]
+        while len(stack) > 0:
+            start, start_line, end, end_line = stack.pop()
+            if start_line == end_line:
+                segments.append((start, end, start_line))
+                continue
+            # the minimum cut at start has the larger slope, as both are the smallest at their own end
+            (a, b), (c, d) = start_line, end_line
+            middle = Fraction(c - a, b - d)
+            line = self._solve(middle)
+            if line[0] + line[1] * middle == a + b * middle:
+                segments.append((start, middle, start_line))
+                segments.append((middle, end, end_line))
+            else:
+                # the left half first, so the segments come out sorted
+                stack.append((middle, line, end, end_line))
+                stack.append((start, start_line, middle, line))
+
+        # join the segments on the same line and drop the empty ones, left by ties between minimum cuts
+        joined = []
+        for start, end, line in segments:
+            if len(joined) > 0 and (start == end or joined[-1][2] == line):
+                joined[-1] = (joined[-1][0], end, joined[-1][2])
+            else:
+                joined.append((start, end, line))
+        if len(joined) > 1 and joined[0][0] == joined[0][1]:
+            joined[1] = (joined[0][0],) + joined[1][1:]
+            del joined[0]
+        return [(start, end) + line for start, end, line in joined]
+
+    def _solve(self, factor):
+        """
+        Solve the network at a factor, warm started from the flow of the previous solve, and return the line
+        (intercept, slope) of the minimum cut found.
+
+        :Time complexity:
+            O(E), where E is the number of edges, plus a warm started solve of the engine
+        """
+        network = self.residual_network
+        cap, to = network.cap, network.to
+        # at p / q every capacity is multiplied by q, so the flow is q times the throughput
+        p, q = factor.numerator, factor.denominator
+        fixed, scaled = self.fixed, self.scaled
+        for i in range(len(fixed)):
+            cap[2 * i] = q * fixed[i] + p * scaled[i]
+            cap[2 * i + 1] = 0
+
+        if self._flows is not None:
+            previous, flows = self._flows
+            if factor >= previous:
+                # the capacities only grew, the previous flow still fits
+                hints = [flow * q // previous.denominator for flow in flows]
+            else:
+                # the previous flow scaled down by factor / previous fits, as every capacity shrinks less than that
+                hints = [flow * p // previous.numerator for flow in flows]
+            apply_warm_start(network, self.origin, hints)
+        ALGORITHMS[self.algorithm](network, self.origin)
+        self.solves += 1
+        self._flows = (factor, [cap[2 * i + 1] for i in range(network.connection_count)])
+
+        # the saturated edges from the source side to the rest are a minimum cut
+        reached = network.source_side(self.origin)
+        intercept = slope = 0
+        for i in range(len(fixed)):
+            if reached[to[2 * i + 1]] and not reached[to[2 * i]]:
+                intercept += fixed[i]
+                slope += scaled[i]
+        return intercept, slope
+
+    def throughput(self, factor):
+        """
+        This method returns the maximum throughput at a factor, read from the segments.
+
+        :Input:
+            factor: a number from low to high
+
+        :Return:
+            A Fraction of the maximum throughput, an integer when the factor is an integer.
+
+        :Raise:
+            ValueError, if the factor is out of the range of the curve
+
+        :Time complexity:
+            O(log B), where B is the number of breakpoints
+        """
+        factor = Fraction(factor)
+        if not self.segments[0][0] <= factor <= self.segments[-1][1]:
+            raise ValueError("factor " + str(factor) + " is out of the range " + str(self.segments[0][0]) + " to "
+                             + str(self.segments[-1][1]))
+        first, last = 0, len(self.segments) - 1
+        while first < last:
+            middle = (first + last) // 2
+            if factor <= self.segments[middle][1]:
+                last = middle
+            else:
+                first = middle + 1
+        _, _, intercept, slope = self.segments[first]
+        return intercept + slope * factor
+
+    def points(self):
+        """
+        This method returns the corners of the curve to chart it: a list of tuples (factor, throughput) for low,
+        each breakpoint and high.
+
+        :Time complexity:
+            O(B), where B is the number of breakpoints
+        """
+        corners = [(start, intercept + slope * start) for start, _, intercept, slope in self.segments]
+        end, intercept, slope = self.segments[-1][1], self.segments[-1][2], self.segments[-1][3]
+        if end != corners[-1][0]:
+            corners.append((end, intercept + slope * end))
+        return corners
+
+    def __str__(self):
+        """
+        This method is used to print one line per segment of the curve.
+
+        :Time complexity:
+            O(B), where B is the number of breakpoints
+        """
+        return "\n".join(str(start) + " to " + str(end) + ": " + str(intercept) + " + " + str(slope) + " * l"
+                         for start, end, intercept, slope in self.segments)
+
+def parametricThroughput(connections, maxIn, maxOut, origin, targets, low=0, high=1, data_centres=None, links=(),
+                         algorithm="dinic"):
+    """
+    Function description:
+        This function returns the maximum throughput from the data centre origin to the data centres specified in
+        targets for every scaling factor from low to high, as a ThroughputCurve.
+
+    :Input:
+        connections, maxIn, maxOut, origin, targets, low, high, data_centres, links, algorithm: the same as
+            ThroughputCurve
+
+    :Return:
+        A ThroughputCurve object
+
+    :Time complexity:
+        The time complexity of ThroughputCurve
+
+    :Aux space complexity:
+        O(V + E), where V is the number of vertex and E is the number of edges
+    """
+    return ThroughputCurve(connections, maxIn, maxOut, origin, targets, low, high, data_centres, links, algorithm)
@@ -0,0 +1,294 @@
+"""
+This file answers backup questions over time instead of per second: how much data can reach the targets by a
+deadline, and how long it takes to move a given volume, when the connections have a transit time (latency) on top
+of their maximum throughput.
+
+Both come from one solve. By Ford and Fulkerson's theorem on flows over time, the most data that can reach the
+targets by a deadline T is sent by repeating a static flow every second, each origin to target path P sending its
+rate from time 0 until T - transit(P). The best static flow is found by augmenting shortest paths by transit time
+(successive shortest paths, a min-cost flow where the cost of a connection is its transit time) on the same
+residual network as maxThroughput. If rate r_i is added by the paths of transit time d_i, then
+
+    volume(T) = sum of r_i * (T - d_i) over the d_i < T
+
+for every deadline T at once, so there is no time-expanded network to build and no search to run per deadline.
+volume(T) is piecewise linear and increasing, and the minimum completion time is read from its breakpoints.
+
+Time is counted in whole seconds, as in a time-expanded network with one copy of the network per second: data
+sent at second t on a connection of transit time d arrives at second t + d. The limits of the data centres apply per
+second and waiting inside a data centre is not needed, as with a single super target it never helps.
+
+"""
+import heapq
+
+from maximum_throughput import CompactResidualNetwork
+
+class FlowOverTime:
+    """
+    This class holds the rates of the shortest paths by transit time of a topology, see the description of this
+    file. rates is a list of tuples (transit time, rate) sorted by transit time, the rate added by the paths of
+    each transit time. Their sum is maxThroughput.
+    """
+
+    def __init__(self, connections, maxIn, maxOut, origin, targets, transit_times=None):
+        """
+        This is the constructor for the FlowOverTime class. It runs the successive shortest paths.
+
+        :Input:
+            connections, maxIn, maxOut, origin, targets: the same as maxThroughput
+            transit_times: None, or a list of the transit time in seconds of each connection, in the order of
+                connections. None means no transit time at all.
+
+        :Return:
+            None
+
+        :Raise:
+            ValueError, if transit_times does not have one integer of at least 0 per connection
+
+        :Time complexity:
+            O(D * (E log V + E * P)), where D is the number of distinct transit times of the paths and P the
+            number of paths
+
+        :Aux space complexity:
+            O(V + E),where V is the number of vertex and E is the number of edges in graph
+        """
+        if transit_times is None:
+            transit_times = [0] * len(connections)
+        if len(transit_times) != len(connections):
+            raise ValueError("transit_times has " + str(len(transit_times)) + " values for " + str(len(connections))
+                             + " connections")
+        for transit in transit_times:
+            if transit != int(transit) or transit < 0:
+                raise ValueError("a transit time must be an integer number of seconds of at least 0, not "
+                                 + repr(transit))
+
+        network = CompactResidualNetwork(connections, maxIn, maxOut, origin, targets)
+        # the cost of connection i is its transit time, the reverse edge gives it back
+        cost = [0] * len(network.to)
+        for i in range(len(transit_times)):
+            cost[2 * i] = int(transit_times[i])
+            cost[2 * i + 1] = -int(transit_times[i])
+
+        self.residual_network = network
+        self.rates = []
+        potential = [0] * network.vertex_count
+        while _shortest_transit_times(network, origin, cost, potential):
+            transit = potential[network.super_target] - potential[origin]
+            # the search gives up on some paths, run it again with the same potentials before Dijkstra's algorithm
+            rate = 0
+            added = _augment_tight_paths(network, origin, cost, potential)
+            while added > 0:
+                rate += added
+                added = _augment_tight_paths(network, origin, cost, potential)
+            if len(self.rates) > 0 and self.rates[-1][0] == transit:
+                self.rates[-1] = (transit, self.rates[-1][1] + rate)
+            else:
+                self.rates.append((transit, rate))
+
+    def throughput(self):
+        """
+        This method returns the maximum throughput per second once the flow is established, the same as
+        maxThroughput.
+
+        :Time complexity:
+            O(D), where D is the number of distinct transit times of the paths
+        """
+        return sum(rate for _, rate in self.rates)
+
+    def max_volume(self, deadline):
+        """
+        This method returns the most data which can reach the targets by the deadline.
+
+        :Input:
+            deadline: the number of seconds from the start of the backup
+
+        :Return:
+            An integer of the most data which can be moved in time.
+
+        :Time complexity:
+            O(D), where D is the number of distinct transit times of the paths
+
+        :Aux space complexity:
+            O(1)
+        """
+        return sum(rate * (deadline - transit) for transit, rate in self.rates if transit < deadline)
+
+    def min_completion_time(self, volume):
+        """
+        This method returns the minimum number of seconds to move a volume of data from the origin to the targets.
+
+        :Input:
+            volume: the amount of data to move
+
+        :Return:
+            The smallest integer T such that max_volume(T) >= volume, or None if no data can reach the targets.
+
+        :Time complexity:
+            O(D), where D is the number of distinct transit times of the paths
+
+        :Aux space complexity:
+            O(1)
+        """
+        if volume <= 0:
+            return 0
+        # volume(T) grows by rate per second between two transit times, the rate of the paths already used
+        moved = 0
+        rate = 0
+        for i in range(len(self.rates)):
+            transit, added = self.rates[i]
+            rate += added
+            end = self.rates[i + 1][0] if i + 1 < len(self.rates) else None
+            # the volume reached at the next breakpoint, from the volume at this one
+            if end is None or moved + rate * (end - transit) >= volume:
+                return transit + -(-(volume - moved) // rate)
+            moved += rate * (end - transit)
+        return None
+
+def _shortest_transit_times(network, origin, cost, potential):
+    """
+    Dijkstra's algorithm from the origin over the residual edges, with the costs reduced by the potentials so they
+    are never negative. It stops once the super target is settled. The potentials then become the shortest transit
+    times from the origin, and the vertices which are not settled get the transit time of the super target, so the
+    reduced costs stay at least 0.
+
+    :Return:
+        True, if the super target can be reached. Otherwise, False.
+
+    :Time complexity:
+        O(E log V),where V is the number of vertex and E is the number of edges in graph
+
+    :Aux space complexity:
+        O(V + E),where V is the number of vertex and E is the number of edges in graph
+    """
+    head, next_edge, to, cap = network.head, network.next, network.to, network.cap
+    distance = [None] * network.vertex_count
+    distance[origin] = 0
+    queue = [(0, origin)]
+    done = [False] * network.vertex_count
+    while len(queue) > 0:
+        d, u = heapq.heappop(queue)
+        if done[u]:
+            continue
+        done[u] = True
+        if u == network.super_target:
+            break
+        edge = head[u]
+        while edge != -1:
+            if cap[edge] > 0:
+                v = to[edge]
+                candidate = d + cost[edge] + potential[u] - potential[v]
+                if distance[v] is None or candidate < distance[v]:
+                    distance[v] = candidate
+                    heapq.heappush(queue, (candidate, v))
+            edge = next_edge[edge]
+
+    sink_distance = distance[network.super_target]
+    if sink_distance is None:
+        return False
+    for v in range(network.vertex_count):
+        potential[v] += distance[v] if done[v] else sink_distance
+    return True
+
+def _augment_tight_paths(network, origin, cost, potential):
+    """
+    Augment paths from the origin to the super target using only the residual edges whose reduced cost is 0, the
+    edges of the shortest paths, until none is left or the search gives up on an edge closing a cycle. The
+    depth-first-search keeps a current edge per vertex like the blocking flow of dinic. A path left out here is
+    found again by the next call.
+
+    :Return:
+        The amount of flow added.
+
+    :Time complexity:
+        O(E * P),where E is the number of edges in graph and P the number of paths
+
+    :Aux space complexity:
+        O(V), where V is the number of vertex in graph
+    """
+    head, next_edge, to, cap = network.head, network.next, network.to, network.cap
+    sink = network.super_target
+    current = list(head)
+    on_path = [False] * network.vertex_count
+    on_path[origin] = True
+    flow = 0
+    path = []
+    u = origin
+    while True:
+        if u == sink:
+            amount = min(cap[edge] for edge in path)
+            for edge in path:
+                cap[edge] -= amount
+                cap[edge ^ 1] += amount
+            flow += amount
+
+            # retreat to the tail of the first saturated edge
+            for i in range(len(path)):
+                if cap[path[i]] == 0:
+                    u = to[path[i] ^ 1]
+                    for edge in path[i:]:
+                        on_path[to[edge]] = False
+                    del path[i:]
+                    break
+            continue
+
+        edge = current[u]
+        while edge != -1 and (cap[edge] == 0 or on_path[to[edge]]
+                              or cost[edge] + potential[u] - potential[to[edge]] != 0):
+            edge = next_edge[edge]
+        current[u] = edge
+
+        if edge != -1:
+            # advance
+            path.append(edge)
+            u = to[edge]
+            on_path[u] = True
+        else:
+            # dead end, retreat and skip the edge which led here
+            if u == origin:
+                return flow
+            on_path[u] = False
+            edge = path.pop()
+            u = to[edge ^ 1]
+            current[u] = next_edge[edge]
+
+def maxVolumeByDeadline(connections, maxIn, maxOut, origin, targets, deadline, transit_times=None):
+    """
+    Function description:
+        This function returns the most data which can be moved from the data centre origin to the data centres
+        specified in targets within deadline seconds, see FlowOverTime.
+
+    :Input:
+        connections, maxIn, maxOut, origin, targets, transit_times: the same as FlowOverTime
+        deadline: the number of seconds from the start of the backup
+
+    :Return:
+        An integer of the most data which can be moved in time.
+
+    :Time complexity:
+        The time complexity of FlowOverTime
+
+    :Aux space complexity:
+        O(V + E), where V is the number of vertex and E is the number of edges
+    """
+    return FlowOverTime(connections, maxIn, maxOut, origin, targets, transit_times).max_volume(deadline)
+
+def minCompletionTime(connections, maxIn, maxOut, origin, targets, volume, transit_times=None):
+    """
+    Function description:
+        This function returns the minimum number of seconds to move volume data from the data centre origin to the
+        data centres specified in targets, see FlowOverTime.
+
+    :Input:
+        connections, maxIn, maxOut, origin, targets, transit_times: the same as FlowOverTime
+        volume: the amount of data to move
+
+    :Return:
+        The minimum number of seconds, or None if no data can reach the targets.
+
+    :Time complexity:
+        The time complexity of FlowOverTime
+
+    :Aux space complexity:
+        O(V + E), where V is the number of vertex and E is the number of edges
+    """
+    return FlowOverTime(connections, maxIn, maxOut, origin, targets, transit_times).min_completion_time(volume)
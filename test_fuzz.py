@@ -0,0 +1,16 @@
+"""
+This file runs the differential fuzzer of fuzz.py on a few hundred seeds, run it with python -m pytest. The engines
+and every entry point of check_features are checked against ford_fulkerson on ResidualNetwork, on the python backend
+and, when NumPy is installed, on the numpy backend too.
+
+"""
+import pytest
+
+from fuzz import fuzz_seeds
+
+def test_fuzz_seeds():
+    assert fuzz_seeds(0, 400) == []
+
+def test_fuzz_seeds_numpy():
+    pytest.importorskip("numpy")
+    assert fuzz_seeds(0, 400, backends=("python", "numpy")) == []
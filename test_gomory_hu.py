@@ -0,0 +1,47 @@
+"""
+This file checks GomoryHuTree against maxThroughput, run it with python -m pytest.
+
+"""
+import random
+
+import pytest
+
+from gomory_hu import GomoryHuTree
+from maximum_throughput import maxThroughput
+
+def test_binding_data_centre_in_between():
+    # the tree only sees the links, data centre 1 limits the flow from 0 to 2 to 1
+    connections = [(0, 1, 10), (1, 0, 10), (1, 2, 10), (2, 1, 10)]
+    limits = [100, 1, 100]
+    tree = GomoryHuTree(connections, limits, limits)
+    assert tree.upper_bound(0, 2) == 10
+    assert tree.max_throughput(0, 2) == maxThroughput(connections, limits, limits, 0, [2]) == 1
+    assert tree.all_pairs()[0][2] == 1
+
+def test_min_cut_of_a_data_centre_and_itself():
+    tree = GomoryHuTree([(0, 1, 5), (1, 0, 5)], [5, 5], [5, 5])
+    with pytest.raises(ValueError):
+        tree.min_cut(1, 1)
+
+@pytest.mark.parametrize("symmetric", [True, False])
+def test_all_pairs_against_max_throughput(symmetric):
+    for seed in range(200):
+        rng = random.Random(seed)
+        data_centres = rng.randint(2, 7)
+        connections = []
+        for _ in range(rng.randint(0, 2 * data_centres)):
+            u, v = rng.sample(range(data_centres), 2)
+            capacity = rng.randint(0, 30)
+            connections.append((u, v, capacity))
+            if symmetric:
+                connections.append((v, u, capacity))
+        maxIn = [rng.randint(0, 60) for _ in range(data_centres)]
+        maxOut = [rng.randint(0, 60) for _ in range(data_centres)]
+
+        tree = GomoryHuTree(connections, maxIn, maxOut, symmetric)
+        all_pairs = tree.all_pairs()
+        for s in range(data_centres):
+            for t in range(data_centres):
+                if s != t:
+                    expected = maxThroughput(connections, maxIn, maxOut, s, [t], "dinic")
+                    assert all_pairs[s][t] == tree.max_throughput(s, t) == expected, (seed, s, t)
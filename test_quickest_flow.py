@@ -0,0 +1,129 @@
+"""
+This file checks FlowOverTime against a max-flow on the time-expanded network, run it with python -m pytest.
+
+"""
+import random
+from collections import deque
+
+from maximum_throughput import maxThroughput, split_capacity
+from quickest_flow import FlowOverTime, maxVolumeByDeadline, minCompletionTime
+
+def time_expanded_volume(connections, maxIn, maxOut, origin, targets, transit_times, deadline):
+    """
+    The most data which can reach the targets by the deadline: a max-flow on one copy of the split network per
+    second 0 to deadline - 1, where connection i goes from second t to second t + transit_times[i], found by
+    augmenting shortest paths.
+
+    :Time complexity:
+        O(V * E^2) for the V vertices and E edges of the time-expanded network
+    """
+    data_centre_count = len(maxIn)
+    incoming = [0] * data_centre_count
+    for u, v, capacity in connections:
+        incoming[v] += capacity
+    # vertex (i, t, 0) is data centre i receiving at second t, (i, t, 1) is it sending at second t
+    capacity = {}
+    neighbours = {}
+
+    def add_edge(u, v, amount):
+        capacity[(u, v)] = capacity.get((u, v), 0) + amount
+        capacity.setdefault((v, u), 0)
+        neighbours.setdefault(u, set()).add(v)
+        neighbours.setdefault(v, set()).add(u)
+
+    for t in range(deadline):
+        add_edge("source", (origin, t, 0), sum(maxOut) + 1)
+        for i in range(data_centre_count):
+            add_edge((i, t, 0), (i, t, 1), split_capacity(i, maxIn, maxOut, origin, targets))
+        for (u, v, amount), transit in zip(connections, transit_times):
+            if t + transit < deadline:
+                add_edge((u, t, 1), (v, t + transit, 0), amount)
+        for target in targets:
+            add_edge((target, t, 1), "sink", incoming[target])
+
+    volume = 0
+    while "source" in neighbours:
+        parent = {"source": None}
+        queue = deque(["source"])
+        while queue and "sink" not in parent:
+            u = queue.popleft()
+            for v in neighbours[u]:
+                if v not in parent and capacity[(u, v)] > 0:
+                    parent[v] = u
+                    queue.append(v)
+        if "sink" not in parent:
+            break
+        path = []
+        v = "sink"
+        while parent[v] is not None:
+            path.append((parent[v], v))
+            v = parent[v]
+        amount = min(capacity[edge] for edge in path)
+        for u, v in path:
+            capacity[(u, v)] -= amount
+            capacity[(v, u)] += amount
+        volume += amount
+    return volume
+
+def random_query(seed):
+    """
+    A random topology with transit times of 0 to 3 seconds, and a query on it.
+
+    :Time complexity:
+        O(V + E)
+    """
+    rng = random.Random(seed)
+    data_centre_count = rng.randint(2, 5)
+    connections = []
+    for _ in range(rng.randint(0, 3 * data_centre_count)):
+        u, v = rng.sample(range(data_centre_count), 2)
+        connections.append((u, v, rng.randint(0, 5)))
+    transit_times = [rng.randint(0, 3) for _ in connections]
+    maxIn = [rng.randint(0, 8) for _ in range(data_centre_count)]
+    maxOut = [rng.randint(0, 8) for _ in range(data_centre_count)]
+    origin = rng.randrange(data_centre_count)
+    others = [i for i in range(data_centre_count) if i != origin]
+    targets = rng.sample(others, rng.randint(1, len(others)))
+    return connections, maxIn, maxOut, origin, targets, transit_times
+
+def test_against_time_expanded_network():
+    horizon = 25
+    for seed in range(150):
+        connections, maxIn, maxOut, origin, targets, transit_times = random_query(seed)
+        flow = FlowOverTime(connections, maxIn, maxOut, origin, targets, transit_times)
+        assert flow.throughput() == maxThroughput(connections, maxIn, maxOut, origin, targets), seed
+
+        volumes = [time_expanded_volume(connections, maxIn, maxOut, origin, targets, transit_times, deadline)
+                   for deadline in range(horizon + 1)]
+        for deadline in range(horizon + 1):
+            assert flow.max_volume(deadline) == volumes[deadline], (seed, deadline)
+
+        for volume in range(1, 9):
+            expected = next((deadline for deadline in range(horizon + 1) if volumes[deadline] >= volume), None)
+            if flow.throughput() > 0:
+                # the shortest path takes at most 12 seconds, then it sends at least 1 per second
+                assert expected is not None
+            assert flow.min_completion_time(volume) == expected, (seed, volume)
+
+def test_no_transit_time():
+    connections = [(0, 1, 3), (1, 2, 2), (0, 2, 1), (1, 3, 4)]
+    maxIn, maxOut = [5, 5, 5, 1], [5, 5, 5, 5]
+    origin, targets = 0, [2, 3]
+    throughput = maxThroughput(connections, maxIn, maxOut, origin, targets)
+    assert throughput == 4
+    zeros = [0] * len(connections)
+    for deadline in range(6):
+        expected = time_expanded_volume(connections, maxIn, maxOut, origin, targets, zeros, deadline)
+        assert expected == throughput * deadline
+        assert maxVolumeByDeadline(connections, maxIn, maxOut, origin, targets, deadline) == expected
+    for volume in range(1, 3 * throughput):
+        assert minCompletionTime(connections, maxIn, maxOut, origin, targets, volume) == -(-volume // throughput)
+
+def test_targets_out_of_reach():
+    # nothing leads from 0 to 2, only a connection back from 2
+    connections = [(0, 1, 4), (2, 0, 4)]
+    transit_times = [1, 0]
+    limits = [10, 10, 10]
+    assert maxVolumeByDeadline(connections, limits, limits, 0, [2], 5, transit_times) == 0
+    assert minCompletionTime(connections, limits, limits, 0, [2], 1, transit_times) is None
+    assert minCompletionTime(connections, limits, limits, 0, [2], 0, transit_times) == 0
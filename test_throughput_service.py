@@ -0,0 +1,116 @@
+"""
+This file checks the coalescing, the cache and the counters of ThroughputService, run it with python -m pytest.
+
+"""
+import asyncio
+
+from maximum_throughput import maxThroughput
+from throughput_service import RESULT_BYTES, ThroughputService, _CachedTopology
+
+def topology(capacity):
+    """
+    A topology of 4 data centres whose throughput from 0 to [3] and to [2, 3] depends on capacity.
+
+    :Time complexity:
+        O(1)
+    """
+    connections = [(0, 1, capacity), (1, 3, 4), (0, 2, 3), (2, 3, capacity), (1, 2, 2)]
+    return connections, [10, 10, 10, 10], [10, 10, 10, 10]
+
+def check_cache_bytes(service):
+    """
+    Check that the cache of service counts the memory of exactly its entries.
+
+    :Time complexity:
+        O(C) for the C entries of the cache
+    """
+    assert service.cache_bytes == sum(entry.nbytes() for entry in service.cache.values())
+
+def test_coalescing_and_cache_hits():
+    connections, maxIn, maxOut = topology(5)
+    expected = maxThroughput(connections, maxIn, maxOut, 0, [2, 3])
+
+    async def run():
+        service = ThroughputService()
+        # identical queries in flight share one solve, whatever the order and repetitions of the targets
+        results = await asyncio.gather(service.max_throughput(connections, maxIn, maxOut, 0, [2, 3], key="a"),
+                                       service.max_throughput(connections, maxIn, maxOut, 0, [3, 2], key="a"),
+                                       service.max_throughput(connections, maxIn, maxOut, 0, [3, 2, 3], key="a"))
+        assert results == [expected] * 3
+        assert (service.solves, service.coalesced, service.cache_hits, service.builds) == (1, 2, 0, 1)
+        check_cache_bytes(service)
+
+        # the same query again is answered from the cache, another one on the same topology reuses its network
+        assert await service.max_throughput(connections, maxIn, maxOut, 0, [3, 2], key="a") == expected
+        assert await service.max_throughput(connections, maxIn, maxOut, 0, [3], key="a") == \
+            maxThroughput(connections, maxIn, maxOut, 0, [3])
+        assert (service.solves, service.coalesced, service.cache_hits, service.builds) == (2, 2, 1, 1)
+        check_cache_bytes(service)
+
+        # without a key the topology is hashed, an equal topology finds the same entry
+        assert await service.max_throughput(list(connections), maxIn, maxOut, 0, [2, 3]) == expected
+        assert await service.max_throughput(list(connections), maxIn, maxOut, 0, [2, 3]) == expected
+        assert (service.solves, service.cache_hits, service.builds) == (3, 2, 2)
+        check_cache_bytes(service)
+        assert not service.solving and not service.building
+
+    asyncio.run(run())
+
+def test_no_cache():
+    connections, maxIn, maxOut = topology(5)
+
+    async def run():
+        service = ThroughputService(max_cache_bytes=0)
+        for _ in range(2):
+            assert await service.max_throughput(connections, maxIn, maxOut, 0, [3], key="a") == \
+                maxThroughput(connections, maxIn, maxOut, 0, [3])
+        assert (service.solves, service.cache_hits, service.builds) == (2, 0, 2)
+        assert len(service.cache) == 0 and service.cache_bytes == 0
+
+    asyncio.run(run())
+
+def test_least_recently_used_eviction():
+    topologies = {name: topology(capacity) for name, capacity in (("a", 1), ("b", 2), ("c", 3))}
+    # every topology has the same shape, so room for two of them with one result each
+    entry_bytes = _CachedTopology(*topologies["a"], "dinic").nbytes() + RESULT_BYTES
+
+    async def query(service, name):
+        connections, maxIn, maxOut = topologies[name]
+        assert await service.max_throughput(connections, maxIn, maxOut, 0, [3], key=name) == \
+            maxThroughput(connections, maxIn, maxOut, 0, [3])
+        check_cache_bytes(service)
+
+    async def run():
+        service = ThroughputService(max_cache_bytes=2 * entry_bytes)
+        await query(service, "a")
+        await query(service, "b")
+        # a cache hit makes a the most recently used, so c evicts b
+        await query(service, "a")
+        await query(service, "c")
+        assert list(service.cache) == ["a", "c"]
+        assert (service.solves, service.cache_hits, service.builds) == (3, 1, 3)
+        await query(service, "b")
+        assert list(service.cache) == ["c", "b"]
+        assert service.builds == 4
+
+    asyncio.run(run())
+
+def test_cancelled_waiter_does_not_cancel_the_solve():
+    connections, maxIn, maxOut = topology(5)
+    expected = maxThroughput(connections, maxIn, maxOut, 0, [2, 3])
+
+    async def run():
+        service = ThroughputService()
+        first = asyncio.ensure_future(service.max_throughput(connections, maxIn, maxOut, 0, [2, 3], key="a"))
+        second = asyncio.ensure_future(service.max_throughput(connections, maxIn, maxOut, 0, [2, 3], key="a"))
+        # let both reach the shared solve, then give up on the first one
+        await asyncio.sleep(0)
+        assert service.coalesced == 1 and len(service.solving) == 1
+        first.cancel()
+        assert await second == expected
+        assert first.cancelled()
+        assert service.solves == 1
+        assert service.cache["a"].results == {(0, (2, 3)): expected}
+        check_cache_bytes(service)
+
+    asyncio.run(run())
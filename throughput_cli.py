@@ -0,0 +1,264 @@
+"""
+This file is the command line entry point for batch planning jobs: it reads a topology and a list of (origin,
+targets) queries and prints the maximum throughput of each query as a line of JSON.
+
+Run it with:
+    python throughput_cli.py TOPOLOGY [QUERIES] [options]   answer the queries of QUERIES, a file of JSON lines
+                                                            (standard input by default), see --help
+    python throughput_cli.py compile TOPOLOGY OUTPUT         compile TOPOLOGY once (see compiled_graph), so later
+                                                            jobs map it instead of building its network
+
+TOPOLOGY is one of:
+    - a compiled graph written by compile_topology (or the compile command), recognised by its magic bytes. It
+      starts the fastest: the network is mapped from the file, not built.
+    - a JSON file {"connections": [[u, v, capacity], ...], "maxIn": [...], "maxOut": [...]}, ending in .json
+    - a text or binary edge file (see topology_loader), with the limits of the data centres in --limits, a JSON
+      file {"maxIn": [...], "maxOut": [...]}
+
+Each query is a JSON object {"origin": 0, "targets": [4, 2]} on its own line. The result line is the query with
+"throughput" added, so any other key (an "id" for example) is passed through. A query which cannot be answered gets
+an "error" instead and the exit status is 1, the other queries are still answered. The lines are flushed one by one,
+so a reader gets each result as soon as it is solved.
+
+A cron job starting a fresh interpreter for each plan pays the start-up of Python, the imports and the construction
+of the network before its first result. The imports are kept to what the topology needs: the modules of the
+compiled graphs and of the edge files are imported when such a file is given, and NumPy only with --backend numpy.
+The network is built once for all the queries (BatchMaxThroughput), or mapped from a compiled graph. --timing
+prints the time of each stage to standard error, and `python benchmark.py startup` measures the time from starting
+the interpreter to the first result line.
+
+"""
+import time
+
+# the start of the job, before the other imports, for --timing
+_STARTED = time.perf_counter()
+
+import argparse
+import contextlib
+import json
+import sys
+
+def load_solver(topology, limits=None, algorithm="dinic", backend="python"):
+    """
+    Function description:
+        This function reads a topology (see the description of this file) and returns a function solving its queries.
+
+    :Input:
+        topology: the path of a compiled graph, of a JSON topology or of an edge file
+        limits: None, or the path of a JSON file {"maxIn": [...], "maxOut": [...]}, needed by an edge file
+        algorithm: the name of the max-flow engine, one of the keys of ALGORITHMS
+        backend: the name of the residual network class, one of the keys of BACKENDS. Only "python" can build the
+            network once for all the queries, the other backends build it again for each query.
+
+    :Return:
+        A tuple (solve, data_centre_count), where solve is a function of (origin, targets) returning the maximum
+        throughput
+
+    :Raise:
+        ValueError, if the algorithm or the backend is unknown, if the file is not a topology, or if an edge file
+        has no limits
+
+    :Time complexity:
+        O(V + E) to build the network, O(V) to map a compiled graph
+
+    :Aux space complexity:
+        O(V + E), where V is the number of data centres and E is the number of connections
+    """
+    from maximum_throughput import check_algorithm, check_backend
+
+    check_algorithm(algorithm)
+    check_backend(backend)
+
+    with open(topology, "rb") as file:
+        magic = file.read(8)
+    # compiled_graph.MAGIC, without importing compiled_graph for the other topologies
+    if magic == b"FNETGRPH":
+        if backend != "python":
+            raise ValueError("a compiled graph can only be solved with the python backend")
+        from compiled_graph import CompiledGraph
+
+        graph = CompiledGraph(topology, algorithm)
+        return graph.solve, graph.residual_network.data_centre_count
+
+    if topology.endswith(".json"):
+        with open(topology) as file:
+            data = json.load(file)
+        connections = [tuple(connection) for connection in data["connections"]]
+        maxIn, maxOut = data["maxIn"], data["maxOut"]
+        if backend == "python":
+            from maximum_throughput import BatchMaxThroughput
+
+            return BatchMaxThroughput(connections, maxIn, maxOut, algorithm).solve, len(maxIn)
+
+        from maximum_throughput import maxThroughput
+
+        return (lambda origin, targets: maxThroughput(connections, maxIn, maxOut, origin, targets, algorithm, backend),
+                len(maxIn))
+
+    if limits is None:
+        raise ValueError(topology + " is an edge file, give the limits of its data centres with --limits")
+    with open(limits) as file:
+        data = json.load(file)
+    maxIn, maxOut = data["maxIn"], data["maxOut"]
+    from topology_loader import edge_chunks, maxThroughputFromSource
+
+    if backend == "python":
+        from maximum_throughput import BatchMaxThroughput
+
+        batch = BatchMaxThroughput.from_connection_chunks(edge_chunks(topology), maxIn, maxOut, algorithm)
+        return batch.solve, len(maxIn)
+    return (lambda origin, targets: maxThroughputFromSource(topology, maxIn, maxOut, origin, targets, algorithm,
+                                                            backend),
+            len(maxIn))
+
+def _is_data_centre(value):
+    """
+    Whether value, read from a JSON query, is an integer ID of a data centre, not a boolean.
+
+    :Time complexity:
+        O(1)
+    """
+    return isinstance(value, int) and not isinstance(value, bool)
+
+def answer(solve, data_centre_count, line):
+    """
+    Function description:
+        This function answers one query line with a solver of load_solver.
+
+    :Input:
+        solve, data_centre_count: the solver of the topology and its number of data centres, from load_solver
+        line: a JSON object {"origin": ..., "targets": [...]}, as a string
+
+    :Return:
+        The result as a dictionary: the query with "throughput" added, or with "error" if it cannot be answered.
+
+    :Time complexity:
+        The time complexity of the solver
+    """
+    try:
+        query = json.loads(line)
+    except ValueError as error:
+        return {"error": "the query is not JSON: " + str(error)}
+    if not isinstance(query, dict):
+        return {"error": "the query is not a JSON object"}
+    try:
+        origin, targets = query["origin"], query["targets"]
+        # JSON true and false are Python booleans, which are integers too
+        if not _is_data_centre(origin) or not isinstance(targets, list) \
+                or not all(_is_data_centre(target) for target in targets):
+            raise ValueError("origin must be an integer and targets a list of integers")
+        for data_centre in [origin] + targets:
+            if not 0 <= data_centre < data_centre_count:
+                raise ValueError("data centre " + str(data_centre) + " is out of range, the topology has "
+                                 + str(data_centre_count) + " data centres")
+        if origin in targets:
+            raise ValueError("the origin cannot be one of the targets")
+        query["throughput"] = solve(origin, targets)
+    except (KeyError, IndexError, TypeError, ValueError) as error:
+        query["error"] = type(error).__name__ + ": " + str(error)
+    return query
+
+def main(argv, output=sys.stdout):
+    """
+    This function parses the command line and runs the job, see the description of this file.
+
+    :Return:
+        The exit status: 2 if the topology or the queries could not be read, 1 if a query could not be answered,
+        otherwise 0.
+
+    :Time complexity:
+        The time complexity of load_solver, plus the time complexity of the solver for each query
+    """
+    if argv[:1] == ["compile"]:
+        parser = argparse.ArgumentParser(prog="throughput_cli.py compile",
+                                         description="Compile a topology for the later jobs.")
+        parser.add_argument("topology", help="a JSON topology or an edge file")
+        parser.add_argument("output", help="the compiled graph to write")
+        parser.add_argument("--limits", help="the JSON limits of the data centres of an edge file")
+        arguments = parser.parse_args(argv[1:])
+        from compiled_graph import compile_topology
+
+        if not arguments.topology.endswith(".json") and arguments.limits is None:
+            parser.error(arguments.topology + " is an edge file, give the limits of its data centres with --limits")
+        try:
+            if arguments.topology.endswith(".json"):
+                with open(arguments.topology) as file:
+                    data = json.load(file)
+                source = [tuple(connection) for connection in data["connections"]]
+            else:
+                with open(arguments.limits) as file:
+                    data = json.load(file)
+                source = arguments.topology
+            compile_topology(arguments.output, source, data["maxIn"], data["maxOut"])
+        except (OSError, KeyError, TypeError, ValueError) as error:
+            print(type(error).__name__ + ": " + str(error), file=sys.stderr)
+            return 2
+        return 0
+
+    # the names of the engines, maximum_throughput is needed by every topology anyway
+    from maximum_throughput import ALGORITHMS, BACKENDS
+
+    parser = argparse.ArgumentParser(description="Answer maximum throughput queries as JSON lines.")
+    parser.add_argument("topology", help="a compiled graph, a JSON topology or an edge file")
+    parser.add_argument("queries", nargs="?", default="-",
+                        help="a file of JSON queries, one per line, - for standard input (the default)")
+    parser.add_argument("--limits", help="the JSON limits of the data centres of an edge file")
+    parser.add_argument("--algorithm", default="dinic", choices=sorted(ALGORITHMS),
+                        help="the max-flow engine, dinic by default")
+    parser.add_argument("--backend", default="python", choices=sorted(BACKENDS),
+                        help="the residual network class, python by default")
+    parser.add_argument("--timing", action="store_true", help="print the time of each stage to standard error")
+    arguments = parser.parse_args(argv)
+
+    parsed = time.perf_counter()
+    try:
+        solve, data_centre_count = load_solver(arguments.topology, arguments.limits, arguments.algorithm, arguments.backend)
+    except (OSError, KeyError, TypeError, ValueError) as error:
+        print(type(error).__name__ + ": " + str(error), file=sys.stderr)
+        return 2
+    loaded = time.perf_counter()
+
+    if arguments.queries == "-":
+        # standard input is left open for the caller
+        queries = contextlib.nullcontext(sys.stdin)
+    else:
+        try:
+            queries = open(arguments.queries)
+        except OSError as error:
+            print(type(error).__name__ + ": " + str(error), file=sys.stderr)
+            return 2
+
+    first_result = None
+    count = 0
+    status = 0
+    try:
+        with queries as lines:
+            for line in lines:
+                if len(line.strip()) == 0:
+                    continue
+                result = answer(solve, data_centre_count, line)
+                if "error" in result:
+                    status = 1
+                output.write(json.dumps(result) + "\n")
+                output.flush()
+                count += 1
+                if first_result is None:
+                    first_result = time.perf_counter()
+    except (OSError, UnicodeDecodeError) as error:
+        print(type(error).__name__ + ": " + str(error), file=sys.stderr)
+        return 2
+
+    if arguments.timing:
+        done = time.perf_counter()
+        stages = {
+            "arguments": parsed - _STARTED,
+            "load": loaded - parsed,
+            "first_result": (first_result if first_result is not None else done) - _STARTED,
+            "total": done - _STARTED,
+            "queries": count,
+        }
+        print(json.dumps(stages), file=sys.stderr)
+    return status
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
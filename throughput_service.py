@@ -0,0 +1,270 @@
+"""
+This file serves maxThroughput to asyncio code without blocking the event loop.
+
+ThroughputService runs the solves in an executor, so the event loop keeps serving other requests while a solve is
+running. Two more things cut the latency of bursts of requests:
+    - coalescing: identical (topology, origin, targets) requests that arrive while the first one is being solved
+      wait for its result instead of solving again.
+    - caching: the topologies are kept in an LRU cache keyed on a content hash of connections, maxIn and maxOut.
+      Each entry holds the residual network of the topology, built once as a BatchMaxThroughput, and the results
+      of the queries already solved on it. When the estimated memory of the entries goes over the limit, the least
+      recently used topologies are evicted.
+
+The executor must run in this process (a thread pool, the default executor of the loop by default), as the cached
+networks are used in place. The solves are pure Python, so they do not run faster in threads, but the event loop
+gets the GIL back between them.
+
+"""
+import asyncio
+import hashlib
+import sys
+import threading
+from array import array
+from collections import OrderedDict
+
+from maximum_throughput import BatchMaxThroughput, check_algorithm
+from topology_loader import iterable_edge_chunks
+
+# the default memory limit of the cache, in bytes
+DEFAULT_CACHE_BYTES = 256 << 20
+
+# the estimated memory of one cached result: the key tuple, the targets tuple and the integer in a dictionary
+RESULT_BYTES = 200
+
+def topology_key(connections, maxIn, maxOut):
+    """
+    Function description:
+        This function returns a content hash of a topology: two topologies have the same key if and only if they have
+        the same connections in the same order and the same maxIn and maxOut (up to hash collisions of BLAKE2b).
+
+    :Input:
+        connections, maxIn, maxOut: the same as maxThroughput
+
+    :Return:
+        A string of 32 hexadecimal digits.
+
+    :Time complexity:
+        O(V + E), where V is the number of data centres and E is the number of connections
+
+    :Aux space complexity:
+        O(1), the connections are hashed in chunks
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(array("q", [len(maxIn), len(maxOut)]))
+    digest.update(array("q", maxIn))
+    digest.update(array("q", maxOut))
+    for chunk in iterable_edge_chunks(connections):
+        digest.update(chunk)
+    return digest.hexdigest()
+
+class _CachedTopology:
+    """
+    An entry of the cache of ThroughputService: the network of a topology and the results solved on it. The lock
+    keeps two executor threads from solving on the same network at once.
+    """
+
+    def __init__(self, connections, maxIn, maxOut, algorithm):
+        """
+        This is the constructor for the _CachedTopology class. It builds the network of the topology.
+
+        :Time complexity:
+            O(V + E) to build the network
+        """
+        self.batch = BatchMaxThroughput(connections, maxIn, maxOut, algorithm)
+        self.lock = threading.Lock()
+        self.results = {}
+        network = self.batch.residual_network
+        # the arrays of the network and the copy of the capacities, maxIn, maxOut and incoming as lists of integers
+        self.network_bytes = (sum(len(values) * values.itemsize for values in
+                                  (network.head, network.next, network.to, network.cap, self.batch.base_cap))
+                              + sys.getsizeof(0) * 3 * len(maxIn))
+
+    def nbytes(self):
+        """
+        This method returns the estimated memory of the entry in bytes.
+
+        :Time complexity:
+            O(1)
+        """
+        return self.network_bytes + RESULT_BYTES * len(self.results)
+
+    def solve(self, origin, targets):
+        """
+        This method solves a query on the network of the entry, in an executor thread.
+
+        :Time complexity:
+            The time complexity of BatchMaxThroughput.solve, plus the wait for the lock
+        """
+        with self.lock:
+            return self.batch.solve(origin, targets)
+
+class ThroughputService:
+    """
+    This class answers maxThroughput queries from asyncio code, see the description of this file.
+
+    The counters solves, cache_hits and coalesced count the queries which were solved, answered from the cache, and
+    answered by the solve of an identical query in flight. builds counts the residual networks built.
+    """
+
+    def __init__(self, algorithm="dinic", executor=None, max_cache_bytes=DEFAULT_CACHE_BYTES):
+        """
+        This is the constructor for the ThroughputService class.
+
+        :Input:
+            algorithm: the name of the engine used for every query, one of the keys of ALGORITHMS
+            executor: the concurrent.futures executor running the solves, a thread pool. None means the default
+                executor of the event loop.
+            max_cache_bytes: the estimated memory the cache can use, 0 to cache nothing
+
+        :Return:
+            None
+
+        :Raise:
+            ValueError, if the algorithm is unknown or max_cache_bytes is negative
+
+        :Time complexity:
+            O(1)
+        """
+        check_algorithm(algorithm)
+        if max_cache_bytes < 0:
+            raise ValueError("max_cache_bytes must be at least 0, not " + str(max_cache_bytes))
+        self.algorithm = algorithm
+        self.executor = executor
+        self.max_cache_bytes = max_cache_bytes
+
+        # topology key -> _CachedTopology, the least recently used first
+        self.cache = OrderedDict()
+        self.cache_bytes = 0
+        # the tasks in flight: topology key -> task building its entry, (key, origin, targets) -> task solving it
+        self.building = {}
+        self.solving = {}
+
+        self.solves = 0
+        self.cache_hits = 0
+        self.coalesced = 0
+        self.builds = 0
+
+    async def max_throughput(self, connections, maxIn, maxOut, origin, targets, key=None):
+        """
+        This method returns the same maximum throughput as maxThroughput, without blocking the event loop.
+
+        :Input:
+            connections, maxIn, maxOut, origin, targets: the same as maxThroughput. The topology must not be
+                changed while the call is running.
+            key: None, or the topology_key of the topology. Hashing a large topology takes about as long as
+                building its network, so a caller which already knows the key (for example a version number
+                which changes with the topology) can pass it instead.
+
+        :Return:
+            An interger of the maximum possible data throughput from the
+                data centre origin to the data centres specified in targets.
+
+        :Time complexity:
+            O(1) for a cached result, otherwise the time complexity of BatchMaxThroughput.solve, plus O(V + E) to
+            hash the topology and to build the network if it is not cached
+
+        :Aux space complexity:
+            O(V + E) for a topology which is not cached
+        """
+        loop = asyncio.get_running_loop()
+        if key is None:
+            key = await loop.run_in_executor(self.executor, topology_key, connections, maxIn, maxOut)
+        # the order of the targets and their repetitions do not change the throughput
+        query = (key, origin, tuple(sorted(set(targets))))
+
+        entry = self.cache.get(key)
+        if entry is not None:
+            self.cache.move_to_end(key)
+            if query[1:] in entry.results:
+                self.cache_hits += 1
+                return entry.results[query[1:]]
+
+        task = self.solving.get(query)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            task = asyncio.ensure_future(self._solve(query, connections, maxIn, maxOut))
+            self.solving[query] = task
+        # a caller giving up does not cancel the solve the others are waiting for
+        return await asyncio.shield(task)
+
+    async def _solve(self, query, connections, maxIn, maxOut):
+        """
+        Solve a query in the executor, on the cached network of its topology, and cache the result.
+
+        :Time complexity:
+            The time complexity of BatchMaxThroughput.solve, plus _topology
+        """
+        key, origin, targets = query
+        try:
+            entry = await self._topology(key, connections, maxIn, maxOut)
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self.executor, entry.solve, origin, targets)
+            self.solves += 1
+            if self.cache.get(key) is entry:
+                entry.results[(origin, targets)] = result
+                self.cache_bytes += RESULT_BYTES
+                self._evict()
+            return result
+        finally:
+            del self.solving[query]
+
+    async def _topology(self, key, connections, maxIn, maxOut):
+        """
+        Return the cache entry of a topology, building its network in the executor if it is not cached. The
+        queries on the same topology share one build.
+
+        :Time complexity:
+            O(1) for a cached topology, otherwise _build
+        """
+        entry = self.cache.get(key)
+        if entry is not None:
+            self.cache.move_to_end(key)
+            return entry
+
+        task = self.building.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._build(key, connections, maxIn, maxOut))
+            self.building[key] = task
+        return await asyncio.shield(task)
+
+    async def _build(self, key, connections, maxIn, maxOut):
+        """
+        Build the cache entry of a topology in the executor and add it to the cache.
+
+        :Time complexity:
+            O(V + E) to build the network, plus _evict
+        """
+        try:
+            loop = asyncio.get_running_loop()
+            entry = await loop.run_in_executor(self.executor, _CachedTopology, connections, maxIn, maxOut,
+                                               self.algorithm)
+            self.builds += 1
+            self.cache[key] = entry
+            self.cache_bytes += entry.nbytes()
+            self._evict()
+            return entry
+        finally:
+            del self.building[key]
+
+    def _evict(self):
+        """
+        Evict the least recently used topologies until the cache fits in max_cache_bytes. An evicted entry can
+        still be in use by the solves in flight, it is only dropped once they are done.
+
+        :Time complexity:
+            O(1) per entry evicted
+        """
+        while self.cache_bytes > self.max_cache_bytes and len(self.cache) > 0:
+            _, entry = self.cache.popitem(last=False)
+            self.cache_bytes -= entry.nbytes()
+
+    def clear(self):
+        """
+        This method empties the cache. The solves in flight are not affected.
+
+        :Time complexity:
+            O(1), the entries are freed by the garbage collector
+        """
+        self.cache.clear()
+        self.cache_bytes = 0
@@ -0,0 +1,245 @@
+"""
+This file generates reproducible synthetic topologies for the benchmarks and the tests of the max-flow engines.
+
+Every generator takes an approximate number of connections and a seed, and returns a tuple
+(connections, maxIn, maxOut, origin, targets) that can be passed to maxThroughput. The same (edges, seed) always
+gives the same topology.
+
+"""
+import random
+
+def layered_fabric(edges, seed, links_per_centre=8):
+    """
+    Function description:
+        This function generates a layered data centre fabric, like a backup fabric: data centre 0 is the origin, the
+        remaining data centres are split into layers of about sqrt(V) centres, and the last layer holds the targets.
+        Each data centre links to links_per_centre random data centres of the next layer, and a few links go back
+        into the previous layer. The links are much thinner than the data centre limits, so the throughput is spread
+        over many paths.
+
+    :Input:
+        edges: the approximate number of connections
+        seed: the seed of the random generator
+        links_per_centre: the number of outgoing connections of each data centre
+
+    :Return:
+        A tuple (connections, maxIn, maxOut, origin, targets) that can be passed to maxThroughput
+
+    :Time complexity:
+        O(E), where E is the number of connections
+
+    :Aux space complexity:
+        O(E), where E is the number of connections
+    """
+    rng = random.Random(seed)
+    data_centres = max(3, edges // (links_per_centre + 1))
+    width = max(2, int(data_centres ** 0.5))
+    layers = [[0]]
+    for start in range(1, data_centres, width):
+        layers.append(list(range(start, min(start + width, data_centres))))
+
+    connections = []
+    for layer, next_layer in zip(layers, layers[1:]):
+        for u in layer:
+            fan_out = links_per_centre if u != 0 else len(next_layer)
+            for v in rng.sample(next_layer, min(fan_out, len(next_layer))):
+                connections.append((u, v, rng.randint(1, 100)))
+        # a few links back into the current layer make the fabric less regular
+        for u in next_layer:
+            v = rng.choice(layer)
+            if v != 0:
+                connections.append((u, v, rng.randint(1, 100)))
+
+    maxIn = [rng.randint(500, 5000) for _ in range(data_centres)]
+    maxOut = [rng.randint(500, 5000) for _ in range(data_centres)]
+    maxOut[0] = sum(capacity for u, _, capacity in connections if u == 0)
+    return connections, maxIn, maxOut, 0, layers[-1]
+
+def random_digraph(edges, seed, density):
+    """
+    Function description:
+        This function generates a random directed graph with about edges connections between V data centres, where
+        density is E / V. The origin is a random data centre and a tenth of the others are the targets.
+
+    :Input:
+        edges: the approximate number of connections
+        seed: the seed of the random generator
+        density: the average number of outgoing connections per data centre
+
+    :Return:
+        A tuple (connections, maxIn, maxOut, origin, targets) that can be passed to maxThroughput
+
+    :Time complexity:
+        O(E), where E is the number of connections
+
+    :Aux space complexity:
+        O(E), where E is the number of connections
+    """
+    rng = random.Random(seed)
+    data_centres = max(3, int(edges / density))
+    connections = []
+    for _ in range(edges):
+        u = rng.randrange(data_centres)
+        v = rng.randrange(data_centres - 1)
+        if v >= u:
+            v += 1
+        connections.append((u, v, rng.randint(1, 1000)))
+
+    maxIn = [rng.randint(1000, 20000) for _ in range(data_centres)]
+    maxOut = [rng.randint(1000, 20000) for _ in range(data_centres)]
+    origin = rng.randrange(data_centres)
+    others = [i for i in range(data_centres) if i != origin]
+    targets = rng.sample(others, max(1, len(others) // 10))
+    return connections, maxIn, maxOut, origin, targets
+
+def random_sparse(edges, seed):
+    """
+    Function description:
+        This function generates a random sparse directed graph, with 4 connections per data centre on average.
+        See random_digraph.
+
+    :Time complexity:
+        O(V + E), where V is the number of data centres and E is the number of connections
+    """
+    return random_digraph(edges, seed, 4)
+
+def random_dense(edges, seed):
+    """
+    Function description:
+        This function generates a random dense directed graph, where each data centre is linked to about half of the
+        others. See random_digraph.
+
+    :Time complexity:
+        O(V + E), where V is the number of data centres and E is the number of connections
+    """
+    return random_digraph(edges, seed, max(4, (edges / 2) ** 0.5))
+
+def regional_mesh(edges, seed):
+    """
+    Function description:
+        This function generates a grid of regional data centres where each data centre is linked both ways to its
+        neighbours on the left, right, top and bottom. The origin is the top left data centre and the targets are the
+        last column.
+
+    :Input:
+        edges: the approximate number of connections
+        seed: the seed of the random generator
+
+    :Return:
+        A tuple (connections, maxIn, maxOut, origin, targets) that can be passed to maxThroughput
+
+    :Time complexity:
+        O(E), where E is the number of connections
+
+    :Aux space complexity:
+        O(E), where E is the number of connections
+    """
+    rng = random.Random(seed)
+    side = max(2, int((edges / 4) ** 0.5))
+    connections = []
+    for row in range(side):
+        for column in range(side):
+            u = row * side + column
+            if column + 1 < side:
+                connections.append((u, u + 1, rng.randint(100, 1000)))
+                connections.append((u + 1, u, rng.randint(100, 1000)))
+            if row + 1 < side:
+                connections.append((u, u + side, rng.randint(100, 1000)))
+                connections.append((u + side, u, rng.randint(100, 1000)))
+
+    data_centres = side * side
+    maxIn = [rng.randint(1000, 3000) for _ in range(data_centres)]
+    maxOut = [rng.randint(1000, 3000) for _ in range(data_centres)]
+    maxOut[0] = 4000 * side
+    targets = [row * side + side - 1 for row in range(side)]
+    return connections, maxIn, maxOut, 0, targets
+
+def wide_range_capacities(edges, seed):
+    """
+    Function description:
+        This function generates a layered fabric (see layered_fabric) whose link capacities range from 10 Mb/s to
+        400 Gb/s (given in Mb/s), spread evenly over the orders of magnitude, like old regional lines next to new
+        backbone fibres, and whose data centres do not limit the flow. Most shortest paths go through a thin link,
+        which is the worst case of ford_fulkerson and the case capacity_scaling is made for.
+
+    :Input:
+        edges: the approximate number of connections
+        seed: the seed of the random generator
+
+    :Return:
+        A tuple (connections, maxIn, maxOut, origin, targets) that can be passed to maxThroughput
+
+    :Time complexity:
+        O(E), where E is the number of connections
+
+    :Aux space complexity:
+        O(E), where E is the number of connections
+    """
+    connections, maxIn, _, origin, targets = layered_fabric(edges, seed)
+    rng = random.Random(seed)
+    connections = [(u, v, int(10 * 40000 ** rng.random())) for u, v, _ in connections]
+    unbounded = sum(capacity for _, _, capacity in connections) + 1
+    return connections, [unbounded] * len(maxIn), [unbounded] * len(maxIn), origin, targets
+
+def edmonds_karp_adversarial(edges, seed):
+    """
+    Function description:
+        This function generates a topology on which Edmonds-Karp has to do as many breadth first searches as possible
+        over as many edges as possible. It has a dense bipartite core of unit capacity links between the origin's side
+        and the targets' side, so every augmenting path carries a single unit, plus a ladder of chains of growing
+        length which are only used once the short paths are saturated, so the breadth first searches keep getting
+        deeper. The number of augmentations is about the number of data centres and each one scans the whole core.
+
+    :Input:
+        edges: the approximate number of connections
+        seed: the seed of the random generator
+
+    :Return:
+        A tuple (connections, maxIn, maxOut, origin, targets) that can be passed to maxThroughput
+
+    :Time complexity:
+        O(E), where E is the number of connections
+
+    :Aux space complexity:
+        O(E), where E is the number of connections
+    """
+    rng = random.Random(seed)
+    # half of the connections in the core, half in the ladder
+    half = max(2, int((edges / 2) ** 0.5))
+    left = list(range(1, half + 1))
+    right = list(range(half + 1, 2 * half + 1))
+    target = 2 * half + 1
+    connections = []
+    for u in left:
+        connections.append((0, u, 1))
+        for v in rng.sample(right, max(1, half // 2)):
+            connections.append((u, v, 1))
+    for v in right:
+        connections.append((v, target, 1))
+
+    # the ladder: chains of length 1, 2, 3, ... from the origin to the target
+    next_id = target + 1
+    length = 1
+    while len(connections) < edges:
+        previous = 0
+        for _ in range(length):
+            connections.append((previous, next_id, 1))
+            previous = next_id
+            next_id += 1
+        connections.append((previous, target, 1))
+        length += 1
+
+    data_centres = next_id
+    unbounded = len(connections) + 1
+    maxIn = [unbounded] * data_centres
+    maxOut = [unbounded] * data_centres
+    return connections, maxIn, maxOut, 0, [target]
+
+GENERATORS = {
+    "layered_fabric": layered_fabric,
+    "random_sparse": random_sparse,
+    "random_dense": random_dense,
+    "regional_mesh": regional_mesh,
+    "wide_range_capacities": wide_range_capacities,
+    "edmonds_karp_adversarial": edmonds_karp_adversarial,
+}
@@ -0,0 +1,265 @@
+"""
+This file streams large topologies from disk straight into the arrays of the residual network, so the connections
+never exist as a list of tuples.
+
+Two file formats are read:
+    - text: one connection per line, "u,v,capacity" (the delimiter can be changed). Empty lines, lines starting
+      with # and a header line such as "u,v,capacity" are skipped. The first line is a header only if none of its
+      fields is an integer, so a malformed first connection is reported like any other line.
+    - binary: fixed-width records of three little-endian signed 64-bit integers (u, v, capacity), 24 bytes per
+      connection and nothing else. The file is memory-mapped and each chunk is a memoryview over the mapped pages,
+      so the records are read in place without being copied or parsed.
+
+Any iterable of (u, v, capacity) tuples can be streamed as well, for example a generator reading a database.
+
+The connections are added chunk by chunk with CompactResidualNetwork.from_connection_chunks, so the peak memory is
+the final residual network plus one chunk, instead of the list of tuples, its copy and the network.
+
+"""
+import mmap
+import struct
+import sys
+from array import array
+from itertools import islice
+
+from maximum_throughput import ALGORITHMS, BACKENDS, check_algorithm, check_backend
+
+# one connection of the binary format: u, v, capacity
+BINARY_RECORD = struct.Struct("<qqq")
+
+# the number of connections read at once
+DEFAULT_CHUNK_EDGES = 1 << 16
+
+def write_binary_edges(path, connections, chunk_edges=DEFAULT_CHUNK_EDGES):
+    """
+    Function description:
+        This function writes connections to a file in the binary format.
+
+    :Input:
+        path: the path of the file to write
+        connections: an iterable of tuples (u, v, capacity)
+        chunk_edges: the number of connections written at once
+
+    :Return:
+        The number of connections written.
+
+    :Time complexity:
+        O(E), where E is the number of connections
+
+    :Aux space complexity:
+        O(chunk_edges)
+    """
+    count = 0
+    with open(path, "wb") as file:
+        for chunk in iterable_edge_chunks(connections, chunk_edges):
+            if sys.byteorder != "little":
+                chunk.byteswap()
+            file.write(chunk.tobytes())
+            count += len(chunk) // 3
+    return count
+
+def binary_edge_chunks(path, chunk_edges=DEFAULT_CHUNK_EDGES):
+    """
+    Function description:
+        This function memory-maps a file in the binary format and yields its connections in chunks, as memoryviews cast
+        to 'q' over the mapped pages. The pages are read by the operating system as the chunks are used, and are not
+        copied. A chunk is only valid until the next one is read. On a big-endian machine the chunks are byte-swapped
+        copies instead.
+
+    :Input:
+        path: the path of the file to read
+        chunk_edges: the number of connections in each chunk
+
+    :Return:
+        A generator of flat sequences of integers u0, v0, capacity0, u1, ...
+
+    :Raise:
+        ValueError, if the size of the file is not a multiple of the size of a record
+
+    :Time complexity:
+        O(E), where E is the number of connections, spent by the reader of the chunks
+
+    :Aux space complexity:
+        O(1), or O(chunk_edges) on a big-endian machine
+    """
+    with open(path, "rb") as file:
+        file.seek(0, 2)
+        size = file.tell()
+        if size % BINARY_RECORD.size != 0:
+            raise ValueError(path + " is not a binary edge file: its size is not a multiple of "
+                             + str(BINARY_RECORD.size) + " bytes")
+        if size == 0:
+            return
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    records = memoryview(mapped).cast("q")
+    chunk = None
+    try:
+        step = 3 * chunk_edges
+        for start in range(0, len(records), step):
+            chunk = records[start:start + step]
+            if sys.byteorder != "little":
+                swapped = array("q", chunk)
+                swapped.byteswap()
+                chunk.release()
+                chunk = swapped
+            yield chunk
+            # the pages can only be unmapped once every view over them is released
+            if isinstance(chunk, memoryview):
+                chunk.release()
+    finally:
+        if isinstance(chunk, memoryview):
+            chunk.release()
+        records.release()
+        mapped.close()
+
+def text_edge_chunks(file, chunk_edges=DEFAULT_CHUNK_EDGES, delimiter=","):
+    """
+    Function description:
+        This function reads connections from a text file, one "u,v,capacity" per line, and yields them in chunks of
+        array('q'). Empty lines and lines starting with # are skipped, and so is the first line when none of its
+        fields is an integer (a header such as "u,v,capacity").
+
+    :Input:
+        file: the path of the file, or a file object open in text mode
+        chunk_edges: the number of connections in each chunk
+        delimiter: the string between the three numbers of a line
+
+    :Return:
+        A generator of array('q') of integers u0, v0, capacity0, u1, ...
+
+    :Raise:
+        ValueError, if a line other than the header does not hold three integers
+
+    :Time complexity:
+        O(E), where E is the number of connections
+
+    :Aux space complexity:
+        O(chunk_edges)
+    """
+    if isinstance(file, str):
+        with open(file) as opened:
+            yield from text_edge_chunks(opened, chunk_edges, delimiter)
+        return
+
+    chunk = array("q")
+    for number, line in enumerate(file, 1):
+        line = line.strip()
+        if len(line) == 0 or line[0] == "#":
+            continue
+        fields = line.split(delimiter)
+        try:
+            if len(fields) != 3:
+                raise ValueError
+            chunk.extend((int(fields[0]), int(fields[1]), int(fields[2])))
+        except ValueError:
+            if number == 1 and not any(_is_integer(field) for field in fields):
+                # a header line, a malformed first connection such as "1,2" is still an error
+                continue
+            raise ValueError("line " + str(number) + " is not u" + delimiter + "v" + delimiter + "capacity: "
+                             + repr(line)) from None
+        if len(chunk) >= 3 * chunk_edges:
+            yield chunk
+            chunk = array("q")
+    if len(chunk) > 0:
+        yield chunk
+
+def _is_integer(field):
+    """
+    Whether a field of a line of a text edge file parses as an integer.
+
+    :Time complexity:
+        O(L), where L is the length of the field
+    """
+    try:
+        int(field)
+    except ValueError:
+        return False
+    return True
+
+def iterable_edge_chunks(connections, chunk_edges=DEFAULT_CHUNK_EDGES):
+    """
+    Function description:
+        This function groups an iterable of tuples (u, v, capacity) into chunks of array('q').
+
+    :Time complexity:
+        O(E), where E is the number of connections
+
+    :Aux space complexity:
+        O(chunk_edges)
+    """
+    iterator = iter(connections)
+    while True:
+        chunk = array("q")
+        for connection in islice(iterator, chunk_edges):
+            chunk.extend(connection[:3])
+        if len(chunk) == 0:
+            return
+        yield chunk
+
+def edge_chunks(source, chunk_edges=DEFAULT_CHUNK_EDGES):
+    """
+    Function description:
+        This function yields the connections of a source in chunks, choosing the reader from the source: a path ending
+        in .bin is read as the binary format, any other path as text, and anything else as an iterable of tuples.
+
+    :Time complexity:
+        O(E), where E is the number of connections
+    """
+    if isinstance(source, str):
+        if source.endswith(".bin"):
+            return binary_edge_chunks(source, chunk_edges)
+        return text_edge_chunks(source, chunk_edges)
+    return iterable_edge_chunks(source, chunk_edges)
+
+def load_network(source, maxIn, maxOut, origin, targets, backend="python", chunk_edges=DEFAULT_CHUNK_EDGES):
+    """
+    Function description:
+        This function builds the residual network of a topology streamed from a source (see edge_chunks).
+
+    :Input:
+        source: a path to a text or binary edge file, or an iterable of tuples (u, v, capacity)
+        maxIn, maxOut, origin, targets: the same as maxThroughput
+        backend: the name of the residual network class, one of the keys of BACKENDS
+        chunk_edges: the number of connections read at once
+
+    :Return:
+        The residual network, ready to be solved by one of the engines of ALGORITHMS.
+
+    :Raise:
+        ValueError, if the backend is unknown
+
+    :Time complexity:
+        O(V + E), where V is the number of data centres and E is the number of connections
+
+    :Aux space complexity:
+        O(V + E + chunk_edges)
+    """
+    check_backend(backend)
+    return BACKENDS[backend].from_connection_chunks(edge_chunks(source, chunk_edges), maxIn, maxOut, origin, targets)
+
+def maxThroughputFromSource(source, maxIn, maxOut, origin, targets, algorithm="ford_fulkerson", backend="python",
+                            chunk_edges=DEFAULT_CHUNK_EDGES):
+    """
+    Function description:
+        This function returns the same maximum throughput as maxThroughput, with the connections streamed from a
+        file or an iterable instead of a list.
+
+    :Input:
+        source: a path to a text or binary edge file, or an iterable of tuples (u, v, capacity)
+        maxIn, maxOut, origin, targets, algorithm, backend: the same as maxThroughput
+        chunk_edges: the number of connections read at once
+
+    :Return:
+        An interger of the maximum possible data throughput from the
+            data centre origin to the data centres specified in targets.
+
+    :Time complexity:
+        O(V + E) to load the topology, plus the time complexity of the engine
+
+    :Aux space complexity:
+        O(V + E + chunk_edges)
+    """
+    check_algorithm(algorithm)
+    residual_network = load_network(source, maxIn, maxOut, origin, targets, backend, chunk_edges)
+    return ALGORITHMS[algorithm](residual_network, origin)
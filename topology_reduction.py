@@ -0,0 +1,386 @@
+"""
+This file shrinks a topology before it is solved, and maps the flow found on the smaller network back to the
+connections of the input.
+
+The residual network of maxThroughput has two vertices for every data centre and one edge per connection, whether
+they can carry flow or not. ReducedTopology builds a smaller residual network with the same maximum throughput:
+    - pruning: a data centre which the origin cannot reach, or which cannot reach a target, never carries flow, so
+      it is dropped with its connections. So are the connections of capacity 0, the connections from a data
+      centre to itself and the connections into the origin, which can only carry flow round a cycle.
+    - parallel links: the connections between the same two data centres in the same direction become one link
+      whose capacity is the sum of theirs.
+    - chains: a data centre which is neither the origin nor a target, with one link in and one link out, is
+      contracted: u -> v -> w becomes u -> w with the smallest of the two capacities and of the limit of v. This is
+      repeated, so a chain of data centres becomes a single link (and a chain back to where it started is dropped).
+    - splits: the two vertices of a data centre are only needed when its limit can bind, that is when it is lower
+      than both the capacity of the links into it and the capacity of the links out of it. Otherwise the data
+      centre is a single vertex.
+
+Each link of the reduced network remembers what it was made of: a connection, links in series (they all carry the
+flow of the link) or links in parallel (the flow of the link is spread over them, each one filled up to its
+capacity in turn). connection_flows follows this back to a flow on every connection of the input, which is a valid
+flow of the full network with the same throughput.
+
+"""
+from array import array
+
+from maximum_throughput import ALGORITHMS, CompactResidualNetwork, check_algorithm, split_capacity
+
+# the kinds of the links of a ReducedTopology
+_CONNECTION = 0
+_SERIES = 1
+_PARALLEL = 2
+
+class ReducedTopology:
+    """
+    This class is the reduced residual network of a topology, see the description of this file. The counters
+    pruned_data_centres, contracted_data_centres, merged_links and skipped_splits tell what each step removed, and
+    str() prints the size of the network before and after.
+    """
+
+    def __init__(self, connections, maxIn, maxOut, origin, targets, contract=True):
+        """
+        This is the constructor for the ReducedTopology class. It reduces the topology and builds the residual
+        network of what is left.
+
+        :Input:
+            connections, maxIn, maxOut, origin, targets: the same as maxThroughput
+            contract: False to keep the chains of data centres, the other steps are always run
+
+        :Return:
+            None
+
+        :Time complexity:
+            O(V + E log E), where V is the number of data centres and E is the number of connections
+
+        :Aux space complexity:
+            O(V + E), where V is the number of data centres and E is the number of connections
+        """
+        data_centre_count = len(maxIn)
+        target_set = set(targets)
+        self.connections = connections
+        self.origin = origin
+        self.data_centre_count = data_centre_count
+        self.connection_count = len(connections)
+        self.throughput = None
+
+        # the capacity of the edge of each target into the super target, as maxThroughput builds it: the capacity
+        # of every connection into the target, once per time it is listed in targets
+        super_capacity = {}
+        for target in targets:
+            super_capacity[target] = 0
+        for _, v, capacity in connections:
+            if v in super_capacity:
+                super_capacity[v] += capacity
+        multiplicity = {}
+        for target in targets:
+            multiplicity[target] = multiplicity.get(target, 0) + 1
+        for target in multiplicity:
+            super_capacity[target] *= multiplicity[target]
+
+        split = [split_capacity(i, maxIn, maxOut, origin, target_set) for i in range(data_centre_count)]
+        kept = self._reachable(connections, split, super_capacity)
+        self.pruned_data_centres = data_centre_count - len(kept)
+
+        # the links between the kept data centres, out_links[u][w] and in_links[w][u] are the ID of the link u -> w
+        self._kind = []
+        self._parts = []
+        self._capacity = []
+        self.merged_links = 0
+        out_links = {u: {} for u in kept}
+        in_links = {u: {} for u in kept}
+        for i in range(len(connections)):
+            u, v, capacity = connections[i]
+            if capacity > 0 and u != v and v != origin and u in out_links and v in out_links:
+                self._add_link(out_links, in_links, u, v, self._new_link(_CONNECTION, i, capacity))
+
+        self.contracted_data_centres = 0
+        if contract:
+            self._contract_chains(out_links, in_links, split, target_set)
+
+        self._build(out_links, in_links, split, super_capacity)
+
+    def _reachable(self, connections, split, super_capacity):
+        """
+        Return the set of the data centres the origin can reach and which can reach a target, through links and
+        data centres of capacity more than 0.
+
+        :Time complexity:
+            O(V + E), where V is the number of data centres and E is the number of connections
+        """
+        data_centre_count = self.data_centre_count
+        forward = [[] for _ in range(data_centre_count)]
+        backward = [[] for _ in range(data_centre_count)]
+        for u, v, capacity in connections:
+            if capacity > 0 and u != v and split[u] > 0 and split[v] > 0:
+                forward[u].append(v)
+                backward[v].append(u)
+
+        from_origin = [False] * data_centre_count
+        stack = []
+        if split[self.origin] > 0:
+            from_origin[self.origin] = True
+            stack.append(self.origin)
+        while len(stack) > 0:
+            u = stack.pop()
+            for v in forward[u]:
+                if not from_origin[v]:
+                    from_origin[v] = True
+                    stack.append(v)
+
+        to_target = [False] * data_centre_count
+        for target in super_capacity:
+            if split[target] > 0 and super_capacity[target] > 0 and from_origin[target] and not to_target[target]:
+                to_target[target] = True
+                stack.append(target)
+        while len(stack) > 0:
+            v = stack.pop()
+            for u in backward[v]:
+                if from_origin[u] and not to_target[u]:
+                    to_target[u] = True
+                    stack.append(u)
+
+        return {i for i in range(data_centre_count) if to_target[i]}
+
+    def _new_link(self, kind, parts, capacity):
+        """
+        Return the ID of a new link made of parts: a connection index, or a list of link IDs.
+
+        :Time complexity:
+            O(1)
+        """
+        self._kind.append(kind)
+        self._parts.append(parts)
+        self._capacity.append(capacity)
+        return len(self._kind) - 1
+
+    def _combine(self, kind, first, second, capacity):
+        """
+        Return a link made of two links in series or in parallel. A link of the same kind is extended in place
+        instead of nested, the larger one taking the parts of the smaller, so chains and bundles stay flat.
+
+        :Time complexity:
+            O(P) for the parts P of the smaller link, O(1) when both are nested
+        """
+        first_flat = self._kind[first] == kind
+        second_flat = self._kind[second] == kind
+        if first_flat and (not second_flat or len(self._parts[first]) >= len(self._parts[second])):
+            link = first
+            other = self._parts[second] if second_flat else [second]
+        elif second_flat:
+            link = second
+            other = self._parts[first] if first_flat else [first]
+        else:
+            return self._new_link(kind, [first, second], capacity)
+        self._parts[link].extend(other)
+        self._capacity[link] = capacity
+        return link
+
+    def _add_link(self, out_links, in_links, u, w, link):
+        """
+        Add the link u -> w to the graph, merging it with the link already going from u to w if there is one.
+
+        :Time complexity:
+            O(P) for the parts P of the smaller link when it is merged, otherwise O(1)
+        """
+        existing = out_links[u].get(w)
+        if existing is not None:
+            self.merged_links += 1
+            link = self._combine(_PARALLEL, existing, link, self._capacity[existing] + self._capacity[link])
+        out_links[u][w] = link
+        in_links[w][u] = link
+
+    def _contract_chains(self, out_links, in_links, split, target_set):
+        """
+        Contract the data centres with one link in and one link out, see the description of this file.
+
+        :Time complexity:
+            O(V + E log E), where V is the number of data centres and E is the number of links, as a link is extended in place and the smaller side moves (see _combine)
+        """
+        work = list(out_links)
+        while len(work) > 0:
+            v = work.pop()
+            if (v not in out_links or v == self.origin or v in target_set
+                    or len(in_links[v]) != 1 or len(out_links[v]) != 1):
+                continue
+            (u, first), = in_links[v].items()
+            (w, second), = out_links[v].items()
+            del out_links[v], in_links[v], out_links[u][v], in_links[w][v]
+            self.contracted_data_centres += 1
+            if u != w:
+                capacity = min(self._capacity[first], self._capacity[second], split[v])
+                self._add_link(out_links, in_links, u, w, self._combine(_SERIES, first, second, capacity))
+            work.append(u)
+            work.append(w)
+
+    def _build(self, out_links, in_links, split, super_capacity):
+        """
+        Build the residual network of the reduced graph: the edges of the links first, link k being edge 2 * k,
+        then the edges of the data centres whose limit can bind, then the edges into the super target.
+
+        :Time complexity:
+            O(V + E), where V is the number of data centres and E is the number of links
+        """
+        infinity = float("inf")
+        vertex_count = 0
+        in_vertex = {}
+        out_vertex = {}
+        self.skipped_splits = 0
+        binding = []
+        for i in sorted(out_links):
+            links_in = infinity if i == self.origin else sum(self._capacity[link] for link in in_links[i].values())
+            links_out = sum(self._capacity[link] for link in out_links[i].values()) + super_capacity.get(i, 0)
+            in_vertex[i] = vertex_count
+            if split[i] < min(links_in, links_out):
+                binding.append(i)
+                out_vertex[i] = vertex_count + 1
+                vertex_count += 2
+            else:
+                self.skipped_splits += 1
+                out_vertex[i] = vertex_count
+                vertex_count += 1
+
+        if self.origin not in in_vertex:
+            # the origin reaches no target, it is left alone in the network
+            vertex_count = 1
+        self.source = in_vertex.get(self.origin, 0)
+
+        self.links = [link for u in out_links for link in out_links[u].values()]
+        network = CompactResidualNetwork.from_arrays(array('q', [-1]) * (vertex_count + 1), array('q'), array('q'),
+                                                     array('q'), len(out_links), len(self.links))
+        network.incoming = [0] * network.vertex_count
+        for u in out_links:
+            for w, link in out_links[u].items():
+                network.add_edge(out_vertex[u], in_vertex[w], self._capacity[link])
+        for i in binding:
+            network.add_edge(in_vertex[i], out_vertex[i], split[i])
+        self.target_edges = []
+        for target in super_capacity:
+            if target in out_vertex:
+                self.target_edges.append((target, network.add_edge(out_vertex[target], network.super_target,
+                                                                   super_capacity[target])))
+        network.targets = [target for target, _ in self.target_edges]
+        self.residual_network = network
+
+    def solve(self, algorithm="ford_fulkerson", stats=None):
+        """
+        This method solves the reduced network and returns the maximum throughput, the same as maxThroughput on
+        the input.
+
+        :Input:
+            algorithm: the name of the max-flow engine, one of the keys of ALGORITHMS
+            stats: None, or a SolverStats object to collect the counters and the timers of the engine
+
+        :Return:
+            An interger of the maximum possible data throughput from the
+                data centre origin to the data centres specified in targets.
+
+        :Raise:
+            ValueError, if the algorithm is unknown, or if the network was already solved
+
+        :Time complexity:
+            The time complexity of the engine on the reduced network
+        """
+        check_algorithm(algorithm)
+        if self.throughput is not None:
+            raise ValueError("the reduced network is already solved")
+        if stats is None:
+            self.throughput = ALGORITHMS[algorithm](self.residual_network, self.source)
+        else:
+            self.throughput = ALGORITHMS[algorithm](self.residual_network, self.source, stats)
+        return self.throughput
+
+    def connection_flows(self):
+        """
+        This method returns the flow on each connection of the input once solved, like
+        CompactResidualNetwork.connection_flows on the full network: the flow of each link is spread over the
+        connections it was made of.
+
+        :Return:
+            A list where the i-th element is the flow on the i-th connection of the input.
+
+        :Time complexity:
+            O(E), where E is the number of connections
+
+        :Aux space complexity:
+            O(E), where E is the number of connections
+        """
+        flows = [0] * self.connection_count
+        cap = self.residual_network.cap
+        stack = [(self.links[k], cap[2 * k + 1]) for k in range(len(self.links)) if cap[2 * k + 1] > 0]
+        while len(stack) > 0:
+            link, flow = stack.pop()
+            kind = self._kind[link]
+            if kind == _CONNECTION:
+                flows[self._parts[link]] += flow
+            elif kind == _SERIES:
+                for part in self._parts[link]:
+                    stack.append((part, flow))
+            else:
+                for part in self._parts[link]:
+                    amount = min(flow, self._capacity[part])
+                    if amount > 0:
+                        stack.append((part, amount))
+                    flow -= amount
+        return flows
+
+    def target_flows(self):
+        """
+        This method returns the flow received by each target once solved, as a dictionary {target: flow}.
+
+        :Time complexity:
+            O(T), where T is the number of targets
+        """
+        cap = self.residual_network.cap
+        return {target: cap[edge + 1] for target, edge in self.target_edges}
+
+    def __str__(self):
+        """
+        This method is used to print how much the topology shrank: the vertices and edges of the residual network
+        of maxThroughput, and of the reduced one.
+
+        :Time complexity:
+            O(1)
+        """
+        network = self.residual_network
+        full_vertices = 2 * (self.data_centre_count + 1)
+        full_edges = self.connection_count + self.data_centre_count + len(self.target_edges)
+        edges = len(network.to) // 2
+        return "\n".join([
+            "vertices: " + str(full_vertices) + " -> " + str(network.vertex_count)
+            + " (" + _percent(network.vertex_count, full_vertices) + ")",
+            "edges: " + str(full_edges) + " -> " + str(edges) + " (" + _percent(edges, full_edges) + ")",
+            "data centres pruned: " + str(self.pruned_data_centres) + ", contracted: "
+            + str(self.contracted_data_centres) + ", without a split: " + str(self.skipped_splits),
+            "parallel links merged: " + str(self.merged_links),
+        ])
+
+def _percent(part, whole):
+    """
+    Format part as a percentage of whole.
+
+    :Time complexity:
+        O(1)
+    """
+    return "%.1f%%" % (100 * part / whole if whole > 0 else 100)
+
+def maxThroughputReduced(connections, maxIn, maxOut, origin, targets, algorithm="ford_fulkerson"):
+    """
+    Function description:
+        This function returns the same maximum throughput as maxThroughput, solved on the reduced network of
+        ReducedTopology instead of the full one.
+
+    :Input:
+        connections, maxIn, maxOut, origin, targets, algorithm: the same as maxThroughput
+
+    :Return:
+        An interger of the maximum possible data throughput from the
+            data centre origin to the data centres specified in targets.
+
+    :Time complexity:
+        O(V + E log E) to reduce the topology, plus the time complexity of the engine on the reduced network
+
+    :Aux space complexity:
+        O(V + E), where V is the number of data centres and E is the number of connections
+    """
+    return ReducedTopology(connections, maxIn, maxOut, origin, targets).solve(algorithm)